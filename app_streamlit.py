@@ -1,9 +1,11 @@
+import time
 import streamlit as st
 import requests
 import pandas as pd
 
 API_ANALYZE_URL = "http://localhost:8000/analyze"
 API_RANK_URL = "http://localhost:8000/rank_resumes"
+API_JOBS_URL = "http://localhost:8000/jobs"
 
 st.set_page_config(page_title="AI Job Intelligence System", layout="wide")
 st.title(" AI Job Application Intelligence System (Enterprise Mode)")
@@ -38,7 +40,7 @@ with tab1:
 
 with tab2:
     st.header(" Recruiter Mode")
-    st.write("Upload multiple resumes (up to 50 PDFs). System ranks the best candidates based on the job description.")
+    st.write("Upload multiple resumes. Up to 50 PDFs are ranked instantly; larger batches run as a background job.")
 
     jd_recruiter = st.text_area(" Job Description", height=200, key="jd_recruiter")
     resumes = st.file_uploader(" Upload Resume PDFs", type=["pdf"], accept_multiple_files=True, key="resumes_bulk")
@@ -49,48 +51,68 @@ with tab2:
         if not jd_recruiter or not resumes:
             st.error("Please provide Job Description and upload at least 1 resume.")
         else:
+            result = None
+            files = [("resume_files", (r.name, r, "application/pdf")) for r in resumes]
+
             if len(resumes) > 50:
-                st.error("Max 50 resumes allowed.")
+                # Large batches run as a background job on the API; poll until done.
+                response = requests.post(API_JOBS_URL, data={"job_description": jd_recruiter}, files=files)
+                if response.status_code != 200:
+                    st.error("API Error: " + response.text)
+                else:
+                    job_id = response.json()["job_id"]
+                    progress = st.progress(0.0, text=f"Ranking {len(resumes)} resumes in the background...")
+                    status = {"status": "queued"}
+                    while status["status"] in ("queued", "running"):
+                        time.sleep(1)
+                        status = requests.get(f"{API_JOBS_URL}/{job_id}").json()
+                        progress.progress(status["progress"], text=f"Processed {status['processed'] + status['failed']} / {status['total']}")
+
+                    if status["status"] != "completed":
+                        st.error(f"Ranking job {status['status']}: {status.get('error') or ''}")
+                    else:
+                        page = requests.get(f"{API_JOBS_URL}/{job_id}/results", params={"limit": top_k}).json()
+                        result = {"total_resumes": page["total_scored"], "top_k": top_k, "ranked_resumes": page["ranked_resumes"]}
             else:
                 with st.spinner("Ranking resumes... (this may take time)"):
                     data = {"job_description": jd_recruiter, "top_k": str(top_k)}
 
-                    files = [("resume_files", (r.name, r, "application/pdf")) for r in resumes]
-
                     response = requests.post(API_RANK_URL, data=data, files=files)
 
                     if response.status_code != 200:
                         st.error("API Error: " + response.text)
                     else:
                         result = response.json()
-                        ranked = result["ranked_resumes"]
-
-                        st.success(f" Ranked {result['total_resumes']} resumes. Showing top {result['top_k']}.")
-
-                        
-                        table_data = []
-                        for i, row in enumerate(ranked, start=1):
-                            table_data.append({
-                                "Rank": i,
-                                "Resume Name": row["resume_name"],
-                                "Fit Score": row["fit_prediction_score"],
-                                "Match Score": row["match_score"],
-                                "Missing Skills": ", ".join(row["missing_skills"][:5]),
-                                "Missing Keywords": ", ".join(row["missing_keywords"][:5])
-                            })
-
-                        df = pd.DataFrame(table_data)
-                        st.dataframe(df, use_container_width=True)
-
-                       
-                        st.subheader(" Full Candidate Details")
-                        for row in ranked:
-                            with st.expander(f"{row['resume_name']} (Fit: {row['fit_prediction_score']} | Match: {row['match_score']})"):
-                                st.write("### Missing Skills")
-                                st.write(row["missing_skills"])
-
-                                st.write("### Missing Keywords")
-                                st.write(row["missing_keywords"])
-
-                                st.write("### Similarity Breakdown")
-                                st.json(row["similarity"])
+
+            if result is not None:
+                ranked = result["ranked_resumes"]
+
+                st.success(f" Ranked {result['total_resumes']} resumes. Showing top {result['top_k']}.")
+
+                
+                table_data = []
+                for i, row in enumerate(ranked, start=1):
+                    table_data.append({
+                        "Rank": i,
+                        "Resume Name": row["resume_name"],
+                        "Fit Score": row["fit_prediction_score"],
+                        "Match Score": row["match_score"],
+                        "Missing Skills": ", ".join(row["missing_skills"][:5]),
+                        "Missing Keywords": ", ".join(row["missing_keywords"][:5])
+                    })
+
+                df = pd.DataFrame(table_data)
+                st.dataframe(df, use_container_width=True)
+
+
+                st.subheader(" Full Candidate Details")
+                for row in ranked:
+                    with st.expander(f"{row['resume_name']} (Fit: {row['fit_prediction_score']} | Match: {row['match_score']})"):
+                        st.write("### Missing Skills")
+                        st.write(row["missing_skills"])
+
+                        st.write("### Missing Keywords")
+                        st.write(row["missing_keywords"])
+
+                        st.write("### Similarity Breakdown")
+                        st.json(row["similarity"])
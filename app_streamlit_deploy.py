@@ -1,8 +1,14 @@
+import asyncio
 import streamlit as st
 import pandas as pd
 
-from src.utils.pdf import extract_text_from_pdf
+from src.api.pdf_pool import PdfExtractionPool
+from src.scoring.rank_engine import RankEngine, TopK, compact_result
 from src.scoring.score_engine import ScoreEngine
+from src.utils.pdf import PdfExtractionError
+
+# Resumes extracted + scored per step; memory holds one chunk plus the running top-k.
+RANK_CHUNK_SIZE = 16
 
 st.set_page_config(page_title="AI Job Intelligence", layout="wide")
 st.title(" AI Job Application Intelligence System (Deployed)")
@@ -12,7 +18,16 @@ st.caption("This version runs everything inside Streamlit. No FastAPI needed.")
 def get_engine():
     return ScoreEngine()
 
+# PDF parsing runs in small model-free worker processes with the API's limits
+# and hard timeout, so one stuck PDF can't hang the app; scoring uses the
+# single engine above.
+@st.cache_resource
+def get_pdf_pool():
+    return PdfExtractionPool()
+
 engine = get_engine()
+rank_engine = RankEngine(engine)
+pdf_pool = get_pdf_pool()
 
 tab1, tab2 = st.tabs([" Job Seeker Mode", " Recruiter Mode"])
 
@@ -26,13 +41,16 @@ with tab1:
             st.error("Please provide both Job Description and Resume PDF.")
         else:
             with st.spinner("Analyzing..."):
-                pdf_bytes = resume.read()
-                resume_text = extract_text_from_pdf(pdf_bytes)
-                result = engine.analyze(jd, resume_text)
+                try:
+                    resume_text = asyncio.run(pdf_pool.extract(resume.read()))
+                except PdfExtractionError as e:
+                    st.error(f"Could not read the PDF: {e}")
+                else:
+                    result = engine.analyze(jd, resume_text)
 
-                st.success(f" Match Score: {result['match_score']} / 100")
-                st.info(f" Fit Score: {result['fit_prediction_score']} / 100")
-                st.json(result)
+                    st.success(f" Match Score: {result['match_score']} / 100")
+                    st.info(f" Fit Score: {result['fit_prediction_score']} / 100")
+                    st.json(result)
 
 with tab2:
     st.subheader(" Recruiter Mode")
@@ -43,22 +61,31 @@ with tab2:
     if st.button("Rank Resumes"):
         if not jd2 or not resumes:
             st.error("Please provide Job Description and at least 1 resume.")
-        elif len(resumes) > 50:
-            st.error("Max 50 resumes allowed.")
         else:
-            with st.spinner("Ranking..."):
-                rows = []
-                for f in resumes:
-                    resume_text = extract_text_from_pdf(f.read())
-                    analysis = engine.analyze(jd2, resume_text)
-
-                    rows.append({
-                        "Resume": f.name,
-                        "Fit Score": analysis["fit_prediction_score"],
-                        "Match Score": analysis["match_score"],
-                        "Missing Skills": ", ".join(analysis["skills"]["missing"][:5]),
-                    })
-
-                rows.sort(key=lambda x: (x["Fit Score"], x["Match Score"]), reverse=True)
-                df = pd.DataFrame(rows[:top_k])
-                st.dataframe(df, use_container_width=True)
+            # JD-side work once, then extract + score chunk by chunk
+            job = engine.job_profile(jd2)
+            top, failed = TopK(top_k), []
+            progress = st.progress(0.0, text=f"Ranking {len(resumes)} resumes...")
+
+            for start in range(0, len(resumes), RANK_CHUNK_SIZE):
+                chunk = resumes[start:start + RANK_CHUNK_SIZE]
+                extracted = asyncio.run(pdf_pool.extract_many([(f.name, f.read()) for f in chunk]))
+                failed += [{"name": name, "error": error} for name, _, error in extracted if error]
+                batch = [{"name": name, "text": text} for name, text, error in extracted if not error]
+                for result in rank_engine.score(job, batch):
+                    top.push(compact_result(result))
+
+                done = min(start + RANK_CHUNK_SIZE, len(resumes))
+                progress.progress(done / len(resumes), text=f"Processed {done} / {len(resumes)}")
+
+            rows = [{
+                "Resume": row["resume_name"],
+                "Fit Score": row["fit_prediction_score"],
+                "Match Score": row["match_score"],
+                "Missing Skills": ", ".join(row["missing_skills"][:5]),
+            } for row in top.sorted()]
+            df = pd.DataFrame(rows)
+            st.dataframe(df, use_container_width=True)
+
+            if failed:
+                st.warning("Could not read: " + ", ".join(f"{f['name']} ({f['error']})" for f in failed))
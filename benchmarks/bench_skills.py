@@ -0,0 +1,82 @@
+"""
+Skill extraction cost vs taxonomy size.
+
+Run from the repo root:
+    python -m benchmarks.bench_skills
+"""
+import random
+import string
+import time
+
+from src.config import DEFAULT_SKILLS
+from src.utils.skills import SkillMatcher
+from src.utils.text import clean_text
+
+TAXONOMY_SIZES = [100, 1_000, 5_000, 20_000]
+N_DOCS = 50
+DOC_WORDS = 600
+
+
+def legacy_extract_skills(text, skills_list):
+    # The pre-trie implementation: clean every skill, substring scan per skill.
+    text_clean = clean_text(text)
+    matched = set()
+    for skill in skills_list:
+        if clean_text(skill) in text_clean:
+            matched.add(skill)
+    return sorted(matched)
+
+
+def fake_skill(rng):
+    n_words = rng.choice([1, 1, 1, 2, 2, 3])
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(n_words))
+
+
+def make_taxonomy(size, rng):
+    skills = list(DEFAULT_SKILLS)
+    seen = set(skills)
+    while len(skills) < size:
+        s = fake_skill(rng)
+        if s not in seen:
+            seen.add(s)
+            skills.append(s)
+    return skills
+
+
+def make_docs(taxonomy, rng):
+    filler = "experience team built delivered projects using with and the for production systems".split()
+    docs = []
+    for _ in range(N_DOCS):
+        words = rng.choices(filler, k=DOC_WORDS)
+        for _ in range(40):
+            words.insert(rng.randrange(len(words)), rng.choice(taxonomy))
+        docs.append(" ".join(words))
+    return docs
+
+
+def time_per_doc(fn, docs):
+    start = time.perf_counter()
+    for d in docs:
+        fn(d)
+    return (time.perf_counter() - start) / len(docs) * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'skills':>8} | {'build ms':>9} | {'trie ms/doc':>11} | {'legacy ms/doc':>13}")
+    for size in TAXONOMY_SIZES:
+        taxonomy = make_taxonomy(size, rng)
+        docs = make_docs(taxonomy, rng)
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        trie_ms = time_per_doc(matcher.find, docs)
+        legacy_ms = time_per_doc(lambda d: legacy_extract_skills(d, taxonomy), docs[:10])
+
+        print(f"{size:>8} | {build_ms:>9.1f} | {trie_ms:>11.3f} | {legacy_ms:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
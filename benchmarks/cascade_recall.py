@@ -0,0 +1,98 @@
+"""
+Recall of cascade ranking (RankEngine.rank_cascade) against the full ranking
+(RankEngine.rank) on synthetic JDs and resumes, with the stub encoder.
+
+For every (shortlist, early_stop) setting it reports recall@k (share of the
+full top-k that the cascade also returns), whether the order matched exactly,
+how many resumes reached SBERT and the speedup. The exact setting (early stop,
+no shortlist cap, the endpoint default) is asserted to reproduce the full
+top-k, names and scores; the script also exits 1 if any setting's recall
+falls below --min-recall (default 0.9), e.g. when the capped shortlist stops
+finding the true top-k.
+
+    python -m benchmarks.cascade_recall --resumes 1000 --jds 5 --top-k 10
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+from src.scoring.rank_engine import RankEngine
+
+from .run import stub_engine
+from .synthetic import make_jd, make_resumes
+
+SETTINGS = [(0, True), (50, True), (100, True), (250, True), (100, False), (250, False)]
+
+
+def recall_at_k(full: List[Dict], cascade: List[Dict]) -> float:
+    expected = {r["resume_name"] for r in full}
+    if not expected:
+        return 1.0
+    return len(expected & {r["resume_name"] for r in cascade}) / len(expected)
+
+
+def ranking(rows: List[Dict]) -> List[tuple]:
+    return [(r["resume_name"], r["fit_prediction_score"], r["match_score"]) for r in rows]
+
+
+def assert_exact(rank_engine: RankEngine, jds: List[str], resumes: List[Dict], full_results: List[List[Dict]], top_k: int):
+    """rank_cascade with early stopping and no shortlist cap returns exactly rank()'s top-k."""
+    for i, (jd, full) in enumerate(zip(jds, full_results)):
+        top, _ = rank_engine.rank_cascade(jd, resumes, top_k, shortlist=0, early_stop=True)
+        assert ranking(top) == ranking(full), f"JD {i}: exact cascade differs from the full ranking"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade ranking recall vs full ranking.")
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=0.9, help="Fail if any setting's mean recall is lower")
+    args = parser.parse_args()
+
+    rank_engine = RankEngine(stub_engine())
+    rng = random.Random(0)
+    resumes = [{"name": f"r{i}", "text": t} for i, t in enumerate(make_resumes(args.resumes, seed=1))]
+    jds = [make_jd(rng) for _ in range(args.jds)]
+
+    full_results, full_seconds = [], 0.0
+    for jd in jds:
+        rank_engine.rank(jd, resumes[:1], 1)  # JD profile + caches warm, as in serving
+        start = time.perf_counter()
+        top, _ = rank_engine.rank(jd, resumes, args.top_k)
+        full_seconds += time.perf_counter() - start
+        full_results.append(top)
+
+    assert_exact(rank_engine, jds, resumes, full_results, args.top_k)
+
+    print(f"{'shortlist':>9} {'early_stop':>10} {'recall@k':>9} {'exact':>6} {'scored':>8} {'speedup':>8}")
+    failures = []
+    for shortlist, early_stop in SETTINGS:
+        recalls, exact, scored, seconds = [], 0, 0, 0.0
+        for jd, full in zip(jds, full_results):
+            start = time.perf_counter()
+            top, stats = rank_engine.rank_cascade(jd, resumes, args.top_k, shortlist, early_stop)
+            seconds += time.perf_counter() - start
+            recalls.append(recall_at_k(full, top))
+            exact += [r["resume_name"] for r in top] == [r["resume_name"] for r in full]
+            scored += stats["scored"]
+
+        recall = sum(recalls) / len(recalls)
+        print(
+            f"{shortlist or 'all':>9} {str(early_stop):>10} {recall:>9.3f} {exact:>3}/{len(jds):<2} "
+            f"{scored / len(jds):>8.0f} {full_seconds / seconds:>7.1f}x"
+        )
+        if recall < args.min_recall:
+            failures.append(f"shortlist={shortlist} early_stop={early_stop}: recall {recall:.3f} < {args.min_recall}")
+
+    if failures:
+        for line in failures:
+            print("❌ " + line)
+        sys.exit(1)
+    print("✅ Cascade ranking checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Parity and throughput of the SBERT encoder backends (src/scoring/encoders.py)
+against a reference backend, on synthetic JDs and resumes.
+
+Per backend it reports:
+  - encode throughput (texts/s, best of --repeat)
+  - embedding drift: cosine between the backend's and the reference's vector of each text
+  - JD-resume similarity drift: |sbert_sim - reference sbert_sim|
+  - FitClassifier drift: |fit score - reference fit score| (0-100) with all
+    other features held fixed, and the share of pairs whose score changed
+
+    python -m benchmarks.encoder_parity --backends torch,int8,onnx --out /tmp/parity.json
+    python -m benchmarks.encoder_parity --max-fit-delta 2     # exit 1 if any backend drifts more
+
+The onnx backend needs `python -m src.scoring.encoders export-onnx` first;
+backends that fail to load are reported and skipped.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.config import SBERT_MODEL_NAME
+from src.scoring.encoders import ENCODER_BACKENDS, load_encoder
+from src.scoring.features import SBERT_COLUMN
+from src.scoring.fit_classifier import FitClassifier
+from src.scoring.score_engine import ScoreEngine
+from src.utils.text import clean_text
+
+from .run import stub_sbert
+from .synthetic import make_jd, make_resumes
+
+
+def encode_timed(encoder, texts: List[str], repeat: int, batch_size: int):
+    best, vecs = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        vecs = encoder.encode(texts, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return vecs, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encoder backend parity + throughput vs a reference backend.")
+    parser.add_argument("--model", default=SBERT_MODEL_NAME)
+    parser.add_argument("--backends", default="torch,int8,onnx", help=f"Comma-separated, from {', '.join(ENCODER_BACKENDS)}")
+    parser.add_argument("--reference", default="torch")
+    parser.add_argument("--jds", type=int, default=10)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--max-fit-delta", type=float, default=None, help="Fail if any backend's max fit score delta is larger")
+    parser.add_argument("--out", type=Path, default=None, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    jds = [clean_text(make_jd(rng)) for _ in range(args.jds)]
+    resumes = [clean_text(t) for t in make_resumes(args.resumes, seed=1)]
+    texts = jds + resumes
+
+    # non-SBERT features once; only the sbert column changes between backends
+    engine = ScoreEngine(sbert=stub_sbert(), classifier=FitClassifier())
+    docs = engine.parse_batch(resumes)
+    base_features = [engine.cheap_features(engine.job_profile(jd), docs)[0] for jd in jds]
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if args.reference not in backends:
+        backends.insert(0, args.reference)
+
+    runs: Dict[str, Dict] = {}
+    for backend in backends:
+        try:
+            encoder = load_encoder(args.model, backend)
+        except Exception as e:
+            print(f"⚠️ {backend}: could not load ({e}); skipped")
+            continue
+        encoder.encode(texts[:2], batch_size=2)  # lazy init outside the timing
+        vecs, seconds = encode_timed(encoder, texts, args.repeat, args.batch_size)
+        sims = vecs[len(jds):] @ vecs[:len(jds)].T  # (resumes, jds)
+
+        fit = []
+        for j, features in enumerate(base_features):
+            features = features.copy()
+            features[:, SBERT_COLUMN] = sims[:, j]
+            fit.append(np.rint(engine.classifier.predict_proba_batch(features) * 100))
+        runs[backend] = {"vecs": vecs, "sims": sims, "fit": np.stack(fit, axis=1), "seconds": seconds}
+
+    if args.reference not in runs:
+        print(f"❌ Reference backend '{args.reference}' could not be loaded")
+        sys.exit(1)
+    ref = runs[args.reference]
+
+    results = {}
+    print(f"{'backend':>8} {'texts/s':>9} {'speedup':>8} {'min cos':>8} {'mean |Δsim|':>12} {'max |Δsim|':>11} {'mean |Δfit|':>12} {'max |Δfit|':>11} {'fit changed':>12}")
+    for backend, run in runs.items():
+        cos = np.einsum("ij,ij->i", run["vecs"], ref["vecs"])
+        d_sim = np.abs(run["sims"] - ref["sims"])
+        d_fit = np.abs(run["fit"] - ref["fit"])
+        r = results[backend] = {
+            "texts_per_s": len(texts) / run["seconds"],
+            "speedup": ref["seconds"] / run["seconds"],
+            "min_cosine": float(cos.min()),
+            "mean_cosine": float(cos.mean()),
+            "mean_sim_delta": float(d_sim.mean()),
+            "max_sim_delta": float(d_sim.max()),
+            "mean_fit_delta": float(d_fit.mean()),
+            "max_fit_delta": float(d_fit.max()),
+            "fit_changed": float((d_fit > 0).mean())
+        }
+        print(
+            f"{backend:>8} {r['texts_per_s']:>9,.1f} {r['speedup']:>7.2f}x {r['min_cosine']:>8.4f} "
+            f"{r['mean_sim_delta']:>12.5f} {r['max_sim_delta']:>11.5f} {r['mean_fit_delta']:>12.3f} "
+            f"{r['max_fit_delta']:>11.0f} {r['fit_changed']:>11.1%}"
+        )
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps({"model": args.model, "reference": args.reference, "results": results}, indent=2))
+        print(f"\n✅ Results saved to: {args.out}")
+
+    if args.max_fit_delta is not None:
+        over = [b for b, r in results.items() if r["max_fit_delta"] > args.max_fit_delta]
+        if over:
+            print(f"❌ Fit score drift above {args.max_fit_delta:g}: {', '.join(over)}")
+            sys.exit(1)
+        print(f"✅ Every backend within {args.max_fit_delta:g} fit points of {args.reference}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Offline benchmark suite for the scoring and ranking pipeline.
+
+Every benchmark runs on synthetic data (benchmarks/synthetic.py) with a stub
+encoder and an in-memory embedding cache, so it needs no dataset, network or
+model download. Results (seconds, per-item ms, items/s, tracemalloc peak) are
+written as JSON; `--baseline` compares against an earlier run and exits 1 when
+anything got slower (or hungrier) than the threshold allows.
+
+Run from the repo root:
+    python -m benchmarks.run                                  # writes benchmarks/results/latest.json
+    python -m benchmarks.run --sizes 10,100 --out /tmp/new.json --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.config import DEFAULT_SKILLS
+from src.scoring.embedding_cache import EmbeddingCache
+from src.scoring.fit_classifier import FitClassifier
+from src.scoring.rank_engine import RankEngine
+from src.scoring.sbert_matcher import SBERTMatcher
+from src.scoring.score_engine import ScoreEngine
+from src.scoring.tfidf_matcher import TfidfMatcher
+from src.utils.keywords import find_missing_keywords
+from src.utils.pdf import extract_text_from_pdf
+from src.utils.skills import extract_skills
+from src.utils.text import clean_text, parse_document
+
+from .synthetic import make_jd, make_pdf, make_resumes
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+RANK_SIZES = [10, 100, 1_000, 10_000]
+STUB_MODEL = "benchmark-stub"
+
+
+def measure(fn: Callable[[], object], items: int, repeat: int = 3) -> Dict[str, float]:
+    """Best-of-`repeat` wall time, plus the tracemalloc peak of one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "items": items,
+        "seconds": best,
+        "per_item_ms": best / max(items, 1) * 1000,
+        "items_per_s": items / best if best > 0 else float("inf"),
+        "peak_mb": peak / (1024 * 1024)
+    }
+
+
+def stub_sbert() -> SBERTMatcher:
+    """SBERTMatcher with the stub encoder and a memory-only cache."""
+    return SBERTMatcher(STUB_MODEL, cache=EmbeddingCache(STUB_MODEL, disk_dir=None), backend="stub")
+
+
+def stub_engine() -> ScoreEngine:
+    return ScoreEngine(sbert=stub_sbert())
+
+
+def run_all(sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(0)
+    jd = make_jd(rng)
+    resumes = make_resumes(max(sizes + [1_000]), seed=1)
+    sample = resumes[:1_000]
+    results: Dict[str, Dict[str, float]] = {}
+
+    def bench(name: str, fn: Callable[[], object], items: int, n_repeat: int = repeat):
+        results[name] = measure(fn, items, n_repeat)
+        r = results[name]
+        print(f"{name:<34} {r['per_item_ms']:>10.3f} ms/item {r['items_per_s']:>12,.0f} items/s {r['peak_mb']:>9.1f} MB peak")
+
+    bench("clean_text", lambda: [clean_text(t) for t in sample], len(sample))
+    bench("extract_skills", lambda: [extract_skills(t, DEFAULT_SKILLS) for t in sample], len(sample))
+
+    jd_doc = parse_document(jd)
+    bench("find_missing_keywords", lambda: [find_missing_keywords(jd_doc, t) for t in sample], len(sample))
+
+    tfidf = TfidfMatcher()
+    clean = [clean_text(t) for t in sample]
+    jd_clean = clean_text(jd)
+    bench("tfidf.similarity_many", lambda: tfidf.similarity_many(jd_clean, clean), len(clean))
+    bench("tfidf.similarity", lambda: [tfidf.similarity(jd_clean, c) for c in clean[:100]], 100, 1)
+
+    # cold: fresh cache every run (encoder + cache writes); warm: all hits
+    bench("sbert.embed_many[cold]", lambda: stub_sbert().embed_many(clean), len(clean))
+    warm = stub_sbert()
+    warm.embed_many(clean)
+    bench("sbert.embed_many[warm]", lambda: warm.embed_many(clean), len(clean))
+
+    classifier = FitClassifier()
+    features = np.random.default_rng(0).uniform(0, 1, size=(10_000, 5)) * [1, 1, 1, 20, 30]
+    bench("classifier.predict_with_explain", lambda: classifier.predict_with_explain_batch(features), len(features))
+
+    engine = stub_engine()
+    engine.analyze(jd, sample[0])  # JD profile cached, as in serving
+    bench("engine.analyze", lambda: [engine.analyze(jd, t) for t in sample[:100]], 100)
+
+    rank_engine = RankEngine(engine)
+    for n in sizes:
+        batch = [{"name": f"r{i}.pdf", "text": t} for i, t in enumerate(resumes[:n])]
+        bench(f"rank_engine.rank[{n}]", lambda: rank_engine.rank(jd, batch, top_k=10), n, 1 if n >= 1_000 else repeat)
+        bench(f"rank_engine.rank_cascade[{n}]", lambda: rank_engine.rank_cascade(jd, batch, top_k=10), n, 1 if n >= 1_000 else repeat)
+
+    pdfs = [make_pdf(t) for t in sample[:100]]
+    bench("extract_text_from_pdf", lambda: [extract_text_from_pdf(p) for p in pdfs], len(pdfs))
+
+    return results
+
+
+def compare(current: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], time_threshold: float, memory_threshold: float) -> List[str]:
+    """Human-readable regressions of `current` vs `baseline`, empty when none."""
+    regressions = []
+    for name, base in baseline.items():
+        cur = current.get(name)
+        if cur is None:
+            continue
+        if cur["per_item_ms"] > base["per_item_ms"] * (1 + time_threshold):
+            regressions.append(
+                f"{name}: {cur['per_item_ms']:.3f} ms/item vs {base['per_item_ms']:.3f} "
+                f"(+{cur['per_item_ms'] / base['per_item_ms'] - 1:.0%})"
+            )
+        if base["peak_mb"] > 1 and cur["peak_mb"] > base["peak_mb"] * (1 + memory_threshold):
+            regressions.append(
+                f"{name}: {cur['peak_mb']:.1f} MB peak vs {base['peak_mb']:.1f} "
+                f"(+{cur['peak_mb'] / base['peak_mb'] - 1:.0%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scoring / ranking benchmarks.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in RANK_SIZES), help="Resume counts for RankEngine.rank")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing")
+    parser.add_argument("--out", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="Allowed slowdown per benchmark (0.25 = 25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.5, help="Allowed peak memory growth per benchmark")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = run_all(sizes, args.repeat)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results
+    }, indent=2))
+    print(f"\n✅ Results saved to: {args.out}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+        if regressions:
+            print("❌ Regressions vs", args.baseline)
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"✅ No regressions vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Deterministic synthetic JDs, resumes and PDFs for the benchmarks, so the suite
+runs with no dataset, network or model download (the stub sentence encoder is
+the `stub` backend in src/scoring/encoders.py).
+"""
+import random
+import textwrap
+from typing import List
+
+from src.config import DEFAULT_SKILLS
+
+FILLER = (
+    "experience team built delivered projects using with and the for production systems "
+    "designed implemented maintained scalable services customers data platform improved "
+    "performance reliability led worked across stakeholders requirements testing deployed "
+    "monitoring ownership product features api backend frontend cloud infrastructure"
+).split()
+
+TITLES = ["Software Engineer", "Backend Developer", "Data Scientist", "ML Engineer", "Full Stack Developer", "DevOps Engineer"]
+
+
+def make_jd(rng: random.Random, n_skills: int = 8, n_words: int = 250) -> str:
+    skills = rng.sample(DEFAULT_SKILLS, n_skills)
+    words = rng.choices(FILLER, k=n_words)
+    for s in skills:
+        for _ in range(2):
+            words.insert(rng.randrange(len(words)), s)
+    return f"{rng.choice(TITLES)}. Requirements: {', '.join(skills)}. " + " ".join(words)
+
+
+def make_resume(rng: random.Random, n_skills: int = 10, n_words: int = 500) -> str:
+    skills = rng.sample(DEFAULT_SKILLS, n_skills)
+    sentences = []
+    words = rng.choices(FILLER, k=n_words)
+    for start in range(0, len(words), 12):
+        sentences.append(" ".join(words[start:start + 12]).capitalize() + ".")
+    for s in skills:
+        sentences.insert(rng.randrange(len(sentences) + 1), f"Used {s} in production.")
+    return f"{rng.choice(TITLES)}\nSkills: {', '.join(skills)}\n" + " ".join(sentences)
+
+
+def make_resumes(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [make_resume(rng) for _ in range(n)]
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, lines_per_page: int = 55, width: int = 95) -> bytes:
+    """
+    Minimal valid PDF (Helvetica text, one content stream per page) written
+    by hand, so PDF benchmarks need no PDF library to create their inputs.
+    """
+    lines = []
+    for paragraph in text.splitlines() or [""]:
+        lines.extend(textwrap.wrap(paragraph, width) or [""])
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    n_pages = len(pages)
+    page_ids = [4 + 2 * i for i in range(n_pages)]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {n_pages} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        body = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({_pdf_escape(l)}) '" for l in page_lines) + " ET"
+        stream = body.encode("latin-1", "replace")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for obj_id in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref)
+    return bytes(out)
+
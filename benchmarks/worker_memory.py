@@ -0,0 +1,115 @@
+"""
+Per-worker memory of the pre-fork launcher (src/api/serve.py), with and
+without model preloading.
+
+RSS counts shared pages in every process that maps them, so it overstates
+what an extra worker costs; PSS splits shared pages between the processes
+sharing them and USS counts only a process's private pages. Sum of PSS is the
+real footprint of the deployment. Linux only (reads /proc/<pid>/smaps_rollup).
+
+Run from the repo root:
+    python -m benchmarks.worker_memory --workers 4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+
+def smaps(pid: int) -> Dict[str, int]:
+    """Rss / Pss / USS of a process in MB."""
+    kb = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[-1] == "kB":
+                kb[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_mb": kb.get("Rss", 0) / 1024,
+        "pss_mb": kb.get("Pss", 0) / 1024,
+        "uss_mb": (kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0)) / 1024
+    }
+
+
+def children(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def wait_ready(proc: subprocess.Popen, port: int, timeout: float):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2) as r:
+                if r.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("server never became ready")
+
+
+def measure(workers: int, preload: bool, port: int, timeout: float) -> Dict[str, object]:
+    cmd = [sys.executable, "-m", "src.api.serve", "--workers", str(workers), "--port", str(port), "--log-level", "warning"]
+    if not preload:
+        cmd.append("--no-preload")
+    env = dict(os.environ, JOBINT_JOB_WORKERS="0")
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        wait_ready(proc, port, timeout)
+        # let every worker finish its warmup encode before sampling
+        previous = None
+        for _ in range(int(timeout)):
+            pids = children(proc.pid)
+            current = [round(smaps(p)["rss_mb"]) for p in pids]
+            if len(pids) == workers and current == previous:
+                break
+            previous = current
+            time.sleep(2)
+
+        worker_stats = [{"pid": p, **smaps(p)} for p in children(proc.pid)]
+        master = {"pid": proc.pid, **smaps(proc.pid)}
+        return {
+            "preload": preload,
+            "workers": worker_stats,
+            "master": master,
+            "total_pss_mb": master["pss_mb"] + sum(w["pss_mb"] for w in worker_stats)
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker RSS/PSS/USS with and without model preloading.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--json", type=str, default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for preload in (False, True):
+        r = measure(args.workers, preload, args.port, args.timeout)
+        results.append(r)
+        label = "preload" if preload else "no preload"
+        print(f"\n{label}: {args.workers} workers")
+        print(f"{'process':>8} | {'RSS MB':>8} | {'PSS MB':>8} | {'USS MB':>8}")
+        for name, s in [("master", r["master"])] + [(f"w{i}", w) for i, w in enumerate(r["workers"])]:
+            print(f"{name:>8} | {s['rss_mb']:>8.1f} | {s['pss_mb']:>8.1f} | {s['uss_mb']:>8.1f}")
+        print(f"{'total PSS':>8}: {r['total_pss_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
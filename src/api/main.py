@@ -1,13 +1,33 @@
+import asyncio
+import json
+import threading
+import time
 from typing import List
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, Request, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
-from ..utils.pdf import extract_text_from_pdf
-from ..scoring.score_engine import ScoreEngine
+from ..utils import metrics
+from ..utils.pdf import PdfExtractionError
+from .pdf_pool import PdfExtractionPool
+from .responses import FastJSONResponse
+from ..scoring import registry
+from ..scoring.analysis_cache import AnalysisCache
+from ..scoring.match_matrix import MatchMatrix
 from ..scoring.schema import AnalysisResponse
 
-from ..scoring.rank_engine import RankEngine
-from ..scoring.rank_schema import RankResponse
+from ..scoring.rank_engine import (
+    CASCADE_CHUNK_SIZE, CASCADE_SHORTLIST, RankEngine, TopK, candidate_event, compact_result, response_row, summary_event
+)
+from ..scoring.score_engine import resolve_sections
+from ..scoring.rank_schema import MatchMatrixRequest, MatchMatrixResponse, RankResponse, SearchResponse, IndexResponse
+from ..index.corpus_index import CorpusIndex
+from ..config import JOBS_WORKERS, METRICS_ENABLED, MODEL_WARMUP, RESULT_CACHE_ENABLED
+from ..jobs.store import JobStore
+from ..jobs.runner import JobRunner
+from ..jobs.schema import JobResults, JobStatus, JobSubmitted
 
 
 app = FastAPI(title="AI Job Intelligence API")
@@ -20,46 +40,346 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-engine = ScoreEngine()
-rank_engine = RankEngine()
+# one shared engine per process; the SBERT model loads on warmup or first use
+engine = registry.get_score_engine()
+rank_engine = RankEngine(engine)
+match_matrix = MatchMatrix(engine)
+analysis_cache = AnalysisCache(engine) if RESULT_CACHE_ENABLED else None
+corpus = CorpusIndex(engine)
+pdf_pool = PdfExtractionPool()
+job_store = JobStore()
+job_runner = JobRunner()
+# the pre-fork launcher (src/api/serve.py) turns this off in all but one worker
+run_job_runner = JOBS_WORKERS > 0
+
+
+def _warmup_models():
+    try:
+        seconds = registry.warmup()
+        print(f"✅ Models loaded in {seconds:.1f}s")
+    except Exception as e:
+        print(f"⚠️ Model warmup failed, models will load on first use: {e}")
+
+
+@app.on_event("startup")
+def start_background_work():
+    if MODEL_WARMUP:
+        # in the background, so /health answers while the weights load
+        threading.Thread(target=_warmup_models, name="model-warmup", daemon=True).start()
+    if run_job_runner:
+        job_runner.start()
+
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    pdf_pool.shutdown()
+    job_runner.stop()
+
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    """Request latency histogram + a Server-Timing header with the per-stage breakdown."""
+    if not METRICS_ENABLED:
+        return await call_next(request)
+
+    timings = metrics.start_request_timings()
+    start = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - start
+
+    # route template, not the raw path, so /jobs/{job_id} stays one series
+    route = request.scope.get("route")
+    metrics.REQUEST_SECONDS.observe(
+        total,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code)
+    )
+    # streamed bodies are still being produced here, so only the time to the headers is known
+    response.headers["Server-Timing"] = metrics.server_timing_header(timings, total)
+    return response
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of this worker process's metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """200 once the models are loaded (or immediately when warmup is disabled), else 503."""
+    status = registry.status()
+    is_ready = status["warmed_up"] or not MODEL_WARMUP
+    return JSONResponse({"ready": is_ready, **status}, status_code=200 if is_ready else 503)
+
 
+async def extract_uploads(files: List[UploadFile]):
+    """
+    Parse every upload concurrently in the PDF pool.
+    Returns ([{"name", "text"}], [{"name", "error"}]).
+    """
+    # large files are spooled to disk; reading stops past the size limit
+    uploads = [(file.filename, await pdf_pool.spool(file)) for file in files]
+    try:
+        with metrics.timed("pdf"):
+            extracted = await pdf_pool.extract_many(uploads)
+    finally:
+        for _, pdf in uploads:
+            pdf.close()
+
+    parsed, failed = [], []
+    for name, text, error in extracted:
+        if error is None:
+            parsed.append({"name": name, "text": text})
+        else:
+            failed.append({"name": name, "error": error})
+    return parsed, failed
+
+ 
+def request_sections(fields: str, default: str):
+    try:
+        return resolve_sections(fields, default)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
  
-@app.post("/analyze", response_model=AnalysisResponse)
+@app.post("/analyze", response_model=AnalysisResponse, response_class=FastJSONResponse)
 async def analyze(
     job_description: str = Form(...),
-    resume_file: UploadFile = File(...)
+    resume_file: UploadFile = File(...),
+    fields: str = Form("full")
 ):
-    pdf_bytes = await resume_file.read()
-    resume_text = extract_text_from_pdf(pdf_bytes)
+    """
+    `fields`: a detail level (summary / standard / full) or comma-separated
+    report sections; sections not asked for are neither computed nor sent.
 
-    result = engine.analyze(job_description, resume_text)
-    return result
+    The PDF text and the report are served from the result caches when the
+    same PDF / (JD, resume, fields) was seen before; `cache` says which were.
+    """
+    sections = request_sections(fields, "full")
+    pdf = await pdf_pool.spool(resume_file)
+    try:
+        with metrics.timed("pdf"):
+            resume_text, pdf_source = await pdf_pool.extract_cached(pdf)
+    except PdfExtractionError as e:
+        raise HTTPException(status_code=422, detail=f"{resume_file.filename}: {e}")
+    finally:
+        pdf.close()
+
+    if analysis_cache is not None:
+        result, analysis_source = await run_in_threadpool(analysis_cache.analyze, job_description, resume_text, sections)
+    else:
+        result, analysis_source = await run_in_threadpool(engine.analyze, job_description, resume_text, sections), None
+
+    cache = {
+        "pdf_text": pdf_source or ("miss" if pdf_pool.text_cache is not None else "off"),
+        "analysis": analysis_source or ("miss" if analysis_cache is not None else "off")
+    }
+    # a new dict: cached reports are shared between requests
+    return FastJSONResponse({**result, "cache": cache})
 
 
  
-@app.post("/rank_resumes", response_model=RankResponse)
+@app.post("/rank_resumes", response_model=RankResponse, response_class=FastJSONResponse)
 async def rank_resumes(
+    job_description: str = Form(...),
+    resume_files: List[UploadFile] = File(...),
+    top_k: int = Form(10),
+    cascade: bool = Form(False),
+    shortlist: int = Form(CASCADE_SHORTLIST),
+    early_stop: bool = Form(True),
+    fields: str = Form("standard")
+):
+    """
+    `cascade=true` ranks in two stages: cheap features for every resume, then
+    SBERT + classifier in upper-bound order, stopping early when nothing left
+    can reach the top-k; only the top-k get the full analysis. The default
+    `shortlist` (0, no cap) with `early_stop` gives the same top-k as the full
+    ranking. `shortlist > 0` also caps how many resumes reach SBERT, chosen
+    by an estimate of their scores from the cheap features: faster, but
+    approximate (recall is measured by `python -m benchmarks.cascade_recall`).
+
+    `fields` (detail level or report sections, default standard) decides what
+    is computed per resume; sections beyond the row's own come back in each
+    row's full_analysis.
+    """
+    sections = request_sections(fields, "standard")
+    resumes, failed = await extract_uploads(resume_files)
+
+    ranked_top, cascade_stats = [], None
+    if resumes and cascade:
+        ranked_top, cascade_stats = await run_in_threadpool(
+            rank_engine.rank_cascade, job_description, resumes, top_k, shortlist, early_stop,
+            CASCADE_CHUNK_SIZE, sections
+        )
+    elif resumes:
+        ranked_top, _ = await run_in_threadpool(rank_engine.rank, job_description, resumes, top_k, sections)
+
+    response = {
+        "job_description": job_description[:400] + "..." if len(job_description) > 400 else job_description,
+        "total_resumes": len(resumes),
+        "top_k": top_k,
+        "ranked_resumes": [response_row(r, sections) for r in ranked_top],
+        "failed_files": failed
+    }
+    if cascade_stats is not None:
+        response["cascade"] = cascade_stats
+    return FastJSONResponse(response)
+
+
+
+@app.post("/rank_resumes/stream")
+async def rank_resumes_stream(
     job_description: str = Form(...),
     resume_files: List[UploadFile] = File(...),
     top_k: int = Form(10)
 ):
-    resumes = []
+    """
+    NDJSON stream: a "candidate" event per resume as soon as it is scored,
+    "failed" events for unreadable PDFs, then one ranked "summary" event.
+    """
+    uploads = [(file.filename, await pdf_pool.spool(file)) for file in resume_files]
+
+    async def events():
+        job = await run_in_threadpool(rank_engine.engine.job_profile, job_description)
+        top = TopK(top_k)
+        failed = []
+        processed = 0
+
+        pending = {asyncio.ensure_future(pdf_pool.extract_named(name, data)) for name, data in uploads}
+        try:
+            while pending:
+                # score whatever finished parsing since the last round as one batch
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                batch = []
+                for task in done:
+                    name, text, error = task.result()
+                    if error is None:
+                        batch.append({"name": name, "text": text})
+                    else:
+                        failed.append({"name": name, "error": error})
+                        yield json.dumps({"event": "failed", "name": name, "error": error}) + "\n"
+
+                if batch:
+                    for result in await run_in_threadpool(rank_engine.score, job, batch):
+                        processed += 1
+                        row = compact_result(result)
+                        top.push(row)
+                        yield json.dumps(candidate_event(row, processed, len(uploads))) + "\n"
+
+            yield json.dumps(summary_event(top, processed, failed)) + "\n"
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # temp files of spooled uploads are removed once the stream is done
+    cleanup = BackgroundTask(lambda: [pdf.close() for _, pdf in uploads])
+    return StreamingResponse(events(), media_type="application/x-ndjson", background=cleanup)
 
-    for file in resume_files:
-        pdf_bytes = await file.read()
-        resume_text = extract_text_from_pdf(pdf_bytes)
 
-        resumes.append({
-            "name": file.filename,
-            "text": resume_text
-        })
+ 
+@app.post("/match_matrix", response_model=MatchMatrixResponse, response_class=FastJSONResponse)
+async def match_matrix_endpoint(request: MatchMatrixRequest):
+    """
+    Every job against every resume (JSON texts, e.g. 500 x 2,000): each
+    document is embedded once and the pairs are scored in memory-bounded
+    blocks. Returns the best `top_k_per_job` resumes per job and the best
+    `top_k_per_resume` jobs per resume (0 skips that direction).
+    """
+    result = await run_in_threadpool(
+        match_matrix.match,
+        [d.model_dump() for d in request.jobs],
+        [d.model_dump() for d in request.resumes],
+        request.top_k_per_job,
+        request.top_k_per_resume
+    )
+    return FastJSONResponse(result)
+
+
+ 
+@app.post("/index/resumes", response_model=IndexResponse)
+async def index_resumes(resume_files: List[UploadFile] = File(...)):
+    resumes, failed = await extract_uploads(resume_files)
+
+    stats = await run_in_threadpool(corpus.add, resumes)
+    return {**stats, "failed_files": failed}
 
-    ranked_top, _ = rank_engine.rank(job_description, resumes, top_k=top_k)
+
+@app.post("/search", response_model=SearchResponse)
+async def search(
+    job_description: str = Form(...),
+    top_k: int = Form(10),
+    shortlist: int = Form(100)
+):
+    ranked = await run_in_threadpool(corpus.search, job_description, top_k, shortlist)
 
     return {
         "job_description": job_description[:400] + "..." if len(job_description) > 400 else job_description,
-        "total_resumes": len(resumes),
+        "total_indexed": len(corpus),
+        "shortlist_size": min(len(corpus), max(top_k, shortlist)),
         "top_k": top_k,
-        "ranked_resumes": ranked_top
+        "ranked_resumes": ranked
     }
+
+
+ 
+@app.post("/jobs", response_model=JobSubmitted)
+async def submit_job(
+    job_description: str = Form(...),
+    resume_files: List[UploadFile] = File(...)
+):
+    """
+    Queue a batch ranking job of any size. PDFs are stored as-is and parsed
+    by the job workers; poll GET /jobs/{job_id} for progress.
+    """
+    resumes = []
+    for file in resume_files:
+        pdf_bytes = await file.read(pdf_pool.max_bytes + 1)
+        if len(pdf_bytes) > pdf_pool.max_bytes:
+            resumes.append({"name": file.filename, "error": f"PDF is larger than {pdf_pool.max_bytes // (1024 * 1024)} MB"})
+        else:
+            resumes.append({"name": file.filename, "pdf": pdf_bytes})
+
+    job_id = await run_in_threadpool(job_store.submit, job_description, resumes)
+    job_runner.notify()
+    return {"job_id": job_id, "status": "queued", "total": len(resumes)}
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str):
+    status = job_store.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+
+@app.get("/jobs/{job_id}/results", response_model=JobResults)
+async def job_results(job_id: str, offset: int = 0, limit: int = 50):
+    status = job_store.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    limit = max(1, min(limit, 500))
+    return {
+        "job_id": job_id,
+        "status": status["status"],
+        "offset": offset,
+        "limit": limit,
+        "total_scored": job_store.count_results(job_id),
+        "ranked_resumes": job_store.results(job_id, offset=offset, limit=limit),
+        "failed_files": job_store.failures(job_id) if offset == 0 else []
+    }
+
+
+@app.delete("/jobs/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    if job_store.status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job_store.cancel(job_id)
+    return job_store.status(job_id)
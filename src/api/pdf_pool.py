@@ -0,0 +1,261 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from fastapi import UploadFile
+
+from ..config import (
+    PDF_BACKEND,
+    PDF_MAX_BYTES,
+    PDF_MAX_CHARS,
+    PDF_MAX_PAGES,
+    PDF_MAX_SECONDS,
+    PDF_PARALLEL_PAGES,
+    PDF_SPOOL_BYTES,
+    PDF_TEXT_CACHE_SIZE,
+    PDF_TIMEOUT_SECONDS,
+    PDF_WORKERS,
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_DISK,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_TTL_SECONDS
+)
+from ..utils.hashing import bytes_hash, bytes_hasher
+from ..utils.metrics import PDF_FILES, PDF_PAGES, PDF_TRUNCATED, STAGE_SECONDS
+from ..utils.pdf import PdfExtractionError, PdfSource, PdfText, extract_pdf_text, resolve_backend
+from ..utils.result_cache import ResultCache
+
+SPOOL_READ_BYTES = 1024 * 1024
+
+
+class SpooledPdf:
+    """
+    One uploaded PDF, hashed while it was read: held in memory when small,
+    else in a temp file that the pool workers parse from disk. `size` stops
+    counting just past the pool's size limit. close() removes the temp file.
+    """
+
+    def __init__(self, data: Optional[bytes], path: Optional[Path], size: int, digest: str):
+        self.data = data
+        self.path = path
+        self.size = size
+        self.digest = digest
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpooledPdf":
+        return cls(data, None, len(data), bytes_hash(data))
+
+    @property
+    def source(self) -> PdfSource:
+        return self.path if self.path is not None else self.data
+
+    def close(self):
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+class PdfExtractionPool:
+    """
+    Runs PDF text extraction in a bounded process pool so parsing never blocks
+    the event loop. Every file gets a size limit, page / character / time
+    limits (text past them is dropped) and a hard timeout; a corrupt,
+    oversized or hung PDF fails only that file. Extracted text is cached by a
+    hash of the PDF bytes, so a re-uploaded file skips parsing.
+    """
+
+    def __init__(
+        self,
+        workers: int = PDF_WORKERS,
+        max_bytes: int = PDF_MAX_BYTES,
+        max_pages: int = PDF_MAX_PAGES,
+        timeout: float = PDF_TIMEOUT_SECONDS,
+        cache: bool = RESULT_CACHE_ENABLED,
+        max_chars: int = PDF_MAX_CHARS,
+        max_seconds: float = PDF_MAX_SECONDS,
+        spool_bytes: int = PDF_SPOOL_BYTES,
+        parallel_pages: int = PDF_PARALLEL_PAGES,
+        backend: str = PDF_BACKEND
+    ):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self.spool_bytes = spool_bytes
+        self.parallel_pages = parallel_pages
+        self.backend = resolve_backend(backend)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # the limits and backend are part of the version: other settings must not reuse this text
+        self.text_cache = ResultCache(
+            "pdf_text",
+            PDF_TEXT_CACHE_SIZE,
+            RESULT_CACHE_TTL_SECONDS,
+            version=f"{self.backend}:max_pages={max_pages}:max_chars={max_chars}",
+            disk_dir=RESULT_CACHE_DIR if RESULT_CACHE_DISK else None
+        ) if cache else None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a parent that holds model weights and server threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        """
+        Replace a pool whose worker is stuck past its timeout. Futures can't be
+        cancelled once running, so the old workers are terminated.
+        """
+        if self._executor is not executor:
+            return
+        self._executor = None
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for p in processes:
+            p.terminate()
+
+    async def spool(self, file: UploadFile) -> SpooledPdf:
+        """
+        Read an upload in 1 MB pieces, hashing as it goes. Past `spool_bytes`
+        the rest goes to a temp file; past `max_bytes` reading stops (the
+        extraction then fails with a size error).
+        """
+        hasher, buffer, tmp, size = bytes_hasher(), bytearray(), None, 0
+        try:
+            while size <= self.max_bytes:
+                piece = await file.read(SPOOL_READ_BYTES)
+                if not piece:
+                    break
+                size += len(piece)
+                hasher.update(piece)
+                if tmp is None and size > self.spool_bytes:
+                    tmp = tempfile.NamedTemporaryFile(prefix="jobint-upload-", suffix=".pdf", delete=False)
+                    tmp.write(buffer)
+                    buffer = None
+                if tmp is not None:
+                    tmp.write(piece)
+                else:
+                    buffer += piece
+        except BaseException:
+            if tmp is not None:
+                tmp.close()
+                os.unlink(tmp.name)
+            raise
+        if tmp is None:
+            return SpooledPdf(bytes(buffer), None, size, hasher.hexdigest())
+        tmp.close()
+        return SpooledPdf(None, Path(tmp.name), size, hasher.hexdigest())
+
+    async def extract(self, pdf: Union[bytes, SpooledPdf], retry: bool = True) -> str:
+        return (await self.extract_cached(pdf, retry))[0]
+
+    async def extract_cached(self, pdf: Union[bytes, SpooledPdf], retry: bool = True) -> Tuple[str, Optional[str]]:
+        """(text, "memory" | "disk" when served from the text cache, else None)."""
+        if isinstance(pdf, bytes):
+            pdf = SpooledPdf.from_bytes(pdf)
+        key = None
+        if self.text_cache is not None and pdf.size <= self.max_bytes:
+            key = self.text_cache.key(pdf.digest)
+            text, source = self.text_cache.get(key)
+            if text is not None:
+                return text, source
+
+        start = time.perf_counter()
+        try:
+            result = await self._extract(pdf, retry)
+        except PdfExtractionError:
+            PDF_FILES.inc(result="error")
+            raise
+        PDF_FILES.inc(result="ok")
+        PDF_PAGES.inc(result.pages)
+        if result.truncated_by:
+            PDF_TRUNCATED.inc(limit=result.truncated_by)
+        STAGE_SECONDS.observe(result.seconds, stage="pdf.parse")
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage="pdf.file")
+        # text cut short by the clock depends on load, so it is not cached
+        if key is not None and result.truncated_by != "seconds":
+            self.text_cache.put(key, result.text)
+        return result.text, None
+
+    async def _extract(self, pdf: SpooledPdf, retry: bool) -> PdfText:
+        if pdf.size > self.max_bytes:
+            raise PdfExtractionError(f"PDF is larger than {self.max_bytes // (1024 * 1024)} MB")
+
+        executor = self._pool()
+        try:
+            return await asyncio.wait_for(self._parse(executor, pdf), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._recycle(executor)
+            raise PdfExtractionError(f"PDF extraction timed out after {self.timeout:g}s")
+        except BrokenProcessPool:
+            # another file's timeout recycled the pool under us; try once more
+            self._recycle(executor)
+            if retry:
+                return await self._extract(pdf, retry=False)
+            raise PdfExtractionError("PDF extraction worker crashed")
+        except PdfExtractionError:
+            raise
+        except Exception as e:
+            raise PdfExtractionError(f"Could not parse PDF: {e}") from e
+
+    async def _parse(self, executor: ProcessPoolExecutor, pdf: SpooledPdf) -> PdfText:
+        loop = asyncio.get_running_loop()
+
+        def run(start: int, pages: Optional[int]):
+            return loop.run_in_executor(
+                executor, extract_pdf_text, pdf.source, pages, self.max_chars, self.max_seconds, start, self.backend
+            )
+
+        block = self.parallel_pages
+        # only documents on disk are split: each block's worker opens the file itself
+        if block <= 0 or pdf.path is None or self.workers < 2:
+            return await run(0, self.max_pages)
+
+        first = await run(0, block if self.max_pages is None else min(block, self.max_pages))
+        end = first.total_pages if self.max_pages is None else min(first.total_pages, self.max_pages)
+        if end <= first.pages or first.truncated_by in ("chars", "seconds"):
+            return first
+
+        # the first block gave the page count; the rest run in parallel
+        starts = list(range(first.pages, end, block))
+        blocks = [first] + list(await asyncio.gather(*(run(s, min(block, end - s)) for s in starts)))
+        text = "\n".join(b.text for b in blocks if b.text)
+        truncated_by = "pages" if end < first.total_pages else None
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text, truncated_by = text[:self.max_chars], "chars"
+        for b in blocks:
+            if b.truncated_by == "seconds":
+                truncated_by = "seconds"
+        return PdfText(
+            text, sum(b.pages for b in blocks), first.total_pages, truncated_by, first.backend, sum(b.seconds for b in blocks)
+        )
+
+    async def extract_many(self, files: List[Tuple[str, Union[bytes, SpooledPdf]]]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Extract every (name, PDF) concurrently. Returns (name, text, error)
+        per file in input order; exactly one of text / error is set.
+        """
+        return list(await asyncio.gather(*(self.extract_named(name, data) for name, data in files)))
+
+    async def extract_named(self, name: str, pdf: Union[bytes, SpooledPdf]) -> Tuple[str, Optional[str], Optional[str]]:
+        try:
+            return name, await self.extract(pdf), None
+        except PdfExtractionError as e:
+            return name, None, str(e)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,27 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ..utils.serialization import json_default
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for large payloads (e.g. 1,000 ranked candidates). Endpoints
+    return it directly with content they built themselves, which skips the
+    pydantic validation + jsonable_encoder pass of `response_model`; encoding
+    uses orjson when installed, else compact stdlib json.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=json_default
+        ).encode("utf-8")
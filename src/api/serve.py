@@ -0,0 +1,118 @@
+"""
+Pre-fork launcher for multi-worker deployments.
+
+    python -m src.api.serve --workers 4 --port 8000
+
+The master process imports the app and loads every model once
+(`registry.preload`), then forks the workers. The workers share the model
+weights copy-on-write instead of each loading a private copy, so every extra
+worker only costs its own heap (caches, request buffers). `--no-preload`
+forks first and lets every worker load its own models, like
+`uvicorn --workers N`, for comparison (see benchmarks/worker_memory.py).
+
+Linux/macOS only (needs os.fork).
+"""
+import argparse
+import os
+import signal
+import socket
+import time
+import traceback
+from typing import Dict
+
+import uvicorn
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(index: int, sock: socket.socket, args):
+    from . import main as api
+
+    # one background job dispatcher per deployment, not one per worker
+    api.run_job_runner = api.run_job_runner and index == 0
+
+    config = uvicorn.Config(api.app, log_level=args.log_level, timeout_keep_alive=args.keep_alive)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with N workers sharing preloaded models.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--no-preload", dest="preload", action="store_false", help="Load models in each worker after fork")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--keep-alive", type=int, default=5, help="Keep-alive timeout in seconds")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        raise SystemExit("❌ The pre-fork launcher needs os.fork; use `uvicorn src.api.main:app --workers N` instead")
+
+    sock = _bind(args.host, args.port)
+
+    if args.preload:
+        from . import main as api  # noqa: F401  (builds the shared engine)
+        from ..scoring import registry
+
+        seconds = registry.preload()
+        print(f"✅ Models preloaded in master (pid {os.getpid()}) in {seconds:.1f}s")
+
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                _run_worker(index, sock, args)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for i in range(args.workers):
+        spawn(i)
+    print(f"✅ Serving on {args.host}:{args.port} with {args.workers} workers: {sorted(children)}")
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            # re-fork from the master, so the replacement shares the preloaded models too
+            print(f"⚠️ Worker {index} (pid {pid}) exited, restarting")
+            time.sleep(1)
+            spawn(index)
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
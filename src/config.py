@@ -1,8 +1,62 @@
  
+import os
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+SBERT_MODEL_NAME = os.getenv("JOBINT_SBERT_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Encoder backend (src/scoring/encoders.py): torch (fp32 reference), int8
+# (dynamically quantized, CPU), onnx (exported graph + onnxruntime) or stub.
+SBERT_BACKEND = os.getenv("JOBINT_SBERT_BACKEND", "torch").strip().lower()
+SBERT_ONNX_DIR = Path(os.getenv("JOBINT_SBERT_ONNX_DIR", str(PROJECT_ROOT / "src" / "models" / "sbert_onnx")))
+
+# Long documents (src/scoring/chunking.py): split into chunks of at most
+# SBERT_CHUNK_TOKENS tokens (0 = the encoder's max_seq_length) and pool them,
+# instead of truncating at max_seq_length. Chunks beyond SBERT_MAX_CHUNKS are
+# dropped. Pending chunks are encoded in length-sorted batches of at most
+# SBERT_TOKEN_BUDGET padded tokens (0 = fixed batches of batch_size).
+# Off by default: the bundled fit model was trained on truncated embeddings;
+# turn it on only after rebuilding the features and retraining.
+SBERT_CHUNKING = _env_flag("JOBINT_SBERT_CHUNKING", False)
+SBERT_CHUNK_TOKENS = int(os.getenv("JOBINT_SBERT_CHUNK_TOKENS", "0"))
+SBERT_MAX_CHUNKS = int(os.getenv("JOBINT_SBERT_MAX_CHUNKS", "32"))
+SBERT_TOKEN_BUDGET = int(os.getenv("JOBINT_SBERT_TOKEN_BUDGET", "8192"))
+
+# Load models in the background at API startup (/ready turns 200 when done).
+# Off: models load lazily on the first request that needs them.
+MODEL_WARMUP = _env_flag("JOBINT_MODEL_WARMUP", True)
+
+# Stage timings / counters for /metrics and the Server-Timing header (src/utils/metrics.py).
+METRICS_ENABLED = _env_flag("JOBINT_METRICS", True)
+
+# Embedding cache: in-memory LRU (per process) + optional on-disk tier shared
+# by every process that uses the same model (API workers, build_features.py).
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("JOBINT_EMBEDDING_CACHE_MAX_MB", "256"))
+EMBEDDING_CACHE_FLOAT16 = _env_flag("JOBINT_EMBEDDING_CACHE_FLOAT16", False)
+EMBEDDING_CACHE_DISK = _env_flag("JOBINT_EMBEDDING_CACHE_DISK", True)
+EMBEDDING_CACHE_DIR = Path(os.getenv("JOBINT_EMBEDDING_CACHE_DIR", str(PROJECT_ROOT / "data" / "cache" / "embeddings")))
+
+# Content-addressed result caches (src/utils/result_cache.py): extracted PDF
+# text keyed by a hash of the PDF bytes, /analyze reports keyed by the JD,
+# resume text, sections and a model/config version. In-memory LRU + TTL per
+# process, plus an optional SQLite tier under RESULT_CACHE_DIR shared by all
+# workers. The disk tier stores resume text and reports, so it is off by default.
+RESULT_CACHE_ENABLED = _env_flag("JOBINT_RESULT_CACHE", True)
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("JOBINT_RESULT_CACHE_TTL_SECONDS", "86400"))
+PDF_TEXT_CACHE_SIZE = int(os.getenv("JOBINT_PDF_TEXT_CACHE_SIZE", "1024"))
+ANALYSIS_CACHE_SIZE = int(os.getenv("JOBINT_ANALYSIS_CACHE_SIZE", "2048"))
+RESULT_CACHE_DISK = _env_flag("JOBINT_RESULT_CACHE_DISK", False)
+RESULT_CACHE_DIR = Path(os.getenv("JOBINT_RESULT_CACHE_DIR", str(PROJECT_ROOT / "data" / "cache" / "results")))
+
 DEFAULT_SKILLS = [
     "python", "java", "javascript", "typescript", "react", "next.js", "node.js",
     "express", "fastapi", "django", "flask", "sql", "postgresql", "mongodb",
@@ -11,3 +65,36 @@ DEFAULT_SKILLS = [
     "scikit-learn", "huggingface", "transformers", "pandas", "numpy",
     "git", "ci/cd", "linux"
 ]
+
+# On-disk resume corpus searched by /search (see src/index/corpus_index.py).
+CORPUS_INDEX_DIR = Path(os.getenv("JOBINT_CORPUS_INDEX_DIR", str(PROJECT_ROOT / "data" / "index")))
+
+# PDF extraction limits for the API (see src/api/pdf_pool.py).
+PDF_WORKERS = int(os.getenv("JOBINT_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_MAX_BYTES = int(float(os.getenv("JOBINT_PDF_MAX_MB", "10")) * 1024 * 1024)
+PDF_MAX_PAGES = int(os.getenv("JOBINT_PDF_MAX_PAGES", "30"))
+PDF_TIMEOUT_SECONDS = float(os.getenv("JOBINT_PDF_TIMEOUT_SECONDS", "15"))
+# Backend (src/utils/pdf.py): auto (PyMuPDF when installed, else pypdf), pymupdf or pypdf.
+PDF_BACKEND = os.getenv("JOBINT_PDF_BACKEND", "auto").strip().lower()
+# Extraction stops (keeping the text so far) past this many characters or seconds;
+# PDF_TIMEOUT_SECONDS stays the hard limit that kills a stuck worker.
+PDF_MAX_CHARS = int(os.getenv("JOBINT_PDF_MAX_CHARS", "200000"))
+PDF_MAX_SECONDS = float(os.getenv("JOBINT_PDF_MAX_SECONDS", "10"))
+# Uploads larger than this are spooled to a temp file and parsed from disk.
+PDF_SPOOL_BYTES = int(float(os.getenv("JOBINT_PDF_SPOOL_MB", "1")) * 1024 * 1024)
+# > 0: spooled documents longer than this many pages are split into blocks of
+# it, parsed in parallel by the pool workers. 0 = one worker per document.
+PDF_PARALLEL_PAGES = int(os.getenv("JOBINT_PDF_PARALLEL_PAGES", "0"))
+
+# M x N matching (src/scoring/match_matrix.py): (JD, resume) pairs scored per
+# block. Peak memory grows with this (~200 bytes per pair), not with M x N.
+MATCH_BLOCK_PAIRS = int(os.getenv("JOBINT_MATCH_BLOCK_PAIRS", "262144"))
+
+# Background batch ranking jobs (see src/jobs/).
+JOBS_DB_PATH = Path(os.getenv("JOBINT_JOBS_DB", str(PROJECT_ROOT / "data" / "jobs" / "jobs.sqlite")))
+JOBS_WORKERS = int(os.getenv("JOBINT_JOB_WORKERS", "2"))
+JOBS_CHUNK_SIZE = int(os.getenv("JOBINT_JOB_CHUNK_SIZE", "64"))
+# Hard limit per chunk, like PDF_TIMEOUT_SECONDS for the API: a chunk still
+# running after this (e.g. a PDF hung inside the parser) gets its workers
+# killed, and its resumes are retried one per chunk so only the stuck one fails.
+JOBS_CHUNK_TIMEOUT_SECONDS = float(os.getenv("JOBINT_JOB_CHUNK_TIMEOUT_SECONDS", "300"))
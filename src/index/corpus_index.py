@@ -0,0 +1,276 @@
+import json
+import os
+import sqlite3
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from scipy import sparse
+
+from ..config import CORPUS_INDEX_DIR
+from ..scoring.job_profile import JobProfile
+from ..scoring.score_engine import DETAIL_LEVELS, ScoreEngine
+from ..utils.hashing import text_hash
+from ..utils.skills import extract_skills
+from ..utils.sqlite import ForkSafeSqlite
+from ..utils.text import parse_document
+
+# Hashed term space for the stored TF-IDF counts. IDF is derived from the
+# indexed corpus at query time, so resumes can be appended without refitting.
+TFIDF_N_FEATURES = 2 ** 18
+
+# Blocks of embedding rows scored per matmul, keeps the search working set small.
+SEARCH_BLOCK_ROWS = 50_000
+
+
+class CorpusIndex:
+    """
+    On-disk resume corpus, ingested once and searched many times.
+
+    Layout under `root_dir`:
+      docs.sqlite      id, name, text hash, cleaned text, skills, token set
+      embeddings.f32   SBERT embeddings of the cleaned text, row == doc id
+      tfidf/*.npz      hashed term counts, one segment per ingest batch
+
+    Search scores the whole corpus with one embedding matmul plus one sparse
+    TF-IDF product, takes a shortlist, and re-scores it with the full
+    ScoreEngine (FitClassifier + explanations).
+    """
+
+    def __init__(self, engine: ScoreEngine, root_dir: Path = CORPUS_INDEX_DIR):
+        self.engine = engine
+        self.root = Path(root_dir)
+        self.embeddings_path = self.root / "embeddings.f32"
+
+        self._lock = threading.RLock()
+        # opened on first ingest / search, so an unused index creates no files
+        self._db = ForkSafeSqlite(self.root / "docs.sqlite", on_connect=self._create)
+
+        self._loaded_n = -1
+        self._embeddings: Optional[np.ndarray] = None
+        self._tfidf: Optional[sparse.csr_matrix] = None
+        self._skills: Optional[sparse.csr_matrix] = None
+
+    def _create(self, conn: sqlite3.Connection):
+        (self.root / "tfidf").mkdir(parents=True, exist_ok=True)
+        self.embeddings_path.touch(exist_ok=True)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                text_hash TEXT NOT NULL UNIQUE,
+                clean_text TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                tokens TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.commit()
+
+    # ---------- ingest ----------
+
+    @cached_property
+    def hasher(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        return HashingVectorizer(
+            n_features=TFIDF_N_FEATURES,
+            stop_words="english",
+            alternate_sign=False,
+            norm=None
+        )
+
+    def __len__(self) -> int:
+        return self._db.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def _dim(self) -> Optional[int]:
+        row = self._db.conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def add(self, resumes: List[Dict[str, str]]) -> Dict[str, int]:
+        """
+        Ingest [{"name": ..., "text": ...}]. Resumes whose cleaned text is already
+        indexed are skipped. Returns counts of added / duplicate documents.
+        """
+        with self._lock:
+            seen = set()
+            new = []
+            for r in resumes:
+                doc = parse_document(r["text"])
+                if not doc.clean:
+                    continue
+                h = text_hash(doc.clean)
+                if h in seen:
+                    continue
+                seen.add(h)
+                new.append((r["name"], h, doc))
+
+            if new:
+                hashes = [h for _, h, _ in new]
+                existing = set()
+                for start in range(0, len(hashes), 500):
+                    chunk = hashes[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    existing.update(h for (h,) in self._db.conn.execute(
+                        f"SELECT text_hash FROM docs WHERE text_hash IN ({placeholders})", chunk
+                    ))
+                new = [item for item in new if item[1] not in existing]
+
+            duplicates = len(resumes) - len(new)
+            if not new:
+                return {"added": 0, "duplicates": duplicates, "total": len(self)}
+
+            texts = [doc.clean for _, _, doc in new]
+            embeddings = self.engine.sbert.embed_many(texts).astype(np.float32)
+            counts = self.hasher.transform(texts).astype(np.float32).tocsr()
+
+            self._db.conn.execute("BEGIN IMMEDIATE")
+            try:
+                first_id = self._db.conn.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM docs").fetchone()[0]
+                dim = self._dim()
+                if dim is None:
+                    dim = embeddings.shape[1]
+                    self._db.conn.execute("INSERT INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+
+                rows = []
+                for i, (name, h, doc) in enumerate(new):
+                    skills = extract_skills(doc, self.engine.skill_matcher)
+                    rows.append((first_id + i, name, h, doc.clean, json.dumps(skills), json.dumps(sorted(doc.token_set))))
+
+                fd = os.open(self.embeddings_path, os.O_WRONLY)
+                try:
+                    os.pwrite(fd, embeddings.tobytes(), first_id * dim * 4)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                sparse.save_npz(self.root / "tfidf" / f"{first_id:012d}.npz", counts)
+
+                self._db.conn.executemany(
+                    "INSERT INTO docs (id, name, text_hash, clean_text, skills, tokens) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._db.conn.commit()
+            except Exception:
+                self._db.conn.rollback()
+                raise
+
+            return {"added": len(new), "duplicates": duplicates, "total": len(self)}
+
+    # ---------- search ----------
+
+    def _load(self):
+        n = len(self)
+        if n == self._loaded_n:
+            return
+
+        dim = self._dim()
+        if n == 0 or dim is None:
+            self._embeddings = np.zeros((0, 0), dtype=np.float32)
+            self._tfidf = sparse.csr_matrix((0, TFIDF_N_FEATURES), dtype=np.float32)
+            self._skills = sparse.csr_matrix((0, 0), dtype=np.float32)
+            self._loaded_n = n
+            return
+
+        self._embeddings = np.memmap(self.embeddings_path, dtype=np.float32, mode="r", shape=(n, dim))
+
+        segments = sorted((self.root / "tfidf").glob("*.npz"))
+        counts = sparse.vstack([sparse.load_npz(p) for p in segments]).tocsr()[:n]
+
+        # corpus IDF (same smoothing as sklearn's TfidfVectorizer), rows L2-normalized
+        df = np.bincount(counts.indices, minlength=TFIDF_N_FEATURES)
+        self._idf = (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+        weighted = counts.multiply(self._idf).tocsr()
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        self._tfidf = sparse.diags(1.0 / norms).dot(weighted).tocsr().astype(np.float32)
+
+        # doc x skill incidence matrix for vectorized overlap
+        skill_index = {s: i for i, s in enumerate(self.engine.skill_matcher.skills)}
+        rows, cols = [], []
+        for doc_id, skills_json in self._db.conn.execute("SELECT id, skills FROM docs ORDER BY id"):
+            for s in json.loads(skills_json):
+                if s in skill_index:
+                    rows.append(doc_id)
+                    cols.append(skill_index[s])
+        self._skills = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(n, len(skill_index))
+        )
+        self._skill_index = skill_index
+        self._loaded_n = n
+
+    def _retrieval_scores(self, job: JobProfile) -> np.ndarray:
+        n = self._embeddings.shape[0]
+
+        job_vec = job.embedding
+        sbert = np.empty(n, dtype=np.float32)
+        for start in range(0, n, SEARCH_BLOCK_ROWS):
+            sbert[start:start + SEARCH_BLOCK_ROWS] = self._embeddings[start:start + SEARCH_BLOCK_ROWS] @ job_vec
+
+        q = self.hasher.transform([job.clean]).astype(np.float32).multiply(self._idf).tocsr()
+        q_norm = np.sqrt(q.multiply(q).sum())
+        if q_norm > 0:
+            tfidf = (self._tfidf @ q.T).toarray().ravel() / q_norm
+        else:
+            tfidf = np.zeros(n, dtype=np.float32)
+
+        overlap = np.zeros(n, dtype=np.float32)
+        jd_cols = [self._skill_index[s] for s in job.skills if s in self._skill_index]
+        if jd_cols:
+            overlap = np.asarray(self._skills[:, jd_cols].sum(axis=1)).ravel() / len(job.skills)
+
+        # same weights as the hybrid match score
+        return tfidf * 0.35 + np.clip(sbert, 0, 1) * 0.45 + overlap * 0.20
+
+    def search(self, job_description: Union[str, JobProfile], top_k: int = 10, shortlist: int = 100) -> List[Dict[str, Any]]:
+        """
+        Top-k resumes in the corpus for a JD. The whole corpus is scored with
+        cheap vector ops; only the best `shortlist` go through the full ScoreEngine.
+        """
+        with self._lock:
+            self._load()
+            n = self._embeddings.shape[0]
+            if n == 0:
+                return []
+
+            job = self.engine.job_profile(job_description)
+            scores = self._retrieval_scores(job)
+
+            shortlist = min(n, max(top_k, shortlist))
+            if shortlist < n:
+                ids = np.argpartition(-scores, shortlist - 1)[:shortlist]
+            else:
+                ids = np.arange(n)
+            ids = ids[np.argsort(-scores[ids])]
+
+            placeholders = ",".join("?" * len(ids))
+            docs = {
+                doc_id: (name, cleaned)
+                for doc_id, name, cleaned in self._db.conn.execute(
+                    f"SELECT id, name, clean_text FROM docs WHERE id IN ({placeholders})", [int(i) for i in ids]
+                )
+            }
+            embeddings = np.asarray(self._embeddings[ids])
+
+        analyses = self.engine.analyze_batch(
+            job, [docs[int(i)][1] for i in ids], resume_embeddings=embeddings, sections=DETAIL_LEVELS["standard"]
+        )
+
+        results = []
+        for doc_id, analysis in zip(ids, analyses):
+            results.append({
+                "resume_id": int(doc_id),
+                "resume_name": docs[int(doc_id)][0],
+                "retrieval_score": round(float(scores[doc_id]), 4),
+                "match_score": analysis["match_score"],
+                "fit_prediction_score": analysis["fit_prediction_score"],
+                "missing_skills": analysis["skills"]["missing"],
+                "missing_keywords": analysis.get("keyword_optimization", {}).get("missing_keywords", []),
+                "similarity": analysis["similarity"],
+                "full_analysis": analysis
+            })
+
+        # ✅ Sort by fit score first, then match score (same as RankEngine)
+        results.sort(key=lambda x: (x["fit_prediction_score"], x["match_score"]), reverse=True)
+        return results[:top_k]
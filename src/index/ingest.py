@@ -0,0 +1,41 @@
+import argparse
+from pathlib import Path
+
+from tqdm import tqdm
+
+from src.config import CORPUS_INDEX_DIR, PDF_MAX_PAGES
+from src.index.corpus_index import CorpusIndex
+from src.scoring.registry import get_score_engine
+from src.utils.pdf import extract_text_from_pdf
+
+BATCH_SIZE = 256
+
+
+def main(pdf_dir: Path, index_dir: Path = CORPUS_INDEX_DIR):
+    pdfs = sorted(pdf_dir.rglob("*.pdf"))
+    print(f"✅ Found PDFs: {len(pdfs)}")
+
+    index = CorpusIndex(get_score_engine(), index_dir)
+    added = duplicates = failed = 0
+
+    for start in tqdm(range(0, len(pdfs), BATCH_SIZE)):
+        batch = []
+        for path in pdfs[start:start + BATCH_SIZE]:
+            try:
+                batch.append({"name": path.name, "text": extract_text_from_pdf(path, max_pages=PDF_MAX_PAGES)})
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ Skipping {path}: {e}")
+        stats = index.add(batch)
+        added += stats["added"]
+        duplicates += stats["duplicates"]
+
+    print(f"✅ Added: {added} | duplicates: {duplicates} | failed: {failed} | index size: {len(index)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a folder of resume PDFs into the search index.")
+    parser.add_argument("pdf_dir", type=Path)
+    parser.add_argument("--index-dir", type=Path, default=CORPUS_INDEX_DIR)
+    args = parser.parse_args()
+    main(args.pdf_dir, args.index_dir)
@@ -0,0 +1,240 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from ..config import (
+    JOBS_CHUNK_SIZE,
+    JOBS_CHUNK_TIMEOUT_SECONDS,
+    JOBS_DB_PATH,
+    JOBS_WORKERS,
+    PDF_MAX_CHARS,
+    PDF_MAX_PAGES,
+    PDF_MAX_SECONDS
+)
+from .store import JobStore
+
+MAX_CHUNK_ATTEMPTS = 3
+
+# ---------- worker process side ----------
+
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(db_path: str):
+    # Loaded once per worker process and reused for every chunk it processes.
+    from ..scoring.rank_engine import RankEngine
+    _WORKER["rank_engine"] = RankEngine()
+    _WORKER["store"] = JobStore(Path(db_path))
+
+
+def _process_chunk(job_id: str, indices) -> int:
+    from ..scoring.rank_engine import compact_result
+    from ..utils.pdf import PdfExtractionError, extract_pdf_text
+
+    store: JobStore = _WORKER["store"]
+    rank_engine = _WORKER["rank_engine"]
+
+    jd, rows = store.load_chunk(job_id, list(indices))
+    resumes, failures = [], []
+    for idx, name, text, pdf in rows:
+        if text is None and pdf is not None:
+            try:
+                text = extract_pdf_text(pdf, PDF_MAX_PAGES, PDF_MAX_CHARS, PDF_MAX_SECONDS).text
+            except PdfExtractionError as e:
+                failures.append({"idx": idx, "error": str(e)})
+                continue
+        resumes.append({"idx": idx, "name": name, "text": text or ""})
+
+    # score() builds the JobProfile once per JD and caches it across chunks
+    scored = rank_engine.score(jd, resumes)
+    results = [{"idx": r["idx"], "row": compact_result(s)} for r, s in zip(resumes, scored)]
+
+    store.save_chunk(job_id, results, failures)
+    return len(rows)
+
+
+# ---------- dispatcher (API / CLI process side) ----------
+
+class JobRunner:
+    """
+    Feeds pending resumes of active jobs, in chunks, to a pool of worker
+    processes. All state lives in the JobStore: on start, jobs left queued or
+    running by a previous process simply continue from their pending resumes.
+
+    A chunk running longer than `chunk_timeout` can't be cancelled, so its
+    workers are killed and the pool replaced (like PdfExtractionPool does for
+    the API). Its resumes are then retried one per chunk; a single resume that
+    times out again is marked failed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = JOBS_DB_PATH,
+        workers: int = JOBS_WORKERS,
+        chunk_size: int = JOBS_CHUNK_SIZE,
+        poll_interval: float = 0.5,
+        chunk_timeout: float = JOBS_CHUNK_TIMEOUT_SECONDS
+    ):
+        self.db_path = Path(db_path)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.chunk_timeout = chunk_timeout
+        self.poll_interval = poll_interval
+        self.store = JobStore(self.db_path)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # future -> (job_id, indices)
+        self._in_flight: Dict[Future, Tuple[str, Tuple[int, ...]]] = {}
+        self._attempts: Dict[Tuple[str, Tuple[int, ...]], int] = {}
+        # future -> when the dispatcher first saw it running
+        self._started: Dict[Future, float] = {}
+        # (job_id, idx) of resumes from a timed-out chunk, dispatched one at a time
+        self._isolated: Set[Tuple[str, int]] = set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._executor = self._new_executor()
+        self._thread = threading.Thread(target=self._run, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def notify(self):
+        """Wake the dispatcher right away (e.g. after a submit)."""
+        self._wake.set()
+
+    def _in_flight_indices(self, job_id: str) -> Set[int]:
+        out = set()
+        for jid, indices in self._in_flight.values():
+            if jid == job_id:
+                out.update(indices)
+        return out
+
+    def _dispatch(self):
+        # keep every worker busy plus one queued chunk each, never more
+        capacity = self.workers * 2 - len(self._in_flight)
+        for job_id in self.store.active_jobs():
+            if capacity <= 0:
+                return
+            busy = self._in_flight_indices(job_id)
+            while capacity > 0:
+                indices = self.store.pending_indices(job_id, self.chunk_size, exclude=busy)
+                if not indices:
+                    break
+                isolated = [i for i in indices if (job_id, i) in self._isolated]
+                if isolated:
+                    indices = isolated[:1]
+                if not busy:
+                    self.store.set_status(job_id, "running")
+                future = self._executor.submit(_process_chunk, job_id, tuple(indices))
+                future.add_done_callback(lambda _: self._wake.set())
+                self._in_flight[future] = (job_id, tuple(indices))
+                busy.update(indices)
+                capacity -= 1
+
+            if not busy and not self.store.pending_indices(job_id, 1):
+                self.store.set_status(job_id, "completed")
+
+    def _check_timeouts(self) -> bool:
+        """Kill the pool under a chunk that ran past `chunk_timeout`; True if it did."""
+        now = time.monotonic()
+        for future, (job_id, indices) in self._in_flight.items():
+            if future.done() or not future.running():
+                continue
+            if now - self._started.setdefault(future, now) <= self.chunk_timeout:
+                continue
+
+            if len(indices) == 1:
+                self._isolated.discard((job_id, indices[0]))
+                error = f"Processing timed out after {self.chunk_timeout:g}s"
+                self.store.save_chunk(job_id, [], [{"idx": indices[0], "error": error}])
+            else:
+                self._isolated.update((job_id, i) for i in indices)
+            # the other chunks in flight were not at fault: they go back to pending without an attempt
+            self._restart_pool(kill=True)
+            return True
+        return False
+
+    def _reap(self):
+        if self._check_timeouts():
+            return
+        for future in [f for f in self._in_flight if f.done()]:
+            key = self._in_flight.pop(future)
+            self._started.pop(future, None)
+            job_id, indices = key
+            error = future.exception()
+            if error is None:
+                self._attempts.pop(key, None)
+                self._isolated.difference_update((job_id, i) for i in indices)
+                continue
+
+            # the chunk stays pending and is retried, up to MAX_CHUNK_ATTEMPTS
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+            if self._attempts[key] >= MAX_CHUNK_ATTEMPTS:
+                self._attempts.pop(key)
+                self._isolated.difference_update((job_id, i) for i in indices)
+                self.store.save_chunk(job_id, [], [{"idx": i, "error": f"Scoring failed: {error}"} for i in indices])
+            if isinstance(error, BrokenProcessPool):
+                self._restart_pool()
+                return
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: workers load their own models instead of inheriting the parent's state
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(self.db_path),)
+        )
+
+    def _restart_pool(self, kill: bool = False):
+        old = self._executor
+        self._in_flight.clear()
+        self._started.clear()
+        self._executor = self._new_executor()
+        processes = list((getattr(old, "_processes", None) or {}).values()) if kill else []
+        old.shutdown(wait=False, cancel_futures=True)
+        # running futures can't be cancelled: terminate the workers stuck in them
+        for p in processes:
+            p.terminate()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._reap()
+                self._dispatch()
+            except Exception as e:
+                print(f"⚠️ Job dispatcher error: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+def main():
+    runner = JobRunner()
+    runner.start()
+    print(f"✅ Job runner started: {runner.workers} workers, db={runner.db_path}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        runner.stop()
+
+
+if __name__ == "__main__":
+    main()
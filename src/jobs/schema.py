@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from ..scoring.rank_schema import FailedFile, RankedResume
+
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    total: int
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    processed: int
+    failed: int
+    progress: float
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+
+
+class JobResults(BaseModel):
+    job_id: str
+    status: str
+    offset: int
+    limit: int
+    total_scored: int
+    ranked_resumes: List[RankedResume]
+    failed_files: List[FailedFile] = []
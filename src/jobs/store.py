@@ -0,0 +1,187 @@
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import JOBS_DB_PATH
+from ..utils.sqlite import ForkSafeSqlite
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobStore:
+    """
+    SQLite-backed durable store for batch ranking jobs. Resumes, their
+    processing state and results all live in the database, so a restarted
+    server picks up unfinished jobs where they stopped. Safe to open from
+    several processes (WAL mode); open one JobStore per process.
+    """
+
+    def __init__(self, db_path: Path = JOBS_DB_PATH):
+        self.db_path = Path(db_path)
+        # autocommit: transactions are explicit BEGINs
+        self._db = ForkSafeSqlite(self.db_path, isolation_level=None)
+        self._db.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                job_description TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS job_resumes (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                text TEXT,
+                pdf BLOB,
+                status TEXT NOT NULL DEFAULT 'pending',
+                error TEXT,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS job_resumes_pending ON job_resumes (job_id, status, idx);
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                fit_prediction_score INTEGER NOT NULL,
+                match_score INTEGER NOT NULL,
+                row TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS job_results_rank
+                ON job_results (job_id, fit_prediction_score DESC, match_score DESC, idx);
+        """)
+
+    # ---------- submission / control ----------
+
+    def submit(self, job_description: str, resumes: List[Dict[str, Any]]) -> str:
+        """
+        resumes: [{"name": ..., "text": ...}] or [{"name": ..., "pdf": bytes}].
+        PDFs are parsed by the workers, not at submission time. Entries with an
+        "error" (e.g. rejected upload) are recorded as failed right away.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db.conn:
+            self._db.conn.execute("BEGIN")
+            self._db.conn.execute(
+                "INSERT INTO jobs (id, job_description, status, total, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, job_description, len(resumes), now, now)
+            )
+            self._db.conn.executemany(
+                "INSERT INTO job_resumes (job_id, idx, name, text, pdf, status, error) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, i, r["name"], r.get("text"), r.get("pdf"), "failed" if r.get("error") else "pending", r.get("error"))
+                    for i, r in enumerate(resumes)
+                ]
+            )
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        with self._db.conn:
+            cur = self._db.conn.execute(
+                f"UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ? AND status IN {ACTIVE_STATUSES}",
+                (time.time(), job_id)
+            )
+        return cur.rowcount > 0
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None):
+        with self._db.conn:
+            self._db.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def active_jobs(self) -> List[str]:
+        return [r[0] for r in self._db.conn.execute(
+            f"SELECT id FROM jobs WHERE status IN {ACTIVE_STATUSES} ORDER BY created_at"
+        )]
+
+    def pending_indices(self, job_id: str, limit: int, exclude: Optional[set] = None) -> List[int]:
+        exclude = exclude or set()
+        out = []
+        for (idx,) in self._db.conn.execute(
+            "SELECT idx FROM job_resumes WHERE job_id = ? AND status = 'pending' ORDER BY idx", (job_id,)
+        ):
+            if idx not in exclude:
+                out.append(idx)
+                if len(out) >= limit:
+                    break
+        return out
+
+    # ---------- worker side ----------
+
+    def load_chunk(self, job_id: str, indices: List[int]):
+        placeholders = ",".join("?" * len(indices))
+        jd = self._db.conn.execute("SELECT job_description FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+        rows = self._db.conn.execute(
+            f"SELECT idx, name, text, pdf FROM job_resumes WHERE job_id = ? AND idx IN ({placeholders}) AND status = 'pending'",
+            [job_id, *indices]
+        ).fetchall()
+        return jd, rows
+
+    def save_chunk(self, job_id: str, results: List[Dict[str, Any]], failures: List[Dict[str, Any]]):
+        """Results and state flips are one transaction, so a crash never half-records a chunk."""
+        with self._db.conn:
+            self._db.conn.execute("BEGIN")
+            self._db.conn.executemany(
+                "INSERT OR REPLACE INTO job_results (job_id, idx, fit_prediction_score, match_score, row) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, r["idx"], r["row"]["fit_prediction_score"], r["row"]["match_score"], json.dumps(r["row"])) for r in results]
+            )
+            self._db.conn.executemany(
+                "UPDATE job_resumes SET status = 'done', text = NULL, pdf = NULL WHERE job_id = ? AND idx = ?",
+                [(job_id, r["idx"]) for r in results]
+            )
+            self._db.conn.executemany(
+                # a resume another attempt already finished keeps its result
+                "UPDATE job_resumes SET status = 'failed', error = ?, text = NULL, pdf = NULL "
+                "WHERE job_id = ? AND idx = ? AND status = 'pending'",
+                [(f["error"], job_id, f["idx"]) for f in failures]
+            )
+            self._db.conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+
+    # ---------- reads ----------
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._db.conn.execute(
+            "SELECT id, status, total, created_at, updated_at, error FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if job is None:
+            return None
+        counts = dict(self._db.conn.execute(
+            "SELECT status, COUNT(*) FROM job_resumes WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        done, failed = counts.get("done", 0), counts.get("failed", 0)
+        return {
+            "job_id": job[0],
+            "status": job[1],
+            "total": job[2],
+            "processed": done,
+            "failed": failed,
+            "progress": round((done + failed) / job[2], 4) if job[2] else 1.0,
+            "created_at": job[3],
+            "updated_at": job[4],
+            "error": job[5]
+        }
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self._db.conn.execute(
+            "SELECT row FROM job_results WHERE job_id = ? "
+            "ORDER BY fit_prediction_score DESC, match_score DESC, idx LIMIT ? OFFSET ?",
+            (job_id, limit, offset)
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def count_results(self, job_id: str) -> int:
+        return self._db.conn.execute("SELECT COUNT(*) FROM job_results WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+    def failures(self, job_id: str) -> List[Dict[str, str]]:
+        return [{"name": n, "error": e} for n, e in self._db.conn.execute(
+            "SELECT name, error FROM job_resumes WHERE job_id = ? AND status = 'failed' ORDER BY idx", (job_id,)
+        )]
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..config import ANALYSIS_CACHE_SIZE, RESULT_CACHE_DIR, RESULT_CACHE_DISK, RESULT_CACHE_TTL_SECONDS
+from ..utils.hashing import bytes_hash, text_hash
+from ..utils.keywords import KEYWORD_IDF_PATH
+from ..utils.result_cache import ResultCache
+from .fit_classifier import LINEAR_MODEL_PATH, MODEL_PATH
+from .tfidf_matcher import VECTORIZER_PATH
+
+# bump when the report layout changes without a model or config change
+REPORT_VERSION = 1
+
+
+def _file_fingerprint(path: Path) -> str:
+    return bytes_hash(path.read_bytes()) if path.exists() else "-"
+
+
+def analysis_version(engine) -> str:
+    """
+    Everything a report depends on besides its inputs: the model artifacts on
+    disk (fit model, exported coefficients, TF-IDF vectorizer, keyword IDF
+    table), the skill list and the embedding namespace (model, backend, chunking).
+    """
+    parts = [f"report{REPORT_VERSION}", engine.sbert.cache.model_name, text_hash("\n".join(engine.skills_list))]
+    parts += [_file_fingerprint(p) for p in (MODEL_PATH, LINEAR_MODEL_PATH, VECTORIZER_PATH, KEYWORD_IDF_PATH)]
+    return text_hash("|".join(parts))
+
+
+class AnalysisCache:
+    """
+    ScoreEngine.analyze behind a ResultCache keyed by (JD hash, resume text
+    hash, sections). The version is fingerprinted when the cache is built, next
+    to the models it describes, so retraining or editing the skill list
+    starts a fresh namespace on the next restart.
+    """
+
+    def __init__(
+        self,
+        engine,
+        max_entries: int = ANALYSIS_CACHE_SIZE,
+        ttl: float = RESULT_CACHE_TTL_SECONDS,
+        disk_dir: Optional[Path] = RESULT_CACHE_DIR if RESULT_CACHE_DISK else None
+    ):
+        self.engine = engine
+        self.cache = ResultCache("analysis", max_entries, ttl, analysis_version(engine), disk_dir)
+
+    def analyze(self, job_description: str, resume_text: str, sections: Iterable[str]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """(report, "memory" | "disk" | None when it was computed now)."""
+        sections = frozenset(sections)
+        key = self.cache.key(text_hash(job_description), text_hash(resume_text), ",".join(sorted(sections)))
+        result, source = self.cache.get(key)
+        if result is None:
+            result = self.engine.analyze(job_description, resume_text, sections)
+            self.cache.put(key, result)
+        return result, source
@@ -0,0 +1,105 @@
+import re
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.hashing import text_hash
+
+# sentence ends ("... python. led ...") and bullets (" - built ...") in clean_text output
+_UNIT_SPLIT = re.compile(r"(?<=\.)\s+|\s+(?=-\s)")
+# once a chunk holds min_tokens, about 1 in BOUNDARY_MODULUS sentences ends it
+BOUNDARY_MODULUS = 3
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+
+def _is_boundary(unit: str) -> bool:
+    return int(text_hash(unit)[:8], 16) % BOUNDARY_MODULUS == 0
+
+
+def _split_long(unit: str, count_tokens: TokenCounter, max_tokens: int) -> List[Tuple[str, int]]:
+    """Word windows of at most max_tokens for a single over-long sentence."""
+    words = unit.split()
+    pieces, current, current_tokens = [], [], 0
+    for word, n in zip(words, count_tokens(words)):
+        n = min(n, max_tokens)
+        if current and current_tokens + n > max_tokens:
+            pieces.append((" ".join(current), current_tokens))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += n
+    if current:
+        pieces.append((" ".join(current), current_tokens))
+    return pieces
+
+
+def chunk_text(
+    text: str,
+    count_tokens: TokenCounter,
+    max_tokens: int,
+    min_tokens: int = None,
+    max_chunks: int = None
+) -> List[Tuple[str, int]]:
+    """
+    Split a document into (chunk, token count) pieces of at most `max_tokens`.
+    A document that fits comes back whole. Otherwise sentences are packed in
+    order; a chunk ends when the next sentence would not fit or, once it
+    holds `min_tokens`, after a sentence whose content hash marks a boundary.
+    Boundaries depend only on nearby content, so editing one part of a resume
+    changes the chunks around the edit and the others keep their cache keys.
+    """
+    if not text:
+        return []
+    total = count_tokens([text])[0]
+    if total <= max_tokens:
+        return [(text, total)]
+    if min_tokens is None:
+        min_tokens = max_tokens // 4
+
+    units = [u for u in _UNIT_SPLIT.split(text) if u]
+    pieces: List[Tuple[str, int]] = []
+    for unit, n in zip(units, count_tokens(units)):
+        if n > max_tokens:
+            pieces.extend(_split_long(unit, count_tokens, max_tokens))
+        else:
+            pieces.append((unit, n))
+
+    # the tokenizers split on whitespace first, so joined sentences count as the sum
+    chunks, current, current_tokens = [], [], 0
+    for unit, n in pieces:
+        if current and current_tokens + n > max_tokens:
+            chunks.append((" ".join(current), current_tokens))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += n
+        if current_tokens >= min_tokens and _is_boundary(unit):
+            chunks.append((" ".join(current), current_tokens))
+            current, current_tokens = [], 0
+    if current:
+        chunks.append((" ".join(current), current_tokens))
+    return chunks[:max_chunks] if max_chunks else chunks
+
+
+def pool_chunks(vecs: np.ndarray, weights: Sequence[float]) -> np.ndarray:
+    """Token-weighted mean of chunk embeddings, L2-normalized."""
+    w = np.asarray(weights, dtype=np.float32)
+    pooled = (np.asarray(vecs, dtype=np.float32) * w[:, None]).sum(axis=0) / max(float(w.sum()), 1e-9)
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm > 0 else pooled).astype(np.float32)
+
+
+def length_batches(lengths: Sequence[int], token_budget: int, max_batch: int = None) -> List[List[int]]:
+    """
+    Group item indices into batches sorted by length, so each batch pads to a
+    similar length, with batch size x longest item kept within `token_budget`.
+    """
+    batches, current = [], []
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        # ascending order: item i is the longest of the batch so far
+        if current and ((len(current) + 1) * lengths[i] > token_budget or (max_batch and len(current) >= max_batch)):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
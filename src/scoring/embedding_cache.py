@@ -0,0 +1,218 @@
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import (
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_DISK,
+    EMBEDDING_CACHE_FLOAT16,
+    EMBEDDING_CACHE_MAX_MB,
+)
+from ..utils.hashing import text_hash
+from ..utils.lru import LRUCache
+from ..utils.metrics import EMBEDDING_CACHE
+from ..utils.sqlite import ForkSafeSqlite
+
+
+def _model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "__", model_name).strip("_")
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk embedding store shared by every process using the same
+    model: a flat vector file read through np.memmap, plus a SQLite index of
+    content hash -> row. Writers serialize on SQLite's write lock, and a row
+    only becomes visible after its vector bytes are written, so concurrent
+    API workers and offline jobs can share one store safely.
+    """
+
+    def __init__(self, root_dir: Path, model_name: str, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.dir = Path(root_dir) / _model_slug(model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.dir / f"vectors.{self.dtype.name}.bin"
+        self.index_path = self.dir / f"index.{self.dtype.name}.sqlite"
+        self.vectors_path.touch(exist_ok=True)
+
+        self.dim: Optional[int] = None
+        self._mmap: Optional[np.memmap] = None
+        # a reopened connection means a new process: map the vector file afresh
+        self._db = ForkSafeSqlite(self.index_path, on_connect=self._reset_mmap)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            conn = self._db.conn
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+            conn.commit()
+            self._load_dim(conn)
+
+    def _reset_mmap(self, conn: sqlite3.Connection):
+        self._mmap = None
+
+    def _load_dim(self, conn: sqlite3.Connection):
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if row is not None:
+            self.dim = int(row[0])
+
+    def _rows_view(self, needed_row: int) -> Optional[np.memmap]:
+        if self.dim is None:
+            return None
+        if self._mmap is None or self._mmap.shape[0] <= needed_row:
+            row_bytes = self.dim * self.dtype.itemsize
+            n_rows = os.path.getsize(self.vectors_path) // row_bytes
+            if n_rows <= needed_row:
+                return None
+            self._mmap = np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(n_rows, self.dim))
+        return self._mmap
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            conn = self._db.conn
+            if self.dim is None:
+                self._load_dim(conn)
+                if self.dim is None:
+                    return found
+
+            rows = []
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(conn.execute(f"SELECT key, row FROM vectors WHERE key IN ({placeholders})", chunk).fetchall())
+
+            if rows:
+                view = self._rows_view(max(r for _, r in rows))
+                if view is not None:
+                    for key, row in rows:
+                        found[key] = np.array(view[row])
+        return found
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        with self._lock:
+            conn = self._db.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._load_dim(conn)
+                if self.dim is None:
+                    self.dim = int(len(next(iter(items.values()))))
+                    conn.execute("INSERT INTO meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+
+                row_bytes = self.dim * self.dtype.itemsize
+                keys = list(items)
+                existing = set()
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    existing.update(k for (k,) in conn.execute(f"SELECT key FROM vectors WHERE key IN ({placeholders})", chunk))
+
+                new_keys = [k for k in keys if k not in existing]
+                if new_keys:
+                    # size on disk is the source of truth for the next free row
+                    next_row = os.path.getsize(self.vectors_path) // row_bytes
+                    block = np.vstack([np.asarray(items[k], dtype=self.dtype).reshape(1, self.dim) for k in new_keys])
+                    fd = os.open(self.vectors_path, os.O_WRONLY)
+                    try:
+                        os.pwrite(fd, block.tobytes(), next_row * row_bytes)
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                    conn.executemany(
+                        "INSERT INTO vectors (key, row) VALUES (?, ?)",
+                        [(k, next_row + i) for i, k in enumerate(new_keys)]
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by a hash of the text content.
+
+    Memory tier: LRU bounded by `max_mb`, optionally storing float16.
+    Disk tier: a DiskEmbeddingStore per model name, shared across processes
+    and restarts. Vectors are always returned as float32.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_mb: float = EMBEDDING_CACHE_MAX_MB,
+        float16: bool = EMBEDDING_CACHE_FLOAT16,
+        disk_dir: Optional[Path] = EMBEDDING_CACHE_DIR if EMBEDDING_CACHE_DISK else None
+    ):
+        self.model_name = model_name
+        self.dtype = np.float16 if float16 else np.float32
+        self.memory = LRUCache(int(max_mb * 1024 * 1024))
+        self.disk = DiskEmbeddingStore(disk_dir, model_name, dtype=self.dtype) if disk_dir else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> str:
+        return text_hash(text)
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Returns {text: vector} for every text found in memory or on disk.
+        Disk hits are promoted into the memory tier.
+        """
+        found: Dict[str, np.ndarray] = {}
+        disk_lookup: Dict[str, str] = {}
+
+        for text in texts:
+            if text in found:
+                continue
+            key = self.key(text)
+            vec = self.memory.get(key)
+            if vec is not None:
+                found[text] = vec.astype(np.float32)
+            else:
+                disk_lookup[key] = text
+
+        if disk_lookup and self.disk is not None:
+            for key, vec in self.disk.get_many(list(disk_lookup)).items():
+                self.memory.put(key, vec.astype(self.dtype))
+                found[disk_lookup[key]] = vec.astype(np.float32)
+
+        misses = len(set(texts)) - len(found)
+        self.hits += len(found)
+        self.misses += misses
+        EMBEDDING_CACHE.inc(len(found), result="hit")
+        EMBEDDING_CACHE.inc(misses, result="miss")
+        return found
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        return self.get_many([text]).get(text)
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        keyed = {self.key(text): np.asarray(vec).astype(self.dtype) for text, vec in vectors.items()}
+        for key, vec in keyed.items():
+            self.memory.put(key, vec)
+        if self.disk is not None:
+            self.disk.put_many(keyed)
+
+    def put(self, text: str, vec: np.ndarray):
+        self.put_many({text: vec})
+
+    def __contains__(self, text: str) -> bool:
+        return self.get(text) is not None
@@ -0,0 +1,257 @@
+"""
+Sentence encoder backends behind SBERTMatcher and build_features.py.
+
+  torch  fp32 SentenceTransformer (reference)
+  int8   the same model with its Linear layers dynamically quantized to int8 (CPU)
+  onnx   exported transformer graph run by onnxruntime, mean pooling in NumPy
+  stub   deterministic hashed bag of words: no torch, no download (tests, benchmarks)
+
+Every backend returns L2-normalized float32 embeddings. Pick one with
+JOBINT_SBERT_BACKEND; the ONNX graph is exported once with
+    python -m src.scoring.encoders export-onnx [--model NAME] [--out DIR]
+"""
+import argparse
+import hashlib
+import inspect
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from ..config import SBERT_BACKEND, SBERT_MODEL_NAME, SBERT_ONNX_DIR
+
+ENCODER_BACKENDS = ("torch", "int8", "onnx", "stub")
+ONNX_META = "encoder.json"
+
+
+def encoder_id(model_name: str, backend: str) -> str:
+    """
+    Embedding cache namespace. Backends other than the reference one produce
+    slightly different vectors, so they never share cached embeddings with it.
+    """
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def _normalize(vecs: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    return (vecs / np.where(norms > 0, norms, 1.0)).astype(np.float32)
+
+
+class Encoder(ABC):
+    """texts -> (N, dim) L2-normalized float32 embeddings."""
+
+    backend = ""
+    # longest input in tokens, special tokens included; longer inputs are truncated
+    max_seq_length = 256
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        ...
+
+    def token_counts(self, texts: List[str]) -> List[int]:
+        """Tokens per text, without special tokens."""
+        return [len(str(t).split()) for t in texts]
+
+
+class SentenceTransformerEncoder(Encoder):
+    backend = "torch"
+
+    def __init__(self, model_name: str = SBERT_MODEL_NAME, device=None):
+        from sentence_transformers import SentenceTransformer
+
+        # `module` is the torch model; the registry makes it read-only before fork
+        self.module = SentenceTransformer(model_name, device=device)
+        self.max_seq_length = int(self.module.max_seq_length)
+
+    def token_counts(self, texts: List[str]) -> List[int]:
+        return [len(ids) for ids in self.module.tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]]
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        vecs = self.module.encode(
+            list(texts),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return np.asarray(vecs, dtype=np.float32)
+
+
+class QuantizedEncoder(SentenceTransformerEncoder):
+    """
+    Dynamic int8 quantization: Linear weights stored as int8, activations
+    quantized on the fly. CPU only; no calibration data or export step.
+    """
+
+    backend = "int8"
+
+    def __init__(self, model_name: str = SBERT_MODEL_NAME):
+        super().__init__(model_name, device="cpu")
+        import torch
+        from torch.ao.quantization import quantize_dynamic
+
+        self.module = quantize_dynamic(self.module.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxEncoder(Encoder):
+    """Transformer graph exported by `export_onnx`, run with onnxruntime."""
+
+    backend = "onnx"
+
+    def __init__(self, model_dir: Path = SBERT_ONNX_DIR, model_name: str = SBERT_MODEL_NAME):
+        model_dir = Path(model_dir)
+        meta_path = model_dir / ONNX_META
+        if not meta_path.exists():
+            raise FileNotFoundError(
+                f"❌ ONNX encoder not found at {model_dir}. Export it first: python -m src.scoring.encoders export-onnx"
+            )
+        meta = json.loads(meta_path.read_text())
+        if meta["model_name"] != model_name:
+            raise ValueError(f"❌ {model_dir} holds {meta['model_name']}, not {model_name}")
+
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_dir / "model.onnx"), options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.max_seq_length = int(meta["max_seq_length"])
+
+    def token_counts(self, texts: List[str]) -> List[int]:
+        return [len(ids) for ids in self.tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]]
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        texts = list(texts)
+        out = []
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            hidden = self.session.run(None, {n: batch[n].astype(np.int64) for n in self.input_names})[0]
+            # mean pooling over real tokens, as in the SentenceTransformer Pooling module
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            out.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        if not out:
+            return np.zeros((0, 0), dtype=np.float32)
+        return _normalize(np.vstack(out))
+
+
+class StubEncoder(Encoder):
+    """
+    Deterministic stand-in for a real model: hashed bag of words,
+    L2-normalized. No torch, no download.
+    """
+
+    backend = "stub"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        v = np.zeros(self.dim, dtype=np.float32)
+        for w in str(text).split():
+            v[int.from_bytes(hashlib.blake2b(w.encode(), digest_size=4).digest(), "little") % self.dim] += 1.0
+        return v
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        if not len(texts):
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.stack([self._vector(t) for t in texts]))
+
+
+def load_encoder(model_name: str = SBERT_MODEL_NAME, backend: str = SBERT_BACKEND) -> Encoder:
+    if backend == "torch":
+        return SentenceTransformerEncoder(model_name)
+    if backend == "int8":
+        return QuantizedEncoder(model_name)
+    if backend == "onnx":
+        return OnnxEncoder(SBERT_ONNX_DIR, model_name)
+    if backend == "stub":
+        return StubEncoder()
+    raise ValueError(f"Unknown encoder backend '{backend}'. Use one of: {', '.join(ENCODER_BACKENDS)}")
+
+
+def _is_mean_pooling(pooling) -> bool:
+    config = pooling.get_config_dict()
+    if "pooling_mode" in config:  # newer sentence-transformers
+        return config["pooling_mode"] == "mean"
+    modes = [k for k, v in config.items() if k.startswith("pooling_mode_") and v is True]
+    return modes == ["pooling_mode_mean_tokens"]
+
+
+def export_onnx(model_name: str = SBERT_MODEL_NAME, out_dir: Path = SBERT_ONNX_DIR, opset: int = 14) -> Path:
+    """
+    Export the transformer of a mean-pooling SentenceTransformer to ONNX
+    (dynamic batch and sequence axes) together with its tokenizer.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer, pooling = st[0], st[1]
+    if not _is_mean_pooling(pooling):
+        raise ValueError(f"❌ {model_name} does not use mean pooling; only mean-pooling models can be exported")
+
+    hf_model = transformer.auto_model.eval()
+    if hasattr(hf_model, "set_attn_implementation"):
+        # plain attention ops export to a leaner graph than the SDPA path
+        hf_model.set_attn_implementation("eager")
+    tokenizer = transformer.tokenizer
+    dummy = tokenizer(["export the encoder graph"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+
+    class _Hidden(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)))[0]
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    axes = {n: {0: "batch", 1: "sequence"} for n in input_names + ["last_hidden_state"]}
+    # torch >= 2.5 defaults to the dynamo exporter; keep the TorchScript one
+    legacy = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(
+            _Hidden(hf_model),
+            tuple(dummy[n] for n in input_names),
+            str(out_dir / "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=axes,
+            opset_version=opset,
+            **legacy
+        )
+    tokenizer.save_pretrained(str(out_dir))
+    (out_dir / ONNX_META).write_text(json.dumps({
+        "model_name": model_name,
+        "max_seq_length": int(st.max_seq_length),
+        "pooling": "mean"
+    }, indent=2))
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SBERT encoder backends.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export-onnx", help="Export the SBERT transformer for the onnx backend")
+    export.add_argument("--model", default=SBERT_MODEL_NAME)
+    export.add_argument("--out", type=Path, default=SBERT_ONNX_DIR)
+    args = parser.parse_args()
+
+    if args.command == "export-onnx":
+        out = export_onnx(args.model, args.out)
+        print(f"✅ ONNX encoder saved to: {out}")
+
+
+if __name__ == "__main__":
+    main()
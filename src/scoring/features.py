@@ -5,3 +5,5 @@ FEATURE_NAMES = [
     "missing_count",
     "keyword_matches"
 ]
+
+SBERT_COLUMN = FEATURE_NAMES.index("sbert_sim")
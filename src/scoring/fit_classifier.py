@@ -1,30 +1,79 @@
-import joblib
-import pandas as pd
+import numpy as np
 from pathlib import Path
-import shap
 
 from .features import FEATURE_NAMES
+from .linear_model import LinearFitModel
 
 MODEL_PATH = Path(__file__).resolve().parents[1] / "models" / "fit_model.joblib"
+LINEAR_MODEL_PATH = MODEL_PATH.with_suffix(".linear.json")
 
 class FitClassifier:
     def __init__(self):
+        self.model = None
+        self.explainer = None
+
+        # ✅ Fast path: exported coefficients -> NumPy probabilities + exact linear SHAP values
+        if LINEAR_MODEL_PATH.exists():
+            self.linear = LinearFitModel.load(LINEAR_MODEL_PATH)
+            return
+
         if not MODEL_PATH.exists():
             raise FileNotFoundError(f"❌ Model not found at {MODEL_PATH}. Train it first.")
+        import joblib
         self.model = joblib.load(MODEL_PATH)
 
-        # SHAP explainer (LogReg is linear -> fast)
-        self.explainer = shap.LinearExplainer(self.model, pd.DataFrame([[0]*len(FEATURE_NAMES)], columns=FEATURE_NAMES))
+        # LogReg without an exported artifact: same fast path, zeros background
+        self.linear = LinearFitModel.from_sklearn(self.model) if hasattr(self.model, "coef_") else None
+        if self.linear is None:
+            # Non-linear model: SHAP (optional dependency) for explanations
+            import pandas as pd
+            import shap
+            self.explainer = shap.Explainer(self.model.predict_proba, pd.DataFrame([[0]*len(FEATURE_NAMES)], columns=FEATURE_NAMES))
+
+    def predict_proba(self, feature_values: list) -> float:
+        return float(self.predict_proba_batch([feature_values])[0])
+
+    def predict_proba_batch(self, feature_matrix) -> np.ndarray:
+        if self.linear is not None:
+            return self.linear.predict_proba(feature_matrix)
+        import pandas as pd
+        X = pd.DataFrame(np.asarray(feature_matrix, dtype=np.float64).reshape(-1, len(FEATURE_NAMES)), columns=FEATURE_NAMES)
+        return self.model.predict_proba(X)[:, 1]
+
+    def max_proba_batch(self, feature_matrix, column: int, low: float, high: float):
+        """
+        Upper bound on the probability of each row while feature `column` is
+        still unknown, or None when the model gives no such bound (non-linear).
+        """
+        if self.linear is None:
+            return None
+        return self.linear.max_proba(feature_matrix, column, low, high)
 
     def predict_with_explain(self, feature_values: list):
-        X = pd.DataFrame([feature_values], columns=FEATURE_NAMES)
+        probas, explanations = self.predict_with_explain_batch([feature_values])
+        return float(probas[0]), explanations[0]
+
+    def predict_with_explain_batch(self, feature_matrix):
+        """
+        Score an (N, len(FEATURE_NAMES)) feature matrix in one pass.
+        Returns (probabilities, per-row SHAP dicts).
+        """
+        X = np.asarray(feature_matrix, dtype=np.float64).reshape(-1, len(FEATURE_NAMES))
 
-        proba = float(self.model.predict_proba(X)[0][1])
+        probas = self.predict_proba_batch(X)
 
-        shap_values = self.explainer.shap_values(X)[0]
-        shap_map = {FEATURE_NAMES[i]: float(shap_values[i]) for i in range(len(FEATURE_NAMES))}
+        if self.linear is not None:
+            shap_values = self.linear.contributions(X)
+        else:
+            import pandas as pd
+            shap_values = np.asarray(
+                self.explainer(pd.DataFrame(X, columns=FEATURE_NAMES)).values
+            )[..., -1].reshape(len(X), len(FEATURE_NAMES))
 
-        # Sort by strongest impact
-        shap_sorted = dict(sorted(shap_map.items(), key=lambda x: abs(x[1]), reverse=True))
+        explanations = []
+        for row in shap_values:
+            shap_map = {FEATURE_NAMES[i]: float(row[i]) for i in range(len(FEATURE_NAMES))}
+            # Sort by strongest impact
+            explanations.append(dict(sorted(shap_map.items(), key=lambda x: abs(x[1]), reverse=True)))
 
-        return proba, shap_sorted
+        return probas, explanations
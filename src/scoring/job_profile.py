@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import FrozenSet, List
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class JobProfile:
+    """
+    Everything ScoreEngine needs from a job description, computed once and
+    reused for every resume scored against it. Build with
+    `ScoreEngine.job_profile(jd)`, which also caches profiles by content hash.
+    """
+    key: str
+    text: str
+    clean: str
+    tokens: FrozenSet[str]
+    skills: List[str]
+    embedding: np.ndarray
+    top_keywords: List[str]
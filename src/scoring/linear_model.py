@@ -0,0 +1,144 @@
+import argparse
+import json
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from scipy.special import expit
+
+from .features import FEATURE_NAMES
+
+
+class LinearFitModel:
+    """
+    NumPy-only inference for the logistic-regression fit model.
+
+    probability   = sigmoid(X @ coef + intercept)
+    contributions = coef * (X - background)   (log-odds, what shap.LinearExplainer returns)
+
+    Exported from the trained sklearn model into a small JSON artifact, so
+    serving needs neither sklearn/pandas per call nor shap at all.
+    """
+
+    def __init__(self, coef, intercept: float, background, feature_names: Sequence[str] = FEATURE_NAMES):
+        self.feature_names = list(feature_names)
+        self.coef = np.asarray(coef, dtype=np.float64).reshape(-1)
+        self.intercept = float(intercept)
+        self.background = np.asarray(background, dtype=np.float64).reshape(-1)
+        if not (len(self.feature_names) == self.coef.shape[0] == self.background.shape[0]):
+            raise ValueError("coef / background / feature_names length mismatch")
+
+    @classmethod
+    def from_sklearn(cls, model, background=None, feature_names: Sequence[str] = FEATURE_NAMES) -> "LinearFitModel":
+        """Build from a fitted binary LogisticRegression. `background` defaults to zeros."""
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.shape[0] != 1:
+            raise ValueError("Only binary linear models are supported")
+        if background is None:
+            background = np.zeros(coef.shape[1])
+        return cls(coef[0], float(np.asarray(model.intercept_).reshape(-1)[0]), background, feature_names)
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearFitModel":
+        data = json.loads(Path(path).read_text())
+        return cls(data["coef"], data["intercept"], data["background"], data["feature_names"])
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "feature_names": self.feature_names,
+            "coef": self.coef.tolist(),
+            "intercept": self.intercept,
+            "background": self.background.tolist()
+        }, indent=2))
+
+    def _matrix(self, feature_matrix) -> np.ndarray:
+        return np.asarray(feature_matrix, dtype=np.float64).reshape(-1, self.coef.shape[0])
+
+    def predict_proba(self, feature_matrix) -> np.ndarray:
+        """Fit probability (positive class) per row."""
+        return expit(self._matrix(feature_matrix) @ self.coef + self.intercept)
+
+    def max_proba(self, feature_matrix, column: int, low: float, high: float) -> np.ndarray:
+        """
+        Highest probability each row can reach when feature `column` is only
+        known to lie in [low, high]; the model is monotone in every feature.
+        """
+        X = self._matrix(feature_matrix).copy()
+        X[:, column] = high if self.coef[column] >= 0 else low
+        return self.predict_proba(X)
+
+    def contributions(self, feature_matrix) -> np.ndarray:
+        """Per-feature log-odds contributions relative to the background, shape (N, F)."""
+        return (self._matrix(feature_matrix) - self.background) * self.coef
+
+
+def check_parity(model_path: Path, linear_path: Optional[Path] = None, n: int = 1000, seed: int = 0) -> dict:
+    """
+    Compare LinearFitModel against sklearn predict_proba and shap.LinearExplainer
+    on random feature rows. Returns the max absolute differences.
+    """
+    import joblib
+    import pandas as pd
+
+    model = joblib.load(model_path)
+    linear = LinearFitModel.load(linear_path) if linear_path and Path(linear_path).exists() else LinearFitModel.from_sklearn(model)
+
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(0, 1, n),          # tfidf_sim
+        rng.uniform(-0.2, 1, n),       # sbert_sim
+        rng.uniform(0, 1, n),          # overlap
+        rng.integers(0, 40, n),        # missing_count
+        rng.integers(0, 31, n)         # keyword_matches
+    ]).astype(np.float64)
+    df = pd.DataFrame(X, columns=linear.feature_names)
+
+    out = {"proba_max_abs_diff": float(np.max(np.abs(model.predict_proba(df)[:, 1] - linear.predict_proba(X))))}
+    try:
+        import shap
+    except ImportError:
+        out["shap_max_abs_diff"] = None
+        return out
+
+    explainer = shap.LinearExplainer(model, pd.DataFrame([linear.background], columns=linear.feature_names))
+    shap_values = np.asarray(explainer.shap_values(df)).reshape(n, -1)
+    out["shap_max_abs_diff"] = float(np.max(np.abs(shap_values - linear.contributions(X))))
+    return out
+
+
+def main():
+    from .fit_classifier import MODEL_PATH, LINEAR_MODEL_PATH
+
+    parser = argparse.ArgumentParser(description="Export / check the NumPy linear fit model.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    export = sub.add_parser("export", help="Write the JSON artifact from the joblib model")
+    export.add_argument("--features", type=Path, default=None, help="features.csv to take background means from (default: zeros)")
+
+    parity = sub.add_parser("check", help="Compare against sklearn and shap")
+    parity.add_argument("--n", type=int, default=1000)
+    parity.add_argument("--tol", type=float, default=1e-9)
+
+    args = parser.parse_args()
+
+    if args.cmd == "export":
+        import joblib
+        background = None
+        if args.features:
+            import pandas as pd
+            background = pd.read_csv(args.features, usecols=FEATURE_NAMES)[FEATURE_NAMES].mean().to_numpy()
+        LinearFitModel.from_sklearn(joblib.load(MODEL_PATH), background).save(LINEAR_MODEL_PATH)
+        print(f"✅ Linear model saved to: {LINEAR_MODEL_PATH}")
+        return
+
+    diffs = check_parity(MODEL_PATH, LINEAR_MODEL_PATH, n=args.n)
+    print("✅ Parity:", diffs)
+    worst = max(v for v in diffs.values() if v is not None)
+    if worst > args.tol:
+        raise SystemExit(f"❌ Parity check failed: {worst} > {args.tol}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+M x N matching: every JD against every resume, for "best resumes per job"
+and "best jobs per candidate" at job-board scale (e.g. 500 x 2,000).
+
+Each document is parsed and embedded once. The five classifier features are
+then computed for blocks of (JD, resume) pairs with matrix products (SBERT
+dot products, TF-IDF sparse products, skill and keyword overlap counts), the
+classifier scores each block, and only a running top-k per row / column is
+kept. Peak memory depends on the block size (`block_pairs`), not on M x N.
+"""
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ..config import MATCH_BLOCK_PAIRS
+from ..utils.metrics import timed
+from ..utils.text import ParsedDocument
+from . import registry
+from .features import FEATURE_NAMES
+from .score_engine import KEYWORD_MATCH_CAP, ScoreEngine, hybrid_score, match_score
+
+
+def block_shape(m: int, n: int, block_pairs: int) -> Tuple[int, int]:
+    """(JDs, resumes) per block, about `block_pairs` pairs, as square as M and N allow."""
+    rows = max(1, min(m, int(math.sqrt(block_pairs))))
+    cols = max(1, min(n, block_pairs // rows))
+    return rows, cols
+
+
+class _RunningTopK:
+    """
+    Best k columns per row, merged block by block: rank key, column index,
+    feature row and fit probability of each kept pair.
+    """
+
+    def __init__(self, rows: int, k: int):
+        self.k = k
+        self.keys = np.full((rows, k), -np.inf)
+        self.index = np.full((rows, k), -1, dtype=np.int64)
+        self.features = np.zeros((rows, k, len(FEATURE_NAMES)))
+        self.probs = np.zeros((rows, k))
+
+    def update(self, rows: slice, cols: np.ndarray, keys: np.ndarray, features: np.ndarray, probs: np.ndarray):
+        keys = np.concatenate([self.keys[rows], keys], axis=1)
+        index = np.concatenate([self.index[rows], np.broadcast_to(cols, probs.shape)], axis=1)
+        top = np.argpartition(-keys, self.k - 1, axis=1)[:, :self.k]
+        self.keys[rows] = np.take_along_axis(keys, top, axis=1)
+        self.index[rows] = np.take_along_axis(index, top, axis=1)
+        self.features[rows] = np.take_along_axis(
+            np.concatenate([self.features[rows], features], axis=1), top[..., None], axis=1
+        )
+        self.probs[rows] = np.take_along_axis(np.concatenate([self.probs[rows], probs], axis=1), top, axis=1)
+
+    def row(self, i: int) -> List[Tuple[int, np.ndarray, float]]:
+        """(column, features, fit probability) of row i, best first."""
+        order = np.argsort(-self.keys[i], kind="stable")
+        return [(int(self.index[i, j]), self.features[i, j], float(self.probs[i, j])) for j in order if self.index[i, j] >= 0]
+
+
+def _match_entry(name: str, index: int, feature_row: np.ndarray, fit_prob: float) -> Dict[str, Any]:
+    tfidf_sim, sbert_sim, overlap_percent, missing_count, keyword_matches = (float(v) for v in feature_row)
+    hybrid = hybrid_score(tfidf_sim, sbert_sim, overlap_percent)
+    return {
+        "name": name,
+        "index": index,
+        "match_score": int(match_score(hybrid)),
+        "fit_prediction_score": int(round(fit_prob * 100)),
+        "similarity": {
+            "tfidf": round(tfidf_sim, 4),
+            "sbert": round(sbert_sim, 4),
+            "hybrid": round(hybrid, 4)
+        },
+        "skill_overlap_percent": round(overlap_percent * 100, 2),
+        "missing_skills_count": int(missing_count),
+        "keyword_matches": int(keyword_matches)
+    }
+
+
+class MatchMatrix:
+    def __init__(self, engine: Optional[ScoreEngine] = None, block_pairs: int = MATCH_BLOCK_PAIRS):
+        # share the process-wide ScoreEngine (and its models / caches) by default
+        self.engine = engine or registry.get_score_engine()
+        self.block_pairs = block_pairs
+
+    def _skill_matrix(self, docs: List[ParsedDocument], vocab: Dict[str, int], counts: bool) -> np.ndarray:
+        out = np.zeros((len(docs), len(vocab)), dtype=np.float64)
+        for i, doc in enumerate(docs):
+            for skill in doc.skills:
+                col = vocab.get(skill.lower())
+                if col is not None:
+                    # JD side counts repeats, like skill_gap's matched list; resume side is a set
+                    out[i, col] = out[i, col] + 1 if counts else 1.0
+        return out
+
+    @staticmethod
+    def _token_matrix(docs: List[ParsedDocument], vocab: Dict[str, int]) -> sparse.csr_matrix:
+        indptr, indices = [0], []
+        for doc in docs:
+            indices.extend(sorted(vocab[t] for t in doc.token_set if t in vocab))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(docs), max(len(vocab), 1)))
+
+    def match(
+        self,
+        jobs: List[Dict[str, str]],
+        resumes: List[Dict[str, str]],
+        top_k_per_job: int = 10,
+        top_k_per_resume: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Score every {"name", "text"} job against every {"name", "text"} resume.
+        Returns the best `top_k_per_job` resumes of each job and the best
+        `top_k_per_resume` jobs of each resume (0 skips a direction), ranked
+        by fit score then match score, plus block statistics.
+        """
+        start = time.perf_counter()
+        engine = self.engine
+        m, n = len(jobs), len(resumes)
+        k_rows, k_cols = min(top_k_per_job, n), min(top_k_per_resume, m)
+
+        # ✅ Per-document work once: parsing, embeddings, TF-IDF rows, skill and token sets
+        job_docs = engine.parse_batch([j["text"] for j in jobs])
+        resume_docs = engine.parse_batch([r["text"] for r in resumes])
+        cleans = [d.clean for d in job_docs] + [d.clean for d in resume_docs]
+        with timed("match.sbert"):
+            embeddings = engine.sbert.embed_many(cleans) if cleans else np.zeros((0, 0), dtype=np.float32)
+        job_vecs, resume_vecs = embeddings[:m], embeddings[m:]
+        with timed("match.prepare"):
+            tfidf_rows = engine.tfidf.matrix_rows(cleans) if cleans else sparse.csr_matrix((0, 1))
+            job_tfidf, resume_tfidf = tfidf_rows[:m], tfidf_rows[m:]
+
+            skill_vocab: Dict[str, int] = {}
+            for doc in job_docs:
+                for skill in doc.skills:
+                    skill_vocab.setdefault(skill.lower(), len(skill_vocab))
+            job_skills = self._skill_matrix(job_docs, skill_vocab, counts=True)
+            resume_skills = self._skill_matrix(resume_docs, skill_vocab, counts=False)
+            job_skill_counts = np.array([len(d.skills) for d in job_docs], dtype=np.float64)
+
+            token_vocab: Dict[str, int] = {}
+            for doc in job_docs:
+                for token in doc.token_set:
+                    token_vocab.setdefault(token, len(token_vocab))
+            job_tokens = self._token_matrix(job_docs, token_vocab)
+            resume_tokens = self._token_matrix(resume_docs, token_vocab)
+
+        rows_top = _RunningTopK(m, k_rows) if k_rows > 0 else None
+        cols_top = _RunningTopK(n, k_cols) if k_cols > 0 else None
+        # unique rank keys: (fit, match), then the lower index wins, like a stable sort
+        span = max(m, n) + 1
+        bm, bn = block_shape(m, n, self.block_pairs)
+        blocks = 0
+
+        with timed("match.blocks"):
+            for r0 in range(0, m if n else 0, bm):
+                rs = slice(r0, min(r0 + bm, m))
+                for c0 in range(0, n, bn):
+                    cs = slice(c0, min(c0 + bn, n))
+                    blocks += 1
+
+                    columns = {
+                        "tfidf_sim": engine.tfidf.cross_similarity(job_tfidf[rs], resume_tfidf[cs]),
+                        "sbert_sim": (job_vecs[rs] @ resume_vecs[cs].T).astype(np.float64)
+                    }
+                    matched = job_skills[rs] @ resume_skills[cs].T
+                    total = job_skill_counts[rs, None]
+                    columns["overlap"] = np.divide(matched, total, out=np.zeros_like(matched), where=total > 0)
+                    columns["missing_count"] = total - matched
+                    columns["keyword_matches"] = np.minimum((job_tokens[rs] @ resume_tokens[cs].T).toarray(), KEYWORD_MATCH_CAP)
+
+                    features = np.stack([columns[name] for name in FEATURE_NAMES], axis=-1)
+                    probs = engine.classifier.predict_proba_batch(features.reshape(-1, len(FEATURE_NAMES))).reshape(matched.shape)
+                    fit = np.rint(probs * 100)
+                    match = match_score(hybrid_score(columns["tfidf_sim"], columns["sbert_sim"], columns["overlap"]))
+                    rank = (fit * 101 + match) * span
+
+                    job_idx, resume_idx = np.arange(rs.start, rs.stop), np.arange(cs.start, cs.stop)
+                    if rows_top is not None:
+                        rows_top.update(rs, resume_idx, rank + (span - 1 - resume_idx)[None, :], features, probs)
+                    if cols_top is not None:
+                        cols_top.update(
+                            cs, job_idx, (rank + (span - 1 - job_idx)[:, None]).T, features.transpose(1, 0, 2), probs.T
+                        )
+
+        per_job = [
+            {
+                "name": job["name"],
+                "index": i,
+                "matches": [_match_entry(resumes[j]["name"], j, f, p) for j, f, p in rows_top.row(i)] if rows_top else []
+            }
+            for i, job in enumerate(jobs)
+        ] if top_k_per_job > 0 else []
+        per_resume = [
+            {
+                "name": resume["name"],
+                "index": j,
+                "matches": [_match_entry(jobs[i]["name"], i, f, p) for i, f, p in cols_top.row(j)] if cols_top else []
+            }
+            for j, resume in enumerate(resumes)
+        ] if top_k_per_resume > 0 else []
+
+        return {
+            "total_jobs": m,
+            "total_resumes": n,
+            "per_job": per_job,
+            "per_resume": per_resume,
+            "stats": {
+                "pairs": m * n,
+                "blocks": blocks,
+                "block_shape": [bm, bn],
+                "seconds": round(time.perf_counter() - start, 3)
+            }
+        }
@@ -1,31 +1,285 @@
-from typing import List, Dict, Any
-from .score_engine import ScoreEngine
+import heapq
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.metrics import timed
+from .features import FEATURE_NAMES, SBERT_COLUMN
+from .score_engine import DETAIL_LEVELS, ScoreEngine, hybrid_score, match_score
+from . import registry
+from .job_profile import JobProfile
+
+# 0 = no cap: early stopping alone, same result as the full ranking
+CASCADE_SHORTLIST = 0
+CASCADE_CHUNK_SIZE = 64
+# cosine similarity of unit-length embeddings
+SBERT_MIN, SBERT_MAX = -1.0, 1.0
+# what a ranking row shows (scores, similarity, missing skills / keywords)
+ROW_SECTIONS = DETAIL_LEVELS["standard"]
+
+
+def rank_key(result: Dict[str, Any]):
+    # ✅ Sort by fit score first, then match score
+    return result["fit_prediction_score"], result["match_score"]
+
+
+class TopK:
+    """
+    Running top-k by (fit score, match score) over a stream of results, kept in
+    a bounded min-heap so only k results are ever held. Ties keep arrival
+    order, same as a stable sort of the full list.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(0, int(k))
+        self._heap = []
+        self._seq = 0
+
+    def push(self, result: Dict[str, Any], seq: Optional[int] = None) -> bool:
+        """
+        Returns True when the result entered the current top-k. `seq` (default:
+        arrival order) breaks ties, lower first.
+        """
+        if self.k == 0:
+            return False
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+        entry = (*rank_key(result), -seq, result)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:3] > self._heap[0][:3]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> Optional[Tuple[int, int]]:
+        """Rank key of the k-th best result once k results are held, else None."""
+        if self.k == 0 or len(self._heap) < self.k:
+            return None
+        return self._heap[0][:2]
+
+    def sorted(self) -> List[Dict[str, Any]]:
+        return [e[-1] for e in sorted(self._heap, key=lambda e: e[:3], reverse=True)]
 
 
 class RankEngine:
-    def __init__(self):
-        self.engine = ScoreEngine()
+    def __init__(self, engine: Optional[ScoreEngine] = None):
+        # share the process-wide ScoreEngine (and its models / caches) by default
+        self.engine = engine or registry.get_score_engine()
 
-    def rank(self, job_description: str, resumes: List[Dict[str, str]], top_k: int = 10):
-        results = []
+    def score(
+        self,
+        job_description: Union[str, JobProfile],
+        resumes: List[Dict[str, str]],
+        sections: Iterable[str] = ROW_SECTIONS
+    ) -> List[Dict[str, Any]]:
+        """
+        Unsorted ranking rows for a batch of {"name", "text"} resumes. Each
+        row's full_analysis holds only `sections` (default: what the row shows).
+        """
+        if not resumes:
+            return []
 
-        for r in resumes:
-            resume_name = r["name"]
-            resume_text = r["text"]
+        # ✅ JD-side work once, then one batched pass over every resume
+        job = self.engine.job_profile(job_description)
+        analyses = self.engine.analyze_batch(job, [r["text"] for r in resumes], sections=sections)
 
-            analysis = self.engine.analyze(job_description, resume_text)
+        return [ranked_row(r["name"], analysis) for r, analysis in zip(resumes, analyses)]
 
-            results.append({
-                "resume_name": resume_name,
-                "match_score": analysis["match_score"],
-                "fit_prediction_score": analysis["fit_prediction_score"],
-                "missing_skills": analysis["skills"]["missing"],
-                "missing_keywords": analysis.get("keyword_optimization", {}).get("missing_keywords", []),
-                "similarity": analysis["similarity"],
-                "full_analysis": analysis
-            })
+    def rank(
+        self,
+        job_description: Union[str, JobProfile],
+        resumes: List[Dict[str, str]],
+        top_k: int = 10,
+        sections: Iterable[str] = ROW_SECTIONS
+    ):
+        results = self.score(job_description, resumes, sections)
 
-        # ✅ Sort by fit score first, then match score
-        results.sort(key=lambda x: (x["fit_prediction_score"], x["match_score"]), reverse=True)
+        with timed("rank.sort"):
+            results.sort(key=rank_key, reverse=True)
 
         return results[:top_k], results
+
+    def rank_cascade(
+        self,
+        job_description: Union[str, JobProfile],
+        resumes: List[Dict[str, str]],
+        top_k: int = 10,
+        shortlist: Optional[int] = CASCADE_SHORTLIST,
+        early_stop: bool = True,
+        chunk_size: int = CASCADE_CHUNK_SIZE,
+        sections: Iterable[str] = ROW_SECTIONS
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Two-stage ranking that only pays for SBERT and the full analysis where
+        they can change the top-k.
+
+        Stage one computes the cheap features (TF-IDF, skill overlap, missing
+        skills, keyword matches) of every resume, and from them an upper bound
+        on its rank key: the fit and match scores it would get with the best
+        possible SBERT similarity. A `shortlist` cap (None / 0: no cap) keeps
+        the resumes picked by `estimated_shortlist`. Stage two walks the kept
+        resumes in bound order, running SBERT + the classifier chunk by chunk;
+        with `early_stop` it stops once the current k-th best beats the bound
+        of every resume left. Only the final top-k get the report `sections`.
+
+        With a linear classifier, `early_stop` and no shortlist cap the result
+        is the same as rank(). A non-linear classifier gives no bound, so the
+        order falls back to the cheap part of the hybrid score and only the
+        shortlist cap applies. Returns (top-k rows, stats).
+        """
+        engine = self.engine
+        n = len(resumes)
+        stats = {"candidates": n, "shortlist": 0, "scored": 0, "fully_analyzed": 0, "early_stopped": False}
+        if not resumes or top_k <= 0:
+            return [], stats
+
+        # ✅ Stage one: cheap features + rank-key upper bound for everyone
+        job = engine.job_profile(job_description)
+        docs = engine.parse_batch([r["text"] for r in resumes])
+        features, gaps = engine.cheap_features(job, docs)
+        tfidf_col, overlap_col = FEATURE_NAMES.index("tfidf_sim"), FEATURE_NAMES.index("overlap")
+
+        with timed("rank.prefilter"):
+            bound_match = match_score(hybrid_score(features[:, tfidf_col], SBERT_MAX, features[:, overlap_col]))
+            bound_prob = engine.classifier.max_proba_batch(features, SBERT_COLUMN, SBERT_MIN, SBERT_MAX)
+            if bound_prob is None:
+                early_stop = False
+                bound_fit = np.zeros(n, dtype=int)
+            else:
+                bound_fit = np.rint(bound_prob * 100).astype(int)
+            # best bound first; ties keep input order like the full ranking
+            order = np.lexsort((np.arange(n), -bound_match, -bound_fit))
+
+        limit = min(n, max(top_k, shortlist)) if shortlist else n
+        if limit < n:
+            # the bound saturates (most resumes could still reach fit 99-100), so
+            # it can't choose a capped shortlist; it only orders the kept ones
+            with timed("rank.shortlist"):
+                order = order[estimated_shortlist(engine.classifier, features, limit)[order]]
+        stats["shortlist"] = limit
+
+        # ✅ Stage two: SBERT + classifier in bound order until nothing left can enter the top-k
+        top = TopK(top_k)
+        for start in range(0, limit, chunk_size):
+            if early_stop and top.threshold is not None:
+                nxt = order[start]
+                if top.threshold > (int(bound_fit[nxt]), int(bound_match[nxt])):
+                    stats["early_stopped"] = True
+                    break
+
+            ids = order[start:min(start + chunk_size, limit)]
+            features[ids, SBERT_COLUMN] = engine.sbert_similarities(job, [docs[i] for i in ids])
+            with timed("score.classifier"):
+                fit = np.rint(engine.classifier.predict_proba_batch(features[ids]) * 100).astype(int)
+            match = match_score(hybrid_score(features[ids, tfidf_col], features[ids, SBERT_COLUMN], features[ids, overlap_col]))
+
+            for i, f, m in zip(ids, fit, match):
+                top.push({"index": int(i), "fit_prediction_score": int(f), "match_score": int(m)}, seq=int(i))
+            stats["scored"] += len(ids)
+
+        # ✅ Stage three: full analysis for the winners only
+        winners = [row["index"] for row in top.sorted()]
+        analyses = engine.explain_batch(
+            job, [docs[i] for i in winners], [gaps[i] for i in winners], features[winners], sections
+        )
+        stats["fully_analyzed"] = len(winners)
+
+        return [ranked_row(resumes[i]["name"], a) for i, a in zip(winners, analyses)], stats
+
+    def rank_stream(
+        self,
+        job_description: Union[str, JobProfile],
+        resumes: List[Dict[str, str]],
+        top_k: int = 10,
+        chunk_size: int = 16
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Score resumes chunk by chunk, yielding {"event": "candidate", ...} as
+        each chunk finishes and a final {"event": "summary", ...} with the
+        ranked top-k. full_analysis is dropped as soon as a row is scored, so
+        memory holds one chunk plus the running top-k.
+        """
+        job = self.engine.job_profile(job_description)
+        top = TopK(top_k)
+        processed = 0
+
+        for start in range(0, len(resumes), chunk_size):
+            for result in self.score(job, resumes[start:start + chunk_size]):
+                processed += 1
+                row = compact_result(result)
+                top.push(row)
+                yield candidate_event(row, processed, len(resumes))
+
+        yield summary_event(top, len(resumes))
+
+
+def estimated_shortlist(classifier, features: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Mask of the `limit` resumes most likely to make the top-k, from a cheap
+    estimate of their rank key with sbert_sim set to the TF-IDF similarity.
+    Half are the highest estimated fit probabilities (resumes that may round
+    into the top fit score); the rest fill up in estimated (fit, match) order.
+    """
+    n = len(features)
+    tfidf, overlap = features[:, FEATURE_NAMES.index("tfidf_sim")], features[:, FEATURE_NAMES.index("overlap")]
+    estimate = features.copy()
+    estimate[:, SBERT_COLUMN] = tfidf
+    prob = classifier.predict_proba_batch(estimate)
+
+    ties = np.arange(n)
+    by_prob = np.lexsort((ties, -prob))
+    by_key = np.lexsort((ties, -hybrid_score(tfidf, tfidf, overlap), -np.rint(prob * 100)))
+
+    picked = np.zeros(n, dtype=bool)
+    picked[by_prob[:limit // 2]] = True
+    picked[by_key[~picked[by_key]][:limit - int(picked.sum())]] = True
+    return picked
+
+
+def ranked_row(name: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Ranking row; fields whose report section wasn't computed are left out."""
+    row = {
+        "resume_name": name,
+        "match_score": analysis["match_score"],
+        "fit_prediction_score": analysis["fit_prediction_score"]
+    }
+    if "skills" in analysis:
+        row["missing_skills"] = analysis["skills"]["missing"]
+    if "keyword_optimization" in analysis:
+        row["missing_keywords"] = analysis["keyword_optimization"]["missing_keywords"]
+    if "similarity" in analysis:
+        row["similarity"] = analysis["similarity"]
+    row["full_analysis"] = analysis
+    return row
+
+
+def response_row(result: Dict[str, Any], sections: Iterable[str]) -> Dict[str, Any]:
+    """Row as sent by /rank_resumes: full_analysis only if it holds sections the row doesn't show."""
+    if frozenset(sections) <= ROW_SECTIONS:
+        return compact_result(result)
+    return result
+
+
+def compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in result.items() if k != "full_analysis"}
+
+
+def candidate_event(row: Dict[str, Any], processed: int, total: int) -> Dict[str, Any]:
+    return {"event": "candidate", "processed": processed, "total": total, "candidate": row}
+
+
+def summary_event(top: TopK, total: int, failed_files: List[Dict[str, str]] = None) -> Dict[str, Any]:
+    return {
+        "event": "summary",
+        "total_resumes": total,
+        "top_k": top.k,
+        "ranked_resumes": top.sorted(),
+        "failed_files": failed_files or []
+    }
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
 
 
 class RankedResume(BaseModel):
@@ -11,8 +11,99 @@ class RankedResume(BaseModel):
     similarity: Dict[str, Any]
 
 
+class RankedResumeFields(BaseModel):
+    # /rank_resumes row: fields of sections not requested with `fields` are left
+    # out, and full_analysis is only sent for sections beyond the row's own
+    resume_name: str
+    match_score: int
+    fit_prediction_score: int
+    missing_skills: Optional[List[str]] = None
+    missing_keywords: Optional[List[str]] = None
+    similarity: Optional[Dict[str, Any]] = None
+    full_analysis: Optional[Dict[str, Any]] = None
+
+
+class FailedFile(BaseModel):
+    name: str
+    error: str
+
+
+class CascadeStats(BaseModel):
+    candidates: int
+    shortlist: int
+    scored: int
+    fully_analyzed: int
+    early_stopped: bool
+
+
 class RankResponse(BaseModel):
     job_description: str
     total_resumes: int
     top_k: int
-    ranked_resumes: List[RankedResume]
+    ranked_resumes: List[RankedResumeFields]
+    failed_files: List[FailedFile] = []
+    cascade: Optional[CascadeStats] = None
+
+
+class SearchResult(RankedResume):
+    resume_id: int
+    retrieval_score: float
+
+
+class SearchResponse(BaseModel):
+    job_description: str
+    total_indexed: int
+    shortlist_size: int
+    top_k: int
+    ranked_resumes: List[SearchResult]
+
+
+class IndexResponse(BaseModel):
+    added: int
+    duplicates: int
+    total: int
+    failed_files: List[FailedFile] = []
+
+
+class MatchDocument(BaseModel):
+    name: str
+    text: str
+
+
+class MatchMatrixRequest(BaseModel):
+    jobs: List[MatchDocument]
+    resumes: List[MatchDocument]
+    top_k_per_job: int = Field(10, ge=0)
+    top_k_per_resume: int = Field(0, ge=0)
+
+
+class PairMatch(BaseModel):
+    name: str
+    index: int
+    match_score: int
+    fit_prediction_score: int
+    similarity: Dict[str, float]
+    skill_overlap_percent: float
+    missing_skills_count: int
+    keyword_matches: int
+
+
+class MatchList(BaseModel):
+    name: str
+    index: int
+    matches: List[PairMatch]
+
+
+class MatchMatrixStats(BaseModel):
+    pairs: int
+    blocks: int
+    block_shape: List[int]
+    seconds: float
+
+
+class MatchMatrixResponse(BaseModel):
+    total_jobs: int
+    total_resumes: int
+    per_job: List[MatchList]
+    per_resume: List[MatchList]
+    stats: MatchMatrixStats
@@ -0,0 +1,91 @@
+import gc
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+from ..config import DEFAULT_SKILLS, SBERT_BACKEND, SBERT_MODEL_NAME
+from .encoders import encoder_id
+from .fit_classifier import FitClassifier
+from .sbert_matcher import SBERTMatcher
+
+# Process-wide registry: every model is built once per process and shared by
+# ScoreEngine, RankEngine, CorpusIndex and the job workers, so a worker holds
+# one encoder, one classifier and one embedding cache.
+_lock = threading.RLock()
+_models: Dict[Hashable, object] = {}
+_warmup_seconds: Optional[float] = None
+
+
+def _get(key: Hashable, factory):
+    with _lock:
+        obj = _models.get(key)
+        if obj is None:
+            obj = _models[key] = factory()
+        return obj
+
+
+def get_sbert(model_name: str = SBERT_MODEL_NAME, backend: str = SBERT_BACKEND) -> SBERTMatcher:
+    """Shared SBERTMatcher; the underlying model itself loads on first encode."""
+    return _get(("sbert", model_name, backend), lambda: SBERTMatcher(model_name, backend=backend))
+
+
+def get_classifier() -> FitClassifier:
+    return _get("classifier", FitClassifier)
+
+
+def get_score_engine(skills_list=None):
+    """Shared ScoreEngine per skills list (the default list in normal use)."""
+    from .score_engine import ScoreEngine
+
+    skills = tuple(skills_list or DEFAULT_SKILLS)
+    return _get(("engine", skills), lambda: ScoreEngine(list(skills)))
+
+
+def warmup(encode: bool = True) -> float:
+    """
+    Load everything now instead of on the first request (SBERT weights,
+    classifier, sklearn), plus one throwaway encode unless `encode=False`.
+    Returns the seconds it took.
+    """
+    global _warmup_seconds
+    t0 = time.perf_counter()
+    engine = get_score_engine()
+    model = engine.sbert.model
+    if encode:
+        model.encode(["warmup"], batch_size=1)
+    engine.tfidf.similarity_many("warmup", ["warmup"])  # imports sklearn
+    _warmup_seconds = time.perf_counter() - t0
+    return _warmup_seconds
+
+
+def preload() -> float:
+    """
+    Load the models in a parent process that is about to fork server workers,
+    so all workers share one physical copy of the weights (copy-on-write).
+
+    No inference runs here (torch / OpenMP thread pools must not exist before
+    fork), the weights are made read-only, and gc.freeze() moves every object
+    loaded so far out of the collector's reach so GC passes in the workers
+    don't write to, and thereby copy, the shared pages.
+    """
+    seconds = warmup(encode=False)
+    module = getattr(get_score_engine().sbert.model, "module", None)  # torch backends only
+    if hasattr(module, "parameters"):
+        module.eval()
+        for param in module.parameters():
+            param.requires_grad_(False)
+    gc.collect()
+    gc.freeze()
+    return seconds
+
+
+def status() -> Dict[str, object]:
+    """What is loaded so far, for the /ready endpoint."""
+    with _lock:
+        sberts = {encoder_id(k[1], k[2]): m.loaded for k, m in _models.items() if isinstance(k, tuple) and k[0] == "sbert"}
+        return {
+            "warmed_up": _warmup_seconds is not None,
+            "warmup_seconds": _warmup_seconds,
+            "sbert_loaded": sberts,
+            "classifier_loaded": "classifier" in _models
+        }
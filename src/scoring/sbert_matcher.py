@@ -1,22 +1,152 @@
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+from ..config import (
+    SBERT_BACKEND,
+    SBERT_CHUNK_TOKENS,
+    SBERT_CHUNKING,
+    SBERT_MAX_CHUNKS,
+    SBERT_MODEL_NAME,
+    SBERT_TOKEN_BUDGET
+)
+from .chunking import chunk_text, length_batches, pool_chunks
+from .embedding_cache import EmbeddingCache
+from .encoders import Encoder, encoder_id, load_encoder
+
+
+def cache_namespace(model_name: str, backend: str, chunking: bool = SBERT_CHUNKING, chunk_tokens: int = SBERT_CHUNK_TOKENS) -> str:
+    """
+    Embedding cache namespace. Chunked vectors of long documents differ from
+    truncated ones, so the two modes (and chunk sizes) never share entries.
+    """
+    namespace = encoder_id(model_name, backend)
+    if chunking:
+        namespace += f"#chunked{chunk_tokens}" if chunk_tokens else "#chunked"
+    return namespace
+
 
 class SBERTMatcher:
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
-        self.cache: Dict[str, np.ndarray] = {}
+    def __init__(
+        self,
+        model_name: str = SBERT_MODEL_NAME,
+        batch_size: int = 32,
+        cache: Optional[EmbeddingCache] = None,
+        backend: str = SBERT_BACKEND,
+        chunking: bool = SBERT_CHUNKING,
+        chunk_tokens: int = SBERT_CHUNK_TOKENS,
+        max_chunks: int = SBERT_MAX_CHUNKS,
+        token_budget: int = SBERT_TOKEN_BUDGET
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.chunking = chunking
+        self.chunk_tokens = chunk_tokens
+        self.max_chunks = max_chunks
+        self.token_budget = token_budget
+        self.cache = cache if cache is not None else EmbeddingCache(
+            cache_namespace(model_name, backend, chunking, chunk_tokens)
+        )
+        self._model: Optional[Encoder] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @property
+    def model(self) -> Encoder:
+        # the backend (torch / onnxruntime ...) is imported and the weights loaded on first use
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = load_encoder(self.model_name, self.backend)
+        return self._model
 
     def embed(self, text: str) -> np.ndarray:
-        if text in self.cache:
-            return self.cache[text]
-        vec = self.model.encode([text], convert_to_numpy=True, normalize_embeddings=True)[0]
-        self.cache[text] = vec
-        return vec
+        return self.embed_many([text])[0]
+
+    def _chunks(self, text: str) -> List[Tuple[str, int]]:
+        model = self.model
+        max_tokens = model.max_seq_length - 2  # [CLS] / [SEP]
+        if self.chunk_tokens:
+            max_tokens = min(self.chunk_tokens, max_tokens)
+        if not self.chunking:
+            return [(text, min(model.token_counts([text])[0], max_tokens))]
+        return chunk_text(text, model.token_counts, max_tokens, max_chunks=self.max_chunks) or [(text, 0)]
+
+    def _encode(self, texts: List[str], lengths: List[int]) -> Dict[str, np.ndarray]:
+        """Encode texts in length-sorted batches, so each batch pads to a similar length."""
+        model = self.model
+        padded = [min(n + 2, model.max_seq_length) for n in lengths]
+        if self.token_budget > 0:
+            batches = length_batches(padded, self.token_budget)
+        else:
+            batches = length_batches(padded, float("inf"), max_batch=self.batch_size)
+        out = {}
+        for batch in batches:
+            batch_texts = [texts[i] for i in batch]
+            out.update(zip(batch_texts, model.encode(batch_texts, batch_size=len(batch))))
+        return out
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts. Cache misses are split into chunks (long
+        documents only); chunks not cached yet are encoded in length-sorted
+        batches and pooled back into one vector per document. Chunk vectors
+        are cached too, so an edited resume only re-encodes its changed chunks.
+        Returns an (N, dim) matrix of L2-normalized embeddings.
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        found = self.cache.get_many(texts)
+        missing = [t for t in dict.fromkeys(texts) if t not in found]
+        if missing:
+            doc_chunks = {t: self._chunks(t) for t in missing}
+            pending = dict.fromkeys(c for chunks in doc_chunks.values() for c in chunks)
+            chunk_vecs = self.cache.get_many([c for c, _ in pending])
+            todo = [(c, n) for c, n in pending if c not in chunk_vecs]
+            if todo:
+                encoded = self._encode([c for c, _ in todo], [n for _, n in todo])
+                # round-trip through the cache dtype so hits and misses return identical vectors
+                encoded = {c: v.astype(self.cache.dtype).astype(np.float32) for c, v in encoded.items()}
+                self.cache.put_many(encoded)
+                chunk_vecs.update(encoded)
+
+            new = {}
+            for t, chunks in doc_chunks.items():
+                if len(chunks) == 1:
+                    new[t] = chunk_vecs[chunks[0][0]]
+                else:
+                    pooled = pool_chunks(np.stack([chunk_vecs[c] for c, _ in chunks]), [max(n, 1) for _, n in chunks])
+                    new[t] = pooled.astype(self.cache.dtype).astype(np.float32)
+            self.cache.put_many(new)
+            found.update(new)
+
+        return np.vstack([found[t] for t in texts]).astype(np.float32)
 
     def similarity(self, job_text: str, resume_text: str) -> float:
-        v1 = self.embed(job_text)
-        v2 = self.embed(resume_text)
-        sim = float(cosine_similarity([v1], [v2])[0][0])
-        return sim
+        return float(self.similarity_many(job_text, [resume_text])[0])
+
+    def similarity_many(
+        self,
+        job_text: str,
+        resume_texts: List[str],
+        resume_vecs: Optional[np.ndarray] = None,
+        job_vec: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Cosine similarity of one JD against many resumes. Pass `job_vec` /
+        `resume_vecs` when the embeddings are already known (e.g. from a
+        JobProfile or the corpus index).
+        """
+        if not resume_texts:
+            return np.zeros(0, dtype=np.float64)
+        if job_vec is None:
+            job_vec = self.embed(job_text)
+        if resume_vecs is None:
+            resume_vecs = self.embed_many(resume_texts)
+        # embeddings are unit length, so cosine similarity is a plain mat-vec product
+        return (np.asarray(resume_vecs, dtype=np.float32) @ job_vec).astype(np.float64)
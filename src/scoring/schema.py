@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 
 class Similarity(BaseModel):
     tfidf: float
@@ -17,12 +17,25 @@ class Explainability(BaseModel):
     tfidf_contribution: float
     sbert_contribution: float
     skill_overlap_contribution: float
+    missing_skills_count: int
+    keyword_matches: int
     classifier_fit_probability: float
 
+class CacheInfo(BaseModel):
+    # "memory" / "disk" (served from that cache tier), "miss" (computed now) or "off"
+    pdf_text: str
+    analysis: str
+
 class AnalysisResponse(BaseModel):
+    # sections not requested with `fields` are left out
     match_score: int
     fit_prediction_score: int
-    similarity: Similarity
-    skills: SkillsReport
-    explainability: Explainability
-    recommendations: List[str]
+    similarity: Optional[Similarity] = None
+    skills: Optional[SkillsReport] = None
+    explainability: Optional[Explainability] = None
+    shap_explainability: Optional[Dict[str, float]] = None
+    keyword_optimization: Optional[Dict[str, Any]] = None
+    section_suggestions: Optional[Any] = None
+    bullet_rewrite_templates: Optional[Any] = None
+    recommendations: Optional[List[str]] = None
+    cache: Optional[CacheInfo] = None
@@ -1,137 +1,343 @@
-from typing import Dict, Any
-from ..utils.text import clean_text
-from ..utils.skills import extract_skills, skill_gap
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Tuple, Union
+import numpy as np
+
+from ..utils.hashing import text_hash
+from ..utils.lru import LRUCache
+from ..utils.metrics import BATCH_SIZE, timed
+from ..utils.text import ParsedDocument, parse_document
+from ..utils.skills import get_skill_matcher, skill_gap
 from ..config import DEFAULT_SKILLS
+from .features import FEATURE_NAMES, SBERT_COLUMN
 from .tfidf_matcher import TfidfMatcher
 from .sbert_matcher import SBERTMatcher
 from .fit_classifier import FitClassifier
+from . import registry
+from .job_profile import JobProfile
 
-from ..utils.keywords import find_missing_keywords
+from ..utils.keywords import extract_top_keywords, find_missing_keywords_in_tokens
 from ..utils.suggestions import build_resume_suggestions, rewrite_bullet_templates
 
 
-def keyword_match_count(jd_text: str, resume_text: str, top_k: int = 30) -> int:
+KEYWORD_MATCH_CAP = 30
+TOP_KEYWORDS = 20
+JOB_PROFILE_CACHE_SIZE = 256
+
+# Optional parts of an analysis; match_score and fit_prediction_score are always there
+REPORT_SECTIONS = (
+    "similarity",
+    "skills",
+    "explainability",
+    "shap_explainability",
+    "keyword_optimization",
+    "section_suggestions",
+    "bullet_rewrite_templates",
+    "recommendations"
+)
+# Sections that need the JD keywords missing from the resume
+KEYWORD_SECTIONS = frozenset({"keyword_optimization", "section_suggestions", "bullet_rewrite_templates", "recommendations"})
+DETAIL_LEVELS = {
+    "summary": frozenset({"similarity", "skills"}),
+    "standard": frozenset({"similarity", "skills", "keyword_optimization"}),
+    "full": frozenset(REPORT_SECTIONS)
+}
+
+
+def resolve_sections(fields: Union[None, str, Iterable[str]], default: str = "full") -> FrozenSet[str]:
+    """
+    Report sections for a `fields` value: a detail level (summary / standard /
+    full), a comma-separated list of sections, or empty for `default`.
+    Raises ValueError on unknown names.
+    """
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    names = list(fields or [default])
+    sections = set()
+    for name in names:
+        if name in DETAIL_LEVELS:
+            sections |= DETAIL_LEVELS[name]
+        elif name in REPORT_SECTIONS:
+            sections.add(name)
+        else:
+            raise ValueError(
+                f"Unknown field '{name}'. Use one of {', '.join(DETAIL_LEVELS)} or {', '.join(REPORT_SECTIONS)}"
+            )
+    return frozenset(sections)
+
+
+def hybrid_score(tfidf_sim, sbert_sim, overlap_percent):
+    """Weighted blend of the similarities; works on scalars and arrays."""
+    return (tfidf_sim * 0.35) + (sbert_sim * 0.45) + (overlap_percent * 0.20)
+
+
+def match_score(hybrid):
+    """Hybrid score as the 0-100 (truncated) match score."""
+    return np.clip(hybrid * 100, 0, 100).astype(int)
+
+
+def keyword_match_count(
+    jd_text: Union[str, ParsedDocument],
+    resume_text: Union[str, ParsedDocument],
+    top_k: int = KEYWORD_MATCH_CAP
+) -> int:
     """
     Count how many JD keywords appear in resume.
     Must match training logic.
     """
-    jd_tokens = set(clean_text(jd_text).split())
-    resume_tokens = set(clean_text(resume_text).split())
+    jd_tokens = parse_document(jd_text).token_set
+    resume_tokens = parse_document(resume_text).token_set
     common = jd_tokens.intersection(resume_tokens)
     return min(len(common), top_k)
 
 
 class ScoreEngine:
-    def __init__(self, skills_list=None):
+    def __init__(
+        self,
+        skills_list=None,
+        sbert: Optional[SBERTMatcher] = None,
+        classifier: Optional[FitClassifier] = None
+    ):
         self.skills_list = skills_list or DEFAULT_SKILLS
+        self.skill_matcher = get_skill_matcher(self.skills_list)
         self.tfidf = TfidfMatcher()
-        self.sbert = SBERTMatcher()
-        self.classifier = FitClassifier()
+        # ✅ Models come from the process-wide registry unless passed in
+        self.sbert = sbert or registry.get_sbert()
+        self.classifier = classifier or registry.get_classifier()
+        self.job_profiles = LRUCache(JOB_PROFILE_CACHE_SIZE, sizeof=lambda _: 1)
 
-    def analyze(self, job_description: str, resume_text: str) -> Dict[str, Any]:
-        jd_clean = clean_text(job_description)
-        resume_clean = clean_text(resume_text)
+    def job_profile(self, job_description: Union[str, JobProfile]) -> JobProfile:
+        """
+        JD-side work (cleaning, tokens, skills, embedding, top keywords) done
+        once and cached by content hash, so repeated requests for the same JD
+        only pay for the resume side.
+        """
+        if isinstance(job_description, JobProfile):
+            return job_description
 
-        # ✅ Similarities
-        tfidf_sim = self.tfidf.similarity(jd_clean, resume_clean)
-        sbert_sim = self.sbert.similarity(jd_clean, resume_clean)
+        key = text_hash(job_description)
+        profile = self.job_profiles.get(key)
+        if profile is not None:
+            return profile
 
-        # ✅ Skill extraction + gap analysis
-        job_skills = extract_skills(job_description, self.skills_list)
-        resume_skills = extract_skills(resume_text, self.skills_list)
-        gaps = skill_gap(job_skills, resume_skills)
+        doc = parse_document(job_description, self.skill_matcher)
+        profile = JobProfile(
+            key=key,
+            text=job_description,
+            clean=doc.clean,
+            tokens=frozenset(doc.token_set),
+            skills=doc.skills,
+            embedding=self.sbert.embed(doc.clean),
+            top_keywords=extract_top_keywords(doc, top_k=TOP_KEYWORDS)
+        )
+        self.job_profiles.put(key, profile)
+        return profile
 
-        overlap_percent = 0.0
-        if len(job_skills) > 0:
-            overlap_percent = len(gaps["matched"]) / len(job_skills)
+    def analyze(
+        self,
+        job_description: Union[str, JobProfile],
+        resume_text: str,
+        sections: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        return self.analyze_batch(job_description, [resume_text], sections=sections)[0]
 
-        # ✅ Hybrid score (human-friendly)
-        hybrid_score = (tfidf_sim * 0.35) + (sbert_sim * 0.45) + (overlap_percent * 0.20)
-        score_0_100 = int(min(100, max(0, hybrid_score * 100)))
+    def analyze_batch(
+        self,
+        job_description: Union[str, JobProfile],
+        resume_texts: List[str],
+        resume_embeddings: Optional[np.ndarray] = None,
+        sections: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze one JD against N resumes. Similarities are computed with one
+        vectorized TF-IDF pass and one batched SBERT call, and the classifier +
+        SHAP run once over the (N, 5) feature matrix.
 
-        # ✅ Feature engineering (MUST match training)
-        missing_count = len(gaps["missing"])
-        keyword_matches = keyword_match_count(job_description, resume_text)
+        `job_description` may be a raw JD or a prebuilt JobProfile.
+        `resume_embeddings` (N, dim) skips SBERT for resumes whose embeddings of
+        the cleaned text are already known. `sections` limits the report to
+        those REPORT_SECTIONS (default: all); the others are never computed.
+        """
+        if not resume_texts:
+            return []
 
-        features = [tfidf_sim, sbert_sim, overlap_percent, missing_count, keyword_matches]
+        BATCH_SIZE.observe(len(resume_texts))
+        with timed("score.job_profile"):
+            job = self.job_profile(job_description)
+        docs = self.parse_batch(resume_texts)
+        features, gaps = self.cheap_features(job, docs)
+        features[:, SBERT_COLUMN] = self.sbert_similarities(job, docs, resume_embeddings)
+        return self.explain_batch(job, docs, gaps, features, sections)
 
-        # ✅ Fit classifier + SHAP explainability
-        try:
-            fit_prob, shap_explain = self.classifier.predict_with_explain(features)
-        except Exception:
-            fit_prob = self.classifier.predict_proba(features)
-            shap_explain = {}
+    def parse_batch(self, resume_texts: List[str]) -> List[ParsedDocument]:
+        with timed("score.parse"):
+            return [parse_document(r, self.skill_matcher) for r in resume_texts]
 
-        fit_score = int(round(fit_prob * 100))
+    def cheap_features(self, job: JobProfile, docs: List[ParsedDocument]) -> Tuple[np.ndarray, List[Dict[str, List[str]]]]:
+        """
+        Every feature except SBERT (TF-IDF, skill overlap, missing skills,
+        keyword matches) as an (N, 5) matrix whose sbert column is 0, plus the
+        skill gaps per resume.
+        """
+        # ✅ Similarities
+        with timed("score.tfidf"):
+            tfidf_sims = self.tfidf.similarity_many(job.clean, [d.clean for d in docs])
 
-        # ✅ Keyword Optimization + Suggestions
-        top_keywords, missing_keywords = find_missing_keywords(job_description, resume_text, top_k=20)
-        section_suggestions = build_resume_suggestions(gaps["missing"], missing_keywords)
-        bullet_rewrites = rewrite_bullet_templates(missing_keywords)
+        # ✅ Skill extraction + gap analysis (resume side only)
+        with timed("score.features"):
+            features = np.zeros((len(docs), len(FEATURE_NAMES)), dtype=np.float64)
+            all_gaps = []
+            for i, doc in enumerate(docs):
+                gaps = skill_gap(job.skills, doc.skills)
 
-        keyword_optimization = {
-            "top_job_keywords": top_keywords,
-            "missing_keywords": missing_keywords[:10],
-            "note": "Add missing keywords naturally only if you genuinely have the skill/experience."
-        }
+                overlap_percent = 0.0
+                if len(job.skills) > 0:
+                    overlap_percent = len(gaps["matched"]) / len(job.skills)
 
-        # ✅ Basic explainability (your engineered contributions)
-        explain = {
-            "tfidf_contribution": round(tfidf_sim * 35, 2),
-            "sbert_contribution": round(sbert_sim * 45, 2),
-            "skill_overlap_contribution": round(overlap_percent * 20, 2),
-            "missing_skills_count": int(missing_count),
-            "keyword_matches": int(keyword_matches),
-            "classifier_fit_probability": round(fit_prob, 4)
-        }
+                # ✅ Feature engineering (MUST match training, see keyword_match_count)
+                missing_count = len(gaps["missing"])
+                keyword_matches = min(len(job.tokens.intersection(doc.token_set)), KEYWORD_MATCH_CAP)
 
-        # ✅ Recommendations engine
-        recommendations = []
-        if gaps["missing"]:
-            recommendations.append(
-                f"Missing critical skills: {', '.join(gaps['missing'][:8])}."
-            )
-        if missing_keywords:
-            recommendations.append(
-                f"Missing important JD keywords: {', '.join(missing_keywords[:8])}."
-            )
-        if sbert_sim < 0.5:
-            recommendations.append(
-                "Resume content isn't semantically aligned. Add role-relevant projects and achievements."
-            )
-        if overlap_percent < 0.4:
-            recommendations.append(
-                "Your skill overlap is low. Add tools/keywords mentioned in the JD only if you have real experience."
-            )
-        if fit_score < 50:
-            recommendations.append(
-                "Fit score is low. Consider applying only after improving missing skills and tailoring your resume."
+                features[i] = [tfidf_sims[i], 0.0, overlap_percent, missing_count, keyword_matches]
+                all_gaps.append(gaps)
+        return features, all_gaps
+
+    def sbert_similarities(
+        self,
+        job: JobProfile,
+        docs: List[ParsedDocument],
+        resume_embeddings: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        with timed("score.sbert"):
+            return self.sbert.similarity_many(
+                job.clean, [d.clean for d in docs], resume_vecs=resume_embeddings, job_vec=job.embedding
             )
 
-        return {
+    def explain_batch(
+        self,
+        job: JobProfile,
+        docs: List[ParsedDocument],
+        gaps: List[Dict[str, List[str]]],
+        features: np.ndarray,
+        sections: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Classifier (+ SHAP if requested) and the report for rows whose features are all known."""
+        sections = frozenset(REPORT_SECTIONS if sections is None else sections)
+
+        # ✅ Fit classifier + SHAP explainability
+        with timed("score.classifier"):
+            shap_explains = [{} for _ in docs]
+            if "shap_explainability" in sections:
+                try:
+                    fit_probs, shap_explains = self.classifier.predict_with_explain_batch(features)
+                except Exception:
+                    fit_probs = self.classifier.predict_proba_batch(features)
+            else:
+                fit_probs = self.classifier.predict_proba_batch(features)
+
+        results = []
+        with timed("score.report"):
+            for i, doc in enumerate(docs):
+                results.append(self._build_report(
+                    job,
+                    doc,
+                    doc.skills,
+                    gaps[i],
+                    features[i],
+                    float(fit_probs[i]),
+                    shap_explains[i],
+                    sections
+                ))
+        return results
+
+    def _build_report(
+        self,
+        job: JobProfile,
+        resume: ParsedDocument,
+        resume_skills: List[str],
+        gaps: Dict[str, List[str]],
+        feature_row,
+        fit_prob: float,
+        shap_explain: Dict[str, float],
+        sections: FrozenSet[str] = frozenset(REPORT_SECTIONS)
+    ) -> Dict[str, Any]:
+        tfidf_sim, sbert_sim, overlap_percent, missing_count, keyword_matches = (float(v) for v in feature_row)
+
+        # ✅ Hybrid score (human-friendly)
+        hybrid = hybrid_score(tfidf_sim, sbert_sim, overlap_percent)
+        score_0_100 = int(match_score(hybrid))
+
+        fit_score = int(round(fit_prob * 100))
+
+        report = {
             "match_score": score_0_100,
-            "fit_prediction_score": fit_score,
-            "similarity": {
+            "fit_prediction_score": fit_score
+        }
+        if "similarity" in sections:
+            report["similarity"] = {
                 "tfidf": round(tfidf_sim, 4),
                 "sbert": round(sbert_sim, 4),
-                "hybrid": round(hybrid_score, 4)
-            },
-            "skills": {
-                "job_skills_found": job_skills,
+                "hybrid": round(hybrid, 4)
+            }
+        if "skills" in sections:
+            report["skills"] = {
+                "job_skills_found": job.skills,
                 "resume_skills_found": resume_skills,
                 "matched": gaps["matched"],
                 "missing": gaps["missing"],
                 "overlap_percent": round(overlap_percent * 100, 2)
-            },
+            }
 
-            # ✅ Explainability
-            "explainability": explain,
-            "shap_explainability": shap_explain,
+        # ✅ Basic explainability (your engineered contributions)
+        if "explainability" in sections:
+            report["explainability"] = {
+                "tfidf_contribution": round(tfidf_sim * 35, 2),
+                "sbert_contribution": round(sbert_sim * 45, 2),
+                "skill_overlap_contribution": round(overlap_percent * 20, 2),
+                "missing_skills_count": int(missing_count),
+                "keyword_matches": int(keyword_matches),
+                "classifier_fit_probability": round(fit_prob, 4)
+            }
+        if "shap_explainability" in sections:
+            report["shap_explainability"] = shap_explain
 
-            # ✅ Phase 5 improvements
-            "keyword_optimization": keyword_optimization,
-            "section_suggestions": section_suggestions,
-            "bullet_rewrite_templates": bullet_rewrites,
+        # ✅ Keyword Optimization + Suggestions (only when a section needs them)
+        missing_keywords = []
+        if sections & KEYWORD_SECTIONS:
+            missing_keywords = find_missing_keywords_in_tokens(job.top_keywords, resume.term_set, resume.bigrams)
 
-            "recommendations": recommendations
-        }
+        if "keyword_optimization" in sections:
+            report["keyword_optimization"] = {
+                "top_job_keywords": job.top_keywords,
+                "missing_keywords": missing_keywords[:10],
+                "note": "Add missing keywords naturally only if you genuinely have the skill/experience."
+            }
+        if "section_suggestions" in sections:
+            report["section_suggestions"] = build_resume_suggestions(gaps["missing"], missing_keywords)
+        if "bullet_rewrite_templates" in sections:
+            report["bullet_rewrite_templates"] = rewrite_bullet_templates(missing_keywords)
+
+        # ✅ Recommendations engine
+        if "recommendations" in sections:
+            recommendations = []
+            if gaps["missing"]:
+                recommendations.append(
+                    f"Missing critical skills: {', '.join(gaps['missing'][:8])}."
+                )
+            if missing_keywords:
+                recommendations.append(
+                    f"Missing important JD keywords: {', '.join(missing_keywords[:8])}."
+                )
+            if sbert_sim < 0.5:
+                recommendations.append(
+                    "Resume content isn't semantically aligned. Add role-relevant projects and achievements."
+                )
+            if overlap_percent < 0.4:
+                recommendations.append(
+                    "Your skill overlap is low. Add tools/keywords mentioned in the JD only if you have real experience."
+                )
+            if fit_score < 50:
+                recommendations.append(
+                    "Fit score is low. Consider applying only after improving missing skills and tailoring your resume."
+                )
+            report["recommendations"] = recommendations
+
+        return report
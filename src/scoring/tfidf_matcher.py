@@ -1,12 +1,180 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from scipy import sparse
+
+# IDF a pair-fitted vectorizer gives a term seen in only one of its two documents
+# (smooth_idf=True, n_docs=2, df=1). Terms present in both get ln(3/3) + 1 == 1.
+_PAIR_IDF_SINGLE = float(np.log(3.0 / 2.0) + 1.0)
+
+# Written by build_features.py / train_fit_model.py next to fit_model.joblib.
+# Present: tfidf_sim = cosine of transform-only vectors from that vectorizer.
+# Absent: the legacy per-pair fit the bundled classifier was trained with.
+VECTORIZER_PATH = Path(__file__).resolve().parents[1] / "models" / "tfidf_vectorizer.joblib"
+TFIDF_MODES = ("corpus", "hashing", "pair")
+HASHING_N_FEATURES = 2 ** 20
+
+
+def fit_vectorizer(texts: List[str], mode: str = "corpus"):
+    """
+    Vectorizer for `mode`: "corpus" fits vocabulary + IDF on `texts`,
+    "hashing" is a fixed-memory HashingVectorizer that needs no fit (plain
+    TF, no IDF). Rows come out L2-normalized, so cosine is a dot product.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+    if mode == "corpus":
+        return TfidfVectorizer(stop_words="english", min_df=2, dtype=np.float32).fit(texts)
+    if mode == "hashing":
+        return HashingVectorizer(
+            n_features=HASHING_N_FEATURES,
+            stop_words="english",
+            alternate_sign=False,
+            norm="l2",
+            dtype=np.float32
+        )
+    raise ValueError(f"Unknown TF-IDF mode {mode!r}, expected 'corpus' or 'hashing'")
+
 
 class TfidfMatcher:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words="english")
+    # sklearn is imported on first use, keeping it off the API import path
+
+    def __init__(self, vectorizer=None, vectorizer_path: Optional[Path] = VECTORIZER_PATH):
+        self._vectorizer = vectorizer
+        self._vectorizer_path = vectorizer_path
+        self._loaded = vectorizer is not None
+
+    @property
+    def vectorizer(self):
+        """Persisted transform-only vectorizer, or None (legacy pair-fit mode)."""
+        if not self._loaded:
+            if self._vectorizer_path is not None and Path(self._vectorizer_path).exists():
+                import joblib
+                self._vectorizer = joblib.load(self._vectorizer_path)
+            self._loaded = True
+        return self._vectorizer
+
+    @property
+    def mode(self) -> str:
+        vectorizer = self.vectorizer
+        if vectorizer is None:
+            return "pair"
+        return "corpus" if hasattr(vectorizer, "vocabulary_") else "hashing"
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """L2-normalized rows from the persisted vectorizer (corpus / hashing mode only)."""
+        return sparse.csr_matrix(self.vectorizer.transform(texts), dtype=np.float64)
 
     def similarity(self, job_text: str, resume_text: str) -> float:
-        X = self.vectorizer.fit_transform([job_text, resume_text])
+        if self.vectorizer is not None:
+            return float(self.similarity_many(job_text, [resume_text])[0])
+
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        X = TfidfVectorizer(stop_words="english").fit_transform([job_text, resume_text])
         sim = cosine_similarity(X[0:1], X[1:2])[0][0]
         return float(sim)
 
+    def similarity_many(self, job_text: str, resume_texts: List[str]) -> np.ndarray:
+        """
+        One JD against many resumes. With a persisted vectorizer: one transform
+        and one sparse mat-vec. Otherwise the same numbers as calling
+        `similarity(job_text, r)` for every resume, from a single CountVectorizer
+        pass instead of one fit per pair.
+        """
+        if not resume_texts:
+            return np.zeros(0, dtype=np.float64)
+
+        if self.vectorizer is not None:
+            X = self.transform([job_text] + list(resume_texts))
+            return np.clip((X[1:] @ X[0].T).toarray().ravel(), 0.0, 1.0)
+
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        counter = CountVectorizer(stop_words="english")
+        try:
+            counts = counter.fit_transform([job_text] + list(resume_texts)).tocsr()
+        except ValueError:
+            # empty vocabulary (every document is blank or stop words only)
+            return np.zeros(len(resume_texts), dtype=np.float64)
+
+        return self.paired_similarity(counts[[0] * len(resume_texts)], counts[1:])
+
+    def matrix_rows(self, texts: List[str]) -> sparse.csr_matrix:
+        """
+        One row per text for cross_similarity: L2-normalized vectors from the
+        persisted vectorizer, else term counts (pair mode). Pass JDs and
+        resumes in one call so their count columns line up.
+        """
+        if self.vectorizer is not None:
+            return self.transform(texts)
+
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        try:
+            counts = CountVectorizer(stop_words="english").fit_transform(texts)
+        except ValueError:
+            return sparse.csr_matrix((len(texts), 1), dtype=np.float64)
+        return sparse.csr_matrix(counts, dtype=np.float64)
+
+    def cross_similarity(self, jd_rows: sparse.csr_matrix, resume_rows: sparse.csr_matrix) -> np.ndarray:
+        """
+        (M, N) similarity of every JD row against every resume row from
+        `matrix_rows`, equal to `similarity_many` for each JD; the pair-mode
+        formula of `paired_similarity` as sparse products.
+        """
+        if self.vectorizer is not None:
+            return np.clip((jd_rows @ resume_rows.T).toarray(), 0.0, 1.0)
+
+        a2 = _PAIR_IDF_SINGLE ** 2
+        jd_sq = jd_rows.multiply(jd_rows).tocsr()
+        resumes_sq = resume_rows.multiply(resume_rows).tocsr()
+        jd_bin = (jd_rows > 0).astype(np.float64)
+        resumes_bin = (resume_rows > 0).astype(np.float64)
+
+        dot = (jd_rows @ resume_rows.T).toarray()
+        jd_norm_sq = a2 * np.asarray(jd_sq.sum(axis=1)) - (a2 - 1.0) * (jd_sq @ resumes_bin.T).toarray()
+        resume_norm_sq = a2 * np.asarray(resumes_sq.sum(axis=1)).T - (a2 - 1.0) * (jd_bin @ resumes_sq.T).toarray()
+
+        denom = np.sqrt(jd_norm_sq * resume_norm_sq)
+        sims = np.zeros_like(dot)
+        np.divide(dot, denom, out=sims, where=denom > 0)
+        return np.clip(sims, 0.0, 1.0)
+
+    @staticmethod
+    def paired_cosine(jd_vecs, resume_vecs) -> np.ndarray:
+        """Row-wise dot products of aligned L2-normalized (N, V) matrices, clipped to [0, 1]."""
+        dots = np.asarray(sparse.csr_matrix(jd_vecs).multiply(resume_vecs).sum(axis=1)).ravel()
+        return np.clip(dots.astype(np.float64), 0.0, 1.0)
+
+    @staticmethod
+    def paired_similarity(jd_counts, resume_counts) -> np.ndarray:
+        """
+        Row i: the cosine similarity a TfidfVectorizer fitted on just
+        (jd_i, resume_i) would give. Inputs are aligned (N, V) term-count
+        matrices over any shared vocabulary (CountVectorizer, stop_words="english").
+        """
+        jd = sparse.csr_matrix(jd_counts, dtype=np.float64)
+        resumes = sparse.csr_matrix(resume_counts, dtype=np.float64)
+
+        a2 = _PAIR_IDF_SINGLE ** 2
+        jd_sq = jd.multiply(jd)
+        resumes_sq = resumes.multiply(resumes)
+        jd_bin = (jd > 0).astype(np.float64)
+        resumes_bin = (resumes > 0).astype(np.float64)
+
+        def rowsum(m):
+            return np.asarray(m.sum(axis=1)).ravel()
+
+        # shared terms have idf == 1 on both sides, so the dot product is plain counts
+        dot = rowsum(jd.multiply(resumes))
+        jd_norm_sq = a2 * rowsum(jd_sq) - (a2 - 1.0) * rowsum(jd_sq.multiply(resumes_bin))
+        resume_norm_sq = a2 * rowsum(resumes_sq) - (a2 - 1.0) * rowsum(resumes_sq.multiply(jd_bin))
+
+        denom = np.sqrt(jd_norm_sq * resume_norm_sq)
+        sims = np.zeros(len(dot), dtype=np.float64)
+        nonzero = denom > 0
+        sims[nonzero] = dot[nonzero] / denom[nonzero]
+        return np.clip(sims, 0.0, 1.0)
@@ -1,72 +1,243 @@
-import pandas as pd
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
 from tqdm import tqdm
 
-from src.scoring.tfidf_matcher import TfidfMatcher
-from src.scoring.sbert_matcher import SBERTMatcher
-from src.utils.skills import extract_skills
-from src.config import DEFAULT_SKILLS
-from src.utils.text import clean_text
+from src.scoring.tfidf_matcher import TFIDF_MODES, TfidfMatcher, fit_vectorizer
+from src.scoring.encoders import ENCODER_BACKENDS
+from src.scoring.sbert_matcher import SBERTMatcher, cache_namespace
+from src.scoring.score_engine import KEYWORD_MATCH_CAP
+from src.utils.hashing import text_hash
+from src.utils.skills import get_skill_matcher
+from src.utils.text import parse_document
+from src.config import DEFAULT_SKILLS, SBERT_BACKEND, SBERT_MODEL_NAME
 
 IN_PATH = Path("data/processed/train_pairs.csv")
+PAIRS_PATH = Path("data/processed/pairs.parquet")
+RESUMES_PATH = Path("data/processed/resumes.parquet")
+JOBS_PATH = Path("data/processed/jobs.parquet")
 OUT_PATH = Path("data/processed/features.csv")
+PARQUET_PATH = OUT_PATH.with_suffix(".parquet")
+CHECKPOINT_DIR = Path("data/processed/features_parts")
+# copied next to fit_model.joblib by train_fit_model.py, so serving computes tfidf_sim the same way
+VECTORIZER_OUT_PATH = Path("data/processed/tfidf_vectorizer.joblib")
+
+FEATURE_COLUMNS = ["tfidf_sim", "sbert_sim", "overlap", "missing_count", "keyword_matches"]
+
+
+def _parse_text(text: str):
+    # runs in worker processes: cleaned text + skills, same logic as ScoreEngine
+    doc = parse_document(text, get_skill_matcher(DEFAULT_SKILLS))
+    return doc.clean, doc.skills
+
+
+def parse_unique_texts(texts, workers: int):
+    """(cleaned texts, skills per text) for a list of unique texts, in parallel."""
+    if workers <= 1:
+        parsed = [_parse_text(t) for t in tqdm(texts, desc="parse")]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(tqdm(pool.map(_parse_text, texts, chunksize=256), total=len(texts), desc="parse"))
+    return [p[0] for p in parsed], [p[1] for p in parsed]
+
+
+class TextTable:
+    """
+    Per-unique-text features stored as matrices, so pair features for a chunk
+    are row lookups + sparse products instead of per-pair Python work.
+    Rows [0, n_resumes) are resumes, the rest are job descriptions.
+    """
+
+    def __init__(self, texts, workers: int, sbert: SBERTMatcher, tfidf_mode: str = "corpus"):
+        cleaned, skills = parse_unique_texts(texts, workers)
+
+        print("✅ Counting terms / tokens")
+        self.vectorizer = self.tfidf = self.counts = None
+        if tfidf_mode == "pair":
+            # term counts for the legacy pair-fit TF-IDF similarity (same analyzer as TfidfMatcher)
+            self.counts = CountVectorizer(stop_words="english").fit_transform(cleaned).tocsr()
+        else:
+            # one vectorizer for the whole corpus; rows are the exact vectors serving will compute
+            self.vectorizer = fit_vectorizer(cleaned, tfidf_mode)
+            self.tfidf = TfidfMatcher(self.vectorizer, vectorizer_path=None).transform(cleaned)
+        # whitespace token sets for keyword_matches
+        self.tokens = CountVectorizer(analyzer=str.split, binary=True, lowercase=False).fit_transform(cleaned).tocsr()
+
+        skill_index = {s: i for i, s in enumerate(get_skill_matcher(DEFAULT_SKILLS).skills)}
+        rows = [i for i, found in enumerate(skills) for _ in found]
+        cols = [skill_index[s] for found in skills for s in found]
+        self.skills = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(texts), len(skill_index))
+        )
+
+        # unique texts only; the embedding cache's disk tier makes this resumable
+        print(f"✅ Encoding {len(cleaned)} unique texts with SBERT")
+        self.embeddings = np.zeros((len(cleaned), 0), dtype=np.float32)
+        blocks = []
+        for start in tqdm(range(0, len(cleaned), 4096), desc="sbert"):
+            blocks.append(sbert.embed_many(cleaned[start:start + 4096]))
+        if blocks:
+            self.embeddings = np.vstack(blocks)
+
+
+def _rowsum(m) -> np.ndarray:
+    return np.asarray(m.sum(axis=1)).ravel()
+
+
+def pair_features(table: TextTable, resume_rows: np.ndarray, jd_rows: np.ndarray) -> pd.DataFrame:
+    if table.tfidf is not None:
+        tfidf_sim = TfidfMatcher.paired_cosine(table.tfidf[jd_rows], table.tfidf[resume_rows])
+    else:
+        tfidf_sim = TfidfMatcher.paired_similarity(table.counts[jd_rows], table.counts[resume_rows])
+    sbert_sim = np.einsum("ij,ij->i", table.embeddings[resume_rows], table.embeddings[jd_rows]).astype(np.float64)
+
+    jd_skills = table.skills[jd_rows]
+    n_jd_skills = _rowsum(jd_skills)
+    matched = _rowsum(jd_skills.multiply(table.skills[resume_rows]))
+    overlap = np.divide(matched, n_jd_skills, out=np.zeros_like(matched, dtype=np.float64), where=n_jd_skills > 0)
+
+    common_tokens = _rowsum(table.tokens[jd_rows].multiply(table.tokens[resume_rows]))
+
+    return pd.DataFrame({
+        "tfidf_sim": tfidf_sim,
+        "sbert_sim": sbert_sim,
+        "overlap": overlap,
+        "missing_count": (n_jd_skills - matched).astype(int),
+        "keyword_matches": np.minimum(common_tokens, KEYWORD_MATCH_CAP).astype(int)
+    })
+
+
+def load_pairs(sample_size=None):
+    """
+    Pairs as (resume row ids, unique resume texts, JD row ids, unique JD texts,
+    labels, source path). Prefers the deduplicated Parquet tables written by
+    build_pairs.py, falls back to the full-text train_pairs.csv.
+    """
+    if PAIRS_PATH.exists():
+        pairs = pd.read_parquet(PAIRS_PATH, columns=["resume_id", "job_id", "label"])
+        if sample_size:
+            pairs = pairs.sample(sample_size, random_state=42).reset_index(drop=True)
+        resumes = pd.read_parquet(RESUMES_PATH).set_index("resume_id")["resume_text"]
+        jobs = pd.read_parquet(JOBS_PATH).set_index("job_id")["job_description"]
+
+        # re-number to the ids actually used, so unused texts are never parsed or embedded
+        resume_ids, used_resumes = pd.factorize(pairs["resume_id"])
+        jd_ids, used_jobs = pd.factorize(pairs["job_id"])
+        return (
+            resume_ids, resumes.loc[used_resumes].astype(str).tolist(),
+            jd_ids, jobs.loc[used_jobs].astype(str).tolist(),
+            pairs["label"].astype(int).to_numpy(), PAIRS_PATH
+        )
 
-def keyword_match_count(jd_text: str, resume_text: str, top_k: int = 30) -> int:
-    jd_tokens = set(clean_text(jd_text).split())
-    resume_tokens = set(clean_text(resume_text).split())
-    common = jd_tokens.intersection(resume_tokens)
-    return len(list(common)[:top_k])
-
-def main(sample_size=None):
     df = pd.read_csv(IN_PATH)
-
     if sample_size:
         df = df.sample(sample_size, random_state=42).reset_index(drop=True)
-
-    print("✅ Loaded pairs:", len(df))
-
-    tfidf = TfidfMatcher()
-    sbert = SBERTMatcher()
-
-    features = []
-
-    for _, row in tqdm(df.iterrows(), total=len(df)):
-        resume = str(row["resume_text"])
-        jd = str(row["job_description"])
-        label = int(row["label"])
-
-        jd_clean = clean_text(jd)
-        resume_clean = clean_text(resume)
-
-        tfidf_sim = tfidf.similarity(jd_clean, resume_clean)
-        sbert_sim = sbert.similarity(jd_clean, resume_clean)
-
-        jd_skills = extract_skills(jd, DEFAULT_SKILLS)
-        resume_skills = extract_skills(resume, DEFAULT_SKILLS)
-
-        matched = len(set([s.lower() for s in jd_skills]).intersection(set([s.lower() for s in resume_skills])))
-        missing = max(0, len(jd_skills) - matched)
-
-        overlap = (matched / len(jd_skills)) if len(jd_skills) else 0.0
-        kw_matches = keyword_match_count(jd, resume)
-
-        features.append({
-            "tfidf_sim": tfidf_sim,
-            "sbert_sim": sbert_sim,
-            "overlap": overlap,
-            "missing_count": missing,
-            "keyword_matches": kw_matches,
-            "label": label
-        })
-
-    out_df = pd.DataFrame(features)
+    resume_ids, resume_texts = pd.factorize(df["resume_text"].astype(str))
+    jd_ids, jd_texts = pd.factorize(df["job_description"].astype(str))
+    return resume_ids, list(resume_texts), jd_ids, list(jd_texts), df["label"].astype(int).to_numpy(), IN_PATH
+
+
+def _write_part(df: pd.DataFrame, path: Path):
+    tmp = path.with_suffix(".tmp")
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)  # atomic: a part either exists complete or not at all
+
+
+def main(
+    sample_size=None,
+    chunk_size: int = 20_000,
+    workers: int = None,
+    fresh: bool = False,
+    tfidf: str = "corpus",
+    encoder: str = SBERT_BACKEND
+):
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+
+    resume_ids, resume_texts, jd_ids, jd_texts, labels, source = load_pairs(sample_size)
+    n_pairs = len(labels)
+
+    print("✅ Loaded pairs:", n_pairs, "from", source)
+    print(f"✅ Unique resumes: {len(resume_texts)} | unique JDs: {len(jd_texts)}")
+
+    # checkpoints are only valid for the same input file and settings; the
+    # embedding namespace covers the model, backend and chunking settings
+    stat = source.stat()
+    sbert_namespace = cache_namespace(SBERT_MODEL_NAME, encoder)
+    run_dir = CHECKPOINT_DIR / text_hash(
+        f"{source}-{stat.st_size}-{stat.st_mtime_ns}-{n_pairs}-{chunk_size}-{sample_size}-{tfidf}-{sbert_namespace}"
+    )[:12]
+    run_vectorizer = run_dir / VECTORIZER_OUT_PATH.name
+    if fresh and run_dir.exists():
+        for p in list(run_dir.glob("part-*.csv")) + [run_vectorizer]:
+            p.unlink(missing_ok=True)
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    n_chunks = (n_pairs + chunk_size - 1) // chunk_size
+    todo = [i for i in range(n_chunks) if not (run_dir / f"part-{i:05d}.csv").exists()]
+    print(f"✅ Chunks: {n_chunks} | already done: {n_chunks - len(todo)} | TF-IDF mode: {tfidf} | encoder: {encoder}")
+
+    if todo or (tfidf != "pair" and not run_vectorizer.exists()):
+        table = TextTable(list(resume_texts) + list(jd_texts), workers, SBERTMatcher(backend=encoder), tfidf_mode=tfidf)
+        jd_offset = len(resume_texts)
+        if table.vectorizer is not None:
+            joblib.dump(table.vectorizer, run_vectorizer)
+
+        for i in tqdm(todo, desc="features"):
+            sl = slice(i * chunk_size, (i + 1) * chunk_size)
+            part = pair_features(table, resume_ids[sl], jd_ids[sl] + jd_offset)
+            part["label"] = labels[sl]
+            _write_part(part, run_dir / f"part-{i:05d}.csv")
+
+    out_df = pd.concat(
+        [pd.read_csv(run_dir / f"part-{i:05d}.csv") for i in range(n_chunks)], ignore_index=True
+    )[FEATURE_COLUMNS + ["label"]]
 
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     out_df.to_csv(OUT_PATH, index=False)
-
     print(f"✅ Saved features: {OUT_PATH}")
+
+    if tfidf == "pair":
+        VECTORIZER_OUT_PATH.unlink(missing_ok=True)
+    else:
+        shutil.copyfile(run_vectorizer, VECTORIZER_OUT_PATH)
+        print(f"✅ Saved TF-IDF vectorizer ({tfidf}): {VECTORIZER_OUT_PATH}")
+
+    try:
+        out_df.to_parquet(PARQUET_PATH, index=False)
+        print(f"✅ Saved features: {PARQUET_PATH}")
+    except ImportError:
+        print("⚠️ pyarrow not installed, skipping Parquet output")
+
     print(out_df.head())
 
 if __name__ == "__main__":
-    # For testing: start with 2000 samples only (fast)
-    main(sample_size=2000)
+    parser = argparse.ArgumentParser(description="Build classifier features from the training pairs.")
+    parser.add_argument("--sample-size", type=int, default=None, help="Random sample of pairs (default: all)")
+    parser.add_argument("--chunk-size", type=int, default=20_000, help="Pairs per checkpointed chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for text parsing")
+    parser.add_argument("--fresh", action="store_true", help="Ignore existing checkpoints")
+    parser.add_argument(
+        "--tfidf", choices=TFIDF_MODES, default="corpus",
+        help="tfidf_sim: corpus-fitted vectorizer, fixed-memory hashing, or the legacy per-pair fit"
+    )
+    parser.add_argument(
+        "--encoder", choices=ENCODER_BACKENDS, default=SBERT_BACKEND,
+        help="sbert_sim encoder backend (default: JOBINT_SBERT_BACKEND); train with the one you serve"
+    )
+    args = parser.parse_args()
+    main(
+        sample_size=args.sample_size,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        fresh=args.fresh,
+        tfidf=args.tfidf,
+        encoder=args.encoder
+    )
@@ -0,0 +1,25 @@
+import argparse
+
+from tqdm import tqdm
+
+from src.training.build_features import load_pairs
+from src.utils.keywords import KEYWORD_IDF_PATH, KeywordIdf
+
+
+def main(min_df: int = 2, max_terms: int = 500_000):
+    _, resume_texts, _, jd_texts, _, source = load_pairs()
+    texts = list(resume_texts) + list(jd_texts)
+    print(f"✅ Unique documents: {len(texts)} from {source}")
+
+    table = KeywordIdf.fit(tqdm(texts, desc="df"), min_df=min_df, max_terms=max_terms)
+    table.save(KEYWORD_IDF_PATH)
+
+    print(f"✅ Terms kept: {len(table.df)} (min_df={min_df})")
+    print(f"✅ Keyword IDF saved to: {KEYWORD_IDF_PATH}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the corpus IDF table used to rank JD keywords.")
+    parser.add_argument("--min-df", type=int, default=2, help="Drop terms seen in fewer documents")
+    parser.add_argument("--max-terms", type=int, default=500_000, help="Keep at most this many terms (most frequent first)")
+    args = parser.parse_args()
+    main(min_df=args.min_df, max_terms=args.max_terms)
@@ -1,77 +1,189 @@
-import pandas as pd
+import argparse
+import time
 from pathlib import Path
 
-RAW_PATH = Path("data/raw/resume_data_for_ranking.csv")
-OUT_PATH = Path("data/processed/train_pairs.csv")
+import pandas as pd
 
-def safe_join(row, cols):
-    parts = []
+from src.utils.hashing import text_hash
+
+RAW_PATH = Path("data/raw/resume_data_for_ranking.csv")
+OUT_DIR = Path("data/processed")
+OUT_PATH = OUT_DIR / "train_pairs.csv"
+PAIRS_PATH = OUT_DIR / "pairs.parquet"
+RESUMES_PATH = OUT_DIR / "resumes.parquet"
+JOBS_PATH = OUT_DIR / "jobs.parquet"
+
+# ✅ Resume fields -> merged into resume_text
+RESUME_COLS = [
+    "career_objective",
+    "skills",
+    "educational_institution_name",
+    "degree_names",
+    "major_field_of_studies",
+    "professional_company_names",
+    "positions",
+    "responsibilities",
+    "extra_curricular_activity_types",
+    "role_positions",
+    "languages",
+    "certification_skills"
+]
+
+# ✅ Job fields -> merged into job_description
+JOB_COLS = [
+    "job_position_name",
+    "educationaL_requirements",
+    "experiencere_requirement",
+    "responsibilities.1",
+    "skills_required"
+]
+
+# ✅ Label column
+LABEL_COL = "matched_score"
+
+# ✅ matched_score >= threshold means fit. You can tune this later.
+LABEL_THRESHOLD = 0.6
+
+
+def join_columns(df: pd.DataFrame, cols) -> pd.Series:
+    """
+    Vectorized row-wise join of the non-null values of `cols` with single
+    spaces (columns missing from the frame are skipped).
+    """
+    out = pd.Series("", index=df.index, dtype=object)
     for c in cols:
-        if c in row and pd.notna(row[c]):
-            parts.append(str(row[c]))
-    return " ".join(parts).strip()
-
-def main():
-    print(f"✅ Loading dataset: {RAW_PATH}")
-    df = pd.read_csv(RAW_PATH)
-
-    print("✅ Rows:", len(df))
-    print("✅ Columns:", df.columns.tolist())
-
-    # ✅ Resume fields -> merged into resume_text
-    resume_cols = [
-        "career_objective",
-        "skills",
-        "educational_institution_name",
-        "degree_names",
-        "major_field_of_studies",
-        "professional_company_names",
-        "positions",
-        "responsibilities",
-        "extra_curricular_activity_types",
-        "role_positions",
-        "languages",
-        "certification_skills"
-    ]
-
-    # ✅ Job fields -> merged into job_description
-    job_cols = [
-        "job_position_name",
-        "educationaL_requirements",
-        "experiencere_requirement",
-        "responsibilities.1",
-        "skills_required"
-    ]
-
-    # ✅ Label column
-    label_col = "matched_score"
-
-    # Drop rows with missing label
-    df = df.dropna(subset=[label_col]).reset_index(drop=True)
-
-    # Build combined text fields
-    df["resume_text"] = df.apply(lambda r: safe_join(r, resume_cols), axis=1)
-    df["job_description"] = df.apply(lambda r: safe_join(r, job_cols), axis=1)
-
-    # Drop empty rows
-    df = df[(df["resume_text"].str.len() > 20) & (df["job_description"].str.len() > 20)]
-
-    # ✅ Convert matched_score to binary label
-    # You can tune this threshold later.
-    # For now: >= 0.6 means fit
-    df["label"] = df[label_col].apply(lambda x: 1 if x >= 0.6 else 0)
-
-    out_df = df[["resume_text", "job_description", "label", label_col]].copy()
-
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    out_df.to_csv(OUT_PATH, index=False)
-
-    print(f"✅ Saved: {OUT_PATH}")
+        if c not in df.columns:
+            continue
+        col = df[c]
+        mask = col.notna()
+        if not mask.any():
+            continue
+        values = col[mask].astype(str)
+        prev = out[mask]
+        out[mask] = prev.where(prev == "", prev + " ").str.cat(values)
+    return out.str.strip()
+
+
+class TextIds:
+    """Content-hash dedupe of texts into a stable integer id table."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def assign(self, texts: pd.Series):
+        """Returns (id per row, ids of texts first seen in this batch, those texts)."""
+        codes, uniques = pd.factorize(texts)
+        unique_ids, new_ids, new_texts = [], [], []
+        for text in uniques:
+            key = text_hash(text)
+            text_id = self.ids.get(key)
+            if text_id is None:
+                text_id = len(self.ids)
+                self.ids[key] = text_id
+                new_ids.append(text_id)
+                new_texts.append(text)
+            unique_ids.append(text_id)
+        row_ids = pd.Series(unique_ids, dtype="int64").to_numpy()[codes]
+        return row_ids, new_ids, new_texts
+
+
+class ParquetSink:
+    """Appends DataFrames to one Parquet file, one row group per chunk."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.writer = None
+
+    def write(self, df: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if df.empty:
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def main(chunk_size: int = 50_000, write_csv: bool = False):
+    print(f"✅ Streaming dataset: {RAW_PATH} (chunks of {chunk_size} rows)")
+
+    columns = pd.read_csv(RAW_PATH, nrows=0).columns.tolist()
+    print("✅ Columns:", columns)
+    usecols = [c for c in RESUME_COLS + JOB_COLS + [LABEL_COL] if c in columns]
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    pairs_sink, resumes_sink, jobs_sink = ParquetSink(PAIRS_PATH), ParquetSink(RESUMES_PATH), ParquetSink(JOBS_PATH)
+    resume_ids, job_ids = TextIds(), TextIds()
+    if write_csv and OUT_PATH.exists():
+        OUT_PATH.unlink()
+
+    total_in = total_out = 0
+    label_counts = pd.Series(dtype="int64")
+    started = time.perf_counter()
+
+    try:
+        for i, df in enumerate(pd.read_csv(RAW_PATH, usecols=usecols, chunksize=chunk_size)):
+            t0 = time.perf_counter()
+            total_in += len(df)
+
+            # Drop rows with missing label
+            df = df.dropna(subset=[LABEL_COL])
+
+            # Build combined text fields
+            resume_text = join_columns(df, RESUME_COLS)
+            job_description = join_columns(df, JOB_COLS)
+
+            # Drop empty rows
+            keep = (resume_text.str.len() > 20) & (job_description.str.len() > 20)
+            df, resume_text, job_description = df[keep], resume_text[keep], job_description[keep]
+
+            label = (df[LABEL_COL] >= LABEL_THRESHOLD).astype(int).rename("label")
+
+            r_ids, new_r_ids, new_r_texts = resume_ids.assign(resume_text)
+            j_ids, new_j_ids, new_j_texts = job_ids.assign(job_description)
+
+            pairs_sink.write(pd.DataFrame({
+                "resume_id": r_ids,
+                "job_id": j_ids,
+                "label": label.to_numpy(),
+                LABEL_COL: df[LABEL_COL].to_numpy()
+            }))
+            resumes_sink.write(pd.DataFrame({"resume_id": new_r_ids, "resume_text": new_r_texts}))
+            jobs_sink.write(pd.DataFrame({"job_id": new_j_ids, "job_description": new_j_texts}))
+
+            if write_csv:
+                pd.DataFrame({
+                    "resume_text": resume_text, "job_description": job_description,
+                    "label": label, LABEL_COL: df[LABEL_COL]
+                }).to_csv(OUT_PATH, mode="a", header=not OUT_PATH.exists(), index=False)
+
+            total_out += len(df)
+            label_counts = label_counts.add(label.value_counts(), fill_value=0)
+            elapsed = time.perf_counter() - t0
+            print(
+                f"✅ Chunk {i}: {len(df)} pairs kept | {len(df) / max(elapsed, 1e-9):,.0f} rows/s | "
+                f"unique resumes {len(resume_ids.ids)} | unique JDs {len(job_ids.ids)}"
+            )
+    finally:
+        pairs_sink.close()
+        resumes_sink.close()
+        jobs_sink.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Rows read: {total_in} | pairs kept: {total_out} | {total_in / max(elapsed, 1e-9):,.0f} rows/s overall")
+    print(f"✅ Saved: {PAIRS_PATH}, {RESUMES_PATH}, {JOBS_PATH}" + (f", {OUT_PATH}" if write_csv else ""))
     print("✅ Label Distribution:")
-    print(out_df["label"].value_counts(normalize=True))
-
-    print("\n✅ Sample rows:")
-    print(out_df.head(2))
+    print(label_counts / max(total_out, 1))
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build resume/JD training pairs from the raw dataset.")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Raw CSV rows per chunk")
+    parser.add_argument("--csv", action="store_true", help=f"Also write the legacy full-text {OUT_PATH}")
+    args = parser.parse_args()
+    main(chunk_size=args.chunk_size, write_csv=args.csv)
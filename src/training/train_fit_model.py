@@ -1,3 +1,5 @@
+import shutil
+
 import pandas as pd
 import joblib
 from pathlib import Path
@@ -6,8 +8,13 @@ from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, roc_auc_score, confusion_matrix
 
+from src.scoring.linear_model import LinearFitModel
+
 DATA_PATH = Path("data/processed/features.csv")
 MODEL_PATH = Path("src/models/fit_model.joblib")
+LINEAR_MODEL_PATH = MODEL_PATH.with_suffix(".linear.json")
+VECTORIZER_IN_PATH = Path("data/processed/tfidf_vectorizer.joblib")
+VECTORIZER_PATH = MODEL_PATH.parent / "tfidf_vectorizer.joblib"
 
 def main():
     df = pd.read_csv(DATA_PATH)
@@ -38,5 +45,17 @@ def main():
 
     print(f"\n✅ Model saved to: {MODEL_PATH}")
 
+    # ✅ NumPy inference artifact (coef, intercept, training means as SHAP background)
+    LinearFitModel.from_sklearn(model, background=X_train.mean().to_numpy(), feature_names=list(X.columns)).save(LINEAR_MODEL_PATH)
+    print(f"✅ Linear model saved to: {LINEAR_MODEL_PATH}")
+
+    # ✅ Serve tfidf_sim exactly as build_features.py computed it
+    if VECTORIZER_IN_PATH.exists():
+        shutil.copyfile(VECTORIZER_IN_PATH, VECTORIZER_PATH)
+        print(f"✅ TF-IDF vectorizer copied to: {VECTORIZER_PATH}")
+    else:
+        VECTORIZER_PATH.unlink(missing_ok=True)
+        print("✅ No TF-IDF vectorizer: serving uses the per-pair TF-IDF fit")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,18 @@
+import hashlib
+
+
+def text_hash(text: str) -> str:
+    """
+    Stable content hash used as a cache key, so caches never hold raw
+    resume/JD text as keys.
+    """
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+def bytes_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def bytes_hasher():
+    """Incremental bytes_hash for data read in pieces: update() each piece, then hexdigest()."""
+    return hashlib.blake2b(digest_size=16)
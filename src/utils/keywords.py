@@ -1,25 +1,153 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from .text import clean_text
+import gzip
+import json
+import math
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
 
+from .hashing import text_hash
+from .lru import LRUCache
+from .text import ParsedDocument, parse_document
 
-def extract_top_keywords(text: str, top_k: int = 20):
+# Built by src/training/build_keyword_idf.py. Without it every term gets the
+# same IDF and keywords are ranked by how often the JD uses them.
+KEYWORD_IDF_PATH = Path(__file__).resolve().parents[1] / "models" / "keyword_idf.json.gz"
+KEYWORD_CACHE_SIZE = 1024
+
+_stop_words: Optional[frozenset] = None
+
+
+def _get_stop_words() -> frozenset:
+    # sklearn's English list, imported on first use like the vectorizers
+    global _stop_words
+    if _stop_words is None:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        _stop_words = frozenset(ENGLISH_STOP_WORDS)
+    return _stop_words
+
+
+def keyword_terms(text: Union[str, ParsedDocument]) -> Counter:
+    """
+    Unigram + bigram counts over the document's punctuation-stripped tokens.
+    Stop words, 1-character and numeric tokens are dropped, and bigrams are
+    only formed from two kept tokens that are adjacent in the text.
+    """
+    stop_words = _get_stop_words()
+    tokens = parse_document(text).skill_tokens
+    keep = [len(t) > 1 and t not in stop_words and not t.replace(".", "").isdigit() for t in tokens]
+
+    counts = Counter(t for t, k in zip(tokens, keep) if k)
+    counts.update(
+        f"{a} {b}" for a, b, keep_a, keep_b in zip(tokens, tokens[1:], keep, keep[1:]) if keep_a and keep_b
+    )
+    return counts
+
+
+class KeywordIdf:
     """
-    Extracts top keywords from job description using TF-IDF (single document trick).
+    Corpus document frequencies of unigrams and bigrams, weighted with the
+    same smoothed IDF as sklearn's TfidfVectorizer. Terms never seen in the
+    corpus get the highest weight, as if their df were 0.
     """
-    text = clean_text(text)
 
-    vectorizer = TfidfVectorizer(stop_words="english", max_features=2000, ngram_range=(1, 2))
-    X = vectorizer.fit_transform([text])
+    def __init__(self, n_docs: int, df: Dict[str, int]):
+        self.n_docs = int(n_docs)
+        self.df = df
+        self.default_idf = math.log(1 + self.n_docs) + 1
+
+    def idf(self, term: str) -> float:
+        df = self.df.get(term)
+        if df is None:
+            return self.default_idf
+        return math.log((1 + self.n_docs) / (1 + df)) + 1
+
+    @classmethod
+    def fit(cls, docs: Iterable[Union[str, ParsedDocument]], min_df: int = 2, max_terms: int = 500_000) -> "KeywordIdf":
+        df: Counter = Counter()
+        n_docs = 0
+        for doc in docs:
+            df.update(keyword_terms(doc).keys())
+            n_docs += 1
+        kept = {t: c for t, c in df.most_common(max_terms) if c >= min_df}
+        return cls(n_docs, kept)
+
+    @classmethod
+    def load(cls, path: Path) -> "KeywordIdf":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["n_docs"], data["df"])
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({"n_docs": self.n_docs, "df": self.df}, f)
 
-    # get keywords sorted by tfidf
-    keywords = vectorizer.get_feature_names_out()
 
-    return list(keywords)[:top_k]
+_idf_lock = threading.Lock()
+_idf_table: Optional[KeywordIdf] = None
+_keyword_cache = LRUCache(KEYWORD_CACHE_SIZE, sizeof=lambda _: 1)
+
+
+def get_keyword_idf() -> KeywordIdf:
+    """The persisted IDF table (loaded once per process), or a uniform one if absent."""
+    global _idf_table
+    if _idf_table is None:
+        with _idf_lock:
+            if _idf_table is None:
+                _idf_table = KeywordIdf.load(KEYWORD_IDF_PATH) if KEYWORD_IDF_PATH.exists() else KeywordIdf(0, {})
+    return _idf_table
+
+
+def extract_top_keywords(text: Union[str, ParsedDocument], top_k: int = 20, idf: Optional[KeywordIdf] = None) -> List[str]:
+    """
+    Top job description keywords (unigrams + bigrams) by TF x corpus IDF,
+    ties broken by first appearance. Memoized per JD content hash.
+    """
+    doc = parse_document(text)
+
+    key = None
+    if idf is None:
+        idf = get_keyword_idf()
+        key = (text_hash(doc.clean), top_k)
+        cached = _keyword_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+    counts = keyword_terms(doc)
+    ranked = sorted(counts.items(), key=lambda kv: -kv[1] * idf.idf(kv[0]))
+    keywords = [term for term, _ in ranked[:top_k]]
+
+    if key is not None:
+        _keyword_cache.put(key, tuple(keywords))
+    return keywords
+
+
+def find_missing_keywords_in_tokens(
+    jd_keywords: List[str],
+    resume_tokens: Set[str],
+    resume_bigrams: Optional[Set[str]] = None
+) -> List[str]:
+    """
+    JD keywords the resume lacks: unigrams are looked up in `resume_tokens`,
+    bigrams in `resume_bigrams` (or, without it, word by word in the tokens).
+    """
+    missing = []
+    for kw in jd_keywords:
+        if " " not in kw:
+            found = kw in resume_tokens
+        elif resume_bigrams is not None:
+            found = kw in resume_bigrams
+        else:
+            found = all(w in resume_tokens for w in kw.split())
+        if not found:
+            missing.append(kw)
+    return missing
 
 
-def find_missing_keywords(job_desc: str, resume_text: str, top_k: int = 20):
+def find_missing_keywords(job_desc: Union[str, ParsedDocument], resume_text: Union[str, ParsedDocument], top_k: int = 20):
     jd_keywords = extract_top_keywords(job_desc, top_k=top_k)
-    resume_tokens = set(clean_text(resume_text).split())
+    resume = parse_document(resume_text)
 
-    missing = [kw for kw in jd_keywords if kw.split()[0] not in resume_tokens]
-    return jd_keywords, missing
+    return jd_keywords, find_missing_keywords_in_tokens(jd_keywords, resume.term_set, resume.bigrams)
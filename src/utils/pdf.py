@@ -1,9 +1,148 @@
-import fitz  # PyMuPDF
+"""
+Page-streaming PDF text extraction with pluggable backends:
 
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    full_text = []
-    for page in doc:
-        full_text.append(page.get_text("text"))
-    return "\n".join(full_text).strip()
+  pymupdf  PyMuPDF (optional dependency, fastest)
+  pypdf    pure Python, pinned in requirements.txt; the fallback
 
+Pages are read one at a time and extraction stops as soon as a page,
+character or time limit is reached, so a 300-page scan costs no more than
+its first `max_pages` pages. Sources are bytes or a file path; a path is
+read lazily by both backends, so large (spooled) uploads are never held in
+memory whole.
+"""
+import io
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from ..config import PDF_BACKEND
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24
+    except ImportError:  # optional: pypdf is used instead
+        pymupdf = None
+
+PDF_BACKENDS = ("pymupdf", "pypdf")
+PdfSource = Union[bytes, str, Path]
+
+
+class PdfExtractionError(ValueError):
+    """Raised when a single PDF can't be parsed or breaks an extraction limit."""
+
+
+@dataclass
+class PdfText:
+    text: str
+    pages: int  # pages parsed
+    total_pages: int
+    truncated_by: Optional[str]  # "pages" / "chars" / "seconds" when a limit cut the text short
+    backend: str
+    seconds: float
+
+
+class _PyMuPDFDocument:
+    def __init__(self, source: PdfSource):
+        if isinstance(source, bytes):
+            self.doc = pymupdf.open(stream=source, filetype="pdf")
+        else:
+            self.doc = pymupdf.open(str(source), filetype="pdf")
+        if self.doc.needs_pass:
+            self.doc.close()
+            raise PdfExtractionError("PDF is password-protected")
+        self.page_count = self.doc.page_count
+
+    def page_text(self, i: int) -> str:
+        return self.doc.load_page(i).get_text("text")
+
+    def close(self):
+        self.doc.close()
+
+
+class _PyPdfDocument:
+    def __init__(self, source: PdfSource):
+        from pypdf import PdfReader
+
+        self.reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else str(source), strict=False)
+        if self.reader.is_encrypted and not self.reader.decrypt(""):
+            raise PdfExtractionError("PDF is password-protected")
+        self.page_count = len(self.reader.pages)
+
+    def page_text(self, i: int) -> str:
+        return self.reader.pages[i].extract_text() or ""
+
+    def close(self):
+        pass
+
+
+def resolve_backend(backend: str = PDF_BACKEND) -> str:
+    if backend == "auto":
+        return "pymupdf" if pymupdf is not None else "pypdf"
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{backend}'. Use auto or one of: {', '.join(PDF_BACKENDS)}")
+    if backend == "pymupdf" and pymupdf is None:
+        raise ValueError("PDF backend 'pymupdf' needs PyMuPDF: pip install pymupdf")
+    return backend
+
+
+def _open(source: PdfSource, backend: str):
+    try:
+        return _PyMuPDFDocument(source) if backend == "pymupdf" else _PyPdfDocument(source)
+    except PdfExtractionError:
+        raise
+    except Exception as e:
+        raise PdfExtractionError(f"Could not open PDF: {e}") from e
+
+
+def extract_pdf_text(
+    source: PdfSource,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    start: int = 0,
+    backend: str = PDF_BACKEND
+) -> PdfText:
+    """
+    Text of pages [start, start + max_pages), stopping early once `max_chars`
+    characters are collected or `max_seconds` have passed. Documents past a
+    limit are truncated, not rejected.
+    """
+    t0 = time.perf_counter()
+    backend = resolve_backend(backend)
+    doc = _open(source, backend)
+    parts, chars, parsed = [], 0, 0
+    try:
+        end = doc.page_count if max_pages is None else min(doc.page_count, start + max_pages)
+        truncated_by = "pages" if end < doc.page_count else None
+        for i in range(start, end):
+            try:
+                text = doc.page_text(i)
+            except Exception as e:
+                raise PdfExtractionError(f"Could not read page {i + 1}: {e}") from e
+            parsed += 1
+            if max_chars is not None and chars + len(text) > max_chars:
+                parts.append(text[:max(0, max_chars - chars)])
+                truncated_by = "chars"
+                break
+            parts.append(text)
+            chars += len(text) + 1
+            if max_seconds is not None and i + 1 < end and time.perf_counter() - t0 > max_seconds:
+                truncated_by = "seconds"
+                break
+        total = doc.page_count
+    finally:
+        doc.close()
+    return PdfText("\n".join(parts).strip(), parsed, total, truncated_by, backend, time.perf_counter() - t0)
+
+
+def extract_pdf(pdf_bytes: PdfSource, max_pages: Optional[int] = None) -> Tuple[str, int]:
+    """(text, pages parsed)."""
+    result = extract_pdf_text(pdf_bytes, max_pages=max_pages)
+    return result.text, result.pages
+
+
+def extract_text_from_pdf(pdf_bytes: PdfSource, max_pages: Optional[int] = None) -> str:
+    return extract_pdf_text(pdf_bytes, max_pages=max_pages).text
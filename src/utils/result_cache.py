@@ -0,0 +1,132 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from .hashing import text_hash
+from .lru import LRUCache
+from .metrics import RESULT_CACHE
+from .serialization import json_default
+from .sqlite import ForkSafeSqlite
+
+# expired and excess rows are pruned every this many puts
+_PRUNE_EVERY = 256
+
+
+class DiskResultStore:
+    """
+    SQLite table of content hash -> JSON value with an expiry time, shared by
+    every process pointing at the same directory. Rows of another version are
+    never returned and age out like expired ones, so processes on old and new
+    versions (e.g. during a rolling restart) can share a directory.
+    """
+
+    def __init__(self, root_dir: Path, name: str, version: str, max_entries: int):
+        self.path = Path(root_dir) / f"{name}.sqlite"
+        self.version = version
+        self.max_entries = max_entries
+        self._db = ForkSafeSqlite(self.path)
+        self._lock = threading.Lock()
+        self._puts = 0
+
+        with self._lock:
+            conn = self._db.conn
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, version TEXT NOT NULL, expires REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            conn.commit()
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM results WHERE expires < ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY expires DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+        conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """(value, expires) of a live entry, else None."""
+        with self._lock:
+            row = self._db.conn.execute(
+                "SELECT value, expires FROM results WHERE key = ? AND version = ? AND expires >= ?",
+                (key, self.version, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row is not None else None
+
+    def put(self, key: str, value: bytes, expires: float):
+        with self._lock:
+            conn = self._db.conn
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, version, expires, value) VALUES (?, ?, ?, ?)",
+                (key, self.version, expires, value)
+            )
+            conn.commit()
+            self._puts += 1
+            if self._puts % _PRUNE_EVERY == 0:
+                self._prune(conn)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Content-addressed cache of JSON-serializable results (PDF text, analysis
+    reports). Keys are hashes of the inputs plus `version`, so a new model or
+    config version never sees old entries.
+
+    Memory tier: per-process LRU of `max_entries`, each entry valid for `ttl` seconds.
+    Disk tier: optional DiskResultStore under `disk_dir`, same bounds; disk
+    hits are promoted into memory.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl: float,
+        version: str = "",
+        disk_dir: Optional[Path] = None
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.version = version
+        self.memory = LRUCache(max_entries, sizeof=lambda _: 1)
+        self.disk = DiskResultStore(disk_dir, name, version, max_entries) if disk_dir else None
+
+    def key(self, *parts: str) -> str:
+        return text_hash("\x1f".join((self.version,) + parts))
+
+    def get(self, key: str) -> Tuple[Any, Optional[str]]:
+        """(value, "memory" | "disk") on a hit, (None, None) on a miss."""
+        item = self.memory.get(key)
+        if item is not None:
+            value, expires = item
+            if expires >= time.time():
+                RESULT_CACHE.inc(cache=self.name, result="memory")
+                return value, "memory"
+
+        if self.disk is not None:
+            row = self.disk.get(key)
+            if row is not None:
+                value = json.loads(row[0])
+                self.memory.put(key, (value, row[1]))
+                RESULT_CACHE.inc(cache=self.name, result="disk")
+                return value, "disk"
+
+        RESULT_CACHE.inc(cache=self.name, result="miss")
+        return None, None
+
+    def put(self, key: str, value: Any):
+        expires = time.time() + self.ttl
+        self.memory.put(key, (value, expires))
+        if self.disk is not None:
+            self.disk.put(key, json.dumps(value, default=json_default).encode("utf-8"), expires)
+
+    def clear(self):
+        self.memory.clear()
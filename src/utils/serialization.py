@@ -0,0 +1,12 @@
+from typing import Any
+
+import numpy as np
+
+
+def json_default(obj: Any):
+    """`default=` hook for json.dumps: NumPy scalars and arrays as plain Python values."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -1,16 +1,111 @@
-from typing import List, Dict
-from .text import clean_text
+from typing import Dict, Iterable, List, Mapping, Union
+from .text import ParsedDocument, clean_text, strip_token_punctuation
 
-def extract_skills(text: str, skills_list: List[str]) -> List[str]:
-    text_clean = clean_text(text)
-    matched = set()
+SkillsSource = Union[List[str], Mapping[str, Iterable[str]]]
 
-    for skill in skills_list:
-        skill_clean = clean_text(skill)
-        if skill_clean in text_clean:
-            matched.add(skill)
+# Trie node key marking "a skill ends here"; tokens are never None.
+_END = None
 
-    return sorted(list(matched))
+
+def skill_tokens(text: str) -> List[str]:
+    """
+    Tokenize cleaned text on whitespace, dropping sentence punctuation that
+    clean_text keeps (e.g. "node.js." -> "node.js", "-python" -> "python").
+    Skills and documents go through the same function so matches land on
+    token boundaries.
+    """
+    return strip_token_punctuation(clean_text(text).split())
+
+
+class SkillMatcher:
+    """
+    Token trie over a skills taxonomy, built once and reused for every document.
+    Finds all skills in a single pass over the text, so cost depends on the
+    document length and the longest skill phrase, not on the taxonomy size.
+
+    `skills` is either a list of skill names or a mapping of canonical
+    skill -> synonyms; matches are always reported by canonical name.
+    """
+
+    def __init__(self, skills: SkillsSource):
+        self.root: Dict = {}
+        self.skills: List[str] = []
+
+        if isinstance(skills, Mapping):
+            items = [(canonical, [canonical, *aliases]) for canonical, aliases in skills.items()]
+        else:
+            items = [(skill, [skill]) for skill in skills]
+
+        for canonical, surface_forms in items:
+            for form in surface_forms:
+                self._add(form, canonical)
+            self.skills.append(canonical)
+
+    def _add(self, phrase: str, canonical: str):
+        tokens = skill_tokens(phrase)
+        if not tokens:
+            return
+        node = self.root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node.setdefault(_END, set()).add(canonical)
+
+    def find_in_tokens(self, tokens: List[str]) -> List[str]:
+        root = self.root
+        matched = set()
+        n = len(tokens)
+
+        for i in range(n):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                hits = node.get(_END)
+                if hits:
+                    matched.update(hits)
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+
+        return sorted(matched)
+
+    def find(self, text: str) -> List[str]:
+        return self.find_in_tokens(skill_tokens(text))
+
+
+# skills content -> matcher. Keyed by content, not identity, so a list edited
+# in place (even at the same length) gets a fresh trie.
+_MATCHER_CACHE: Dict[tuple, SkillMatcher] = {}
+_MATCHER_CACHE_SIZE = 8
+
+
+def _skills_key(skills_list: SkillsSource) -> tuple:
+    if isinstance(skills_list, Mapping):
+        return tuple((skill, tuple(aliases)) for skill, aliases in skills_list.items())
+    return tuple(skills_list)
+
+
+def get_skill_matcher(skills_list: SkillsSource) -> SkillMatcher:
+    if isinstance(skills_list, SkillMatcher):
+        return skills_list
+
+    key = _skills_key(skills_list)
+    matcher = _MATCHER_CACHE.get(key)
+    if matcher is not None:
+        return matcher
+
+    matcher = SkillMatcher(skills_list)
+    if len(_MATCHER_CACHE) >= _MATCHER_CACHE_SIZE:
+        _MATCHER_CACHE.pop(next(iter(_MATCHER_CACHE)))
+    _MATCHER_CACHE[key] = matcher
+    return matcher
+
+
+def extract_skills(text: Union[str, ParsedDocument], skills_list: Union[SkillsSource, SkillMatcher]) -> List[str]:
+    matcher = get_skill_matcher(skills_list)
+    if isinstance(text, ParsedDocument):
+        return matcher.find_in_tokens(text.skill_tokens)
+    return matcher.find(text)
 
 def skill_gap(job_skills: List[str], resume_skills: List[str]) -> Dict[str, List[str]]:
     job_set = set([s.lower() for s in job_skills])
@@ -20,4 +115,3 @@ def skill_gap(job_skills: List[str], resume_skills: List[str]) -> Dict[str, List
     missing = sorted([s for s in job_skills if s.lower() not in resume_set])
 
     return {"matched": matched, "missing": missing}
-
@@ -0,0 +1,38 @@
+import os
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional
+
+
+class ForkSafeSqlite:
+    """
+    WAL-mode SQLite connection for a store shared by several processes.
+    Opened on first use, and reopened in a child process: a connection
+    inherited across fork() (pre-fork API workers, job runners) is never
+    reused. `on_connect(conn)` runs after every open, for schema setup or
+    resetting per-process state derived from the database.
+    """
+
+    def __init__(self, path: Path, on_connect: Optional[Callable[[sqlite3.Connection], None]] = None, **connect_kwargs):
+        self.path = Path(path)
+        self.on_connect = on_connect
+        self.connect_kwargs = {"timeout": 30, "check_same_thread": False, **connect_kwargs}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), **self.connect_kwargs)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+            if self.on_connect is not None:
+                self.on_connect(self._conn)
+        return self._conn
+
+    def close(self):
+        # a connection inherited from the parent belongs to the parent
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
@@ -1,4 +1,6 @@
 import re
+from functools import cached_property
+from typing import List, Optional, Set
 
 def clean_text(text: str) -> str:
     if not text:
@@ -9,3 +11,54 @@ def clean_text(text: str) -> str:
     text = re.sub(r"\s+", " ", text).strip()
     return text
 
+
+def strip_token_punctuation(tokens: List[str]) -> List[str]:
+    """
+    Drop sentence punctuation that clean_text keeps on token edges
+    (e.g. "node.js." -> "node.js", "-python" -> "python").
+    """
+    out = []
+    for tok in tokens:
+        tok = tok.rstrip(".-").lstrip("-")
+        if tok:
+            out.append(tok)
+    return out
+
+
+class ParsedDocument:
+    """
+    One resume/JD parsed once: cleaned text, tokens, token set, bigrams and
+    (when a SkillMatcher is given) skill hits. Scoring utilities accept this
+    instead of raw text so clean_text and tokenization run once per document.
+    """
+
+    def __init__(self, text: str, skill_matcher=None):
+        self.text = text or ""
+        self.clean = clean_text(self.text)
+        self.tokens: List[str] = self.clean.split()
+        self.token_set: Set[str] = set(self.tokens)
+        self.skills: Optional[List[str]] = None
+        if skill_matcher is not None:
+            self.skills = skill_matcher.find_in_tokens(self.skill_tokens)
+
+    @cached_property
+    def skill_tokens(self) -> List[str]:
+        return strip_token_punctuation(self.tokens)
+
+    @cached_property
+    def term_set(self) -> Set[str]:
+        # punctuation-stripped tokens, the unigram side of keyword lookups
+        return set(self.skill_tokens)
+
+    @cached_property
+    def bigrams(self) -> Set[str]:
+        tokens = self.skill_tokens
+        return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def parse_document(text, skill_matcher=None) -> ParsedDocument:
+    if isinstance(text, ParsedDocument):
+        if text.skills is None and skill_matcher is not None:
+            text.skills = skill_matcher.find_in_tokens(text.skill_tokens)
+        return text
+    return ParsedDocument(text, skill_matcher)